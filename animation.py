@@ -0,0 +1,62 @@
+# Animation Clock - One place that advances every animation once per frame
+# Shared tracks for tiles that always show the same frame, and per-sprite cursors for things like walk cycles
+
+import weakref
+
+class AnimationTrack:
+    """
+    A looping frame sequence. Sprites that share a track read frame from it
+    and are never updated themselves, so offscreen ones cost nothing.
+    """
+    def __init__(self, frames, fps):
+        self.frames = frames
+        self.fps = fps
+        self.time = 0.0  # fractional frame index
+
+    @property
+    def frame(self):
+        return self.frames[int(self.time)]
+
+    def advance(self, dt):
+        self.time += self.fps * dt
+        if self.time >= len(self.frames):
+            self.time = 0
+
+    def play(self, frames):
+        """Switch to another sequence (e.g. a new facing), restarting if the index no longer fits"""
+        self.frames = frames
+        if self.time >= len(frames):
+            self.time = 0
+
+
+class AnimationClock:
+    """
+    Advances every registered track by dt once per frame (Level ticks it
+    while the world is running, so paused menus freeze animations).
+    Named tracks are shared; cursor() makes a private track for one sprite.
+    """
+    def __init__(self):
+        self.tracks = {}
+        self.cursors = weakref.WeakSet()  # dropped with the sprite that owns them
+
+    def track(self, name, frames, fps):
+        """The shared track of that name, created on first use"""
+        track = self.tracks.get(name)
+        if track is None:
+            track = self.tracks[name] = AnimationTrack(frames, fps)
+        return track
+
+    def cursor(self, frames, fps):
+        track = AnimationTrack(frames, fps)
+        self.cursors.add(track)
+        return track
+
+    def tick(self, dt):
+        for track in self.tracks.values():
+            track.advance(dt)
+        for track in self.cursors:
+            track.advance(dt)
+
+
+# the clock every module shares
+animation_clock = AnimationClock()
@@ -0,0 +1,109 @@
+# Asset Cache - Process-wide store for images, animation frames, fonts and sounds
+# Every asset is decoded once and shared by key; scaled variants are cached next to their source
+
+from os import walk
+import pygame
+
+
+class AssetCache:
+    """
+    Keyed cache of loaded assets.
+
+    Images are converted for the display on first load and shared, so
+    callers must copy a surface before drawing onto it. Scaled variants are
+    keyed by (path, size) and built from the cached source. Folders of
+    frames keep the file order os.walk gives, like support.import_folder
+    always did. stats() reports hits, misses and approximate memory.
+    """
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _get(self, key, load):
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            entry = self._entries[key] = load()
+        else:
+            self.hits += 1
+        return entry
+
+    # =========================================================================
+    # LOADERS
+    # =========================================================================
+
+    def image(self, path, size=None, alpha=True):
+        """Converted surface for an image file, optionally scaled to size (width, height)"""
+        if size is not None:
+            size = (int(size[0]), int(size[1]))
+            return self._get(('image', path, size, alpha),
+                lambda: pygame.transform.scale(self.image(path, alpha=alpha), size))
+
+        def load():
+            surf = pygame.image.load(path)
+            return surf.convert_alpha() if alpha else surf.convert()
+        return self._get(('image', path, None, alpha), load)
+
+    def frames(self, path):
+        """Surfaces for every image in a folder (a new list each call, the surfaces are shared)"""
+        return list(self._get(('frames', path),
+            lambda: tuple(self.image(path + '/' + name) for name in self._folder(path))))
+
+    def frames_dict(self, path):
+        """Surfaces for every image in a folder keyed by file name without extension"""
+        return dict(self._get(('frames_dict', path),
+            lambda: {name.split('.')[0]: self.image(path + '/' + name) for name in self._folder(path)}))
+
+    def font(self, path, size):
+        """Font at a point size (path None is pygame's default font)"""
+        return self._get(('font', path, size), lambda: pygame.font.Font(path, size))
+
+    def sound(self, path):
+        return self._get(('sound', path), lambda: pygame.mixer.Sound(path))
+
+    @staticmethod
+    def _folder(path):
+        names = []
+        for _, __, files in walk(path):
+            names.extend(files)
+        return names
+
+    # =========================================================================
+    # BOOKKEEPING
+    # =========================================================================
+
+    def clear(self):
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self):
+        """Hit/miss counts, entries per kind and approximate bytes held by surfaces and sounds"""
+        counts = {}
+        surface_bytes = 0
+        sound_bytes = 0
+        mixer = pygame.mixer.get_init()
+        # decoded sounds are held as raw samples in the mixer's format
+        sample_bytes = mixer[0] * abs(mixer[1]) // 8 * mixer[2] if mixer else 0
+        for key, entry in self._entries.items():
+            kind = key[0]
+            counts[kind] = counts.get(kind, 0) + 1
+            if kind == 'image':
+                surface_bytes += entry.get_width() * entry.get_height() * entry.get_bytesize()
+            elif kind == 'sound':
+                sound_bytes += int(entry.get_length() * sample_bytes)
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': counts,
+            'surface_bytes': surface_bytes,
+            'sound_bytes': sound_bytes,
+        }
+
+
+# the one cache every module shares
+assets = AssetCache()
@@ -0,0 +1,312 @@
+# Benchmark Suite - Reproducible performance measurements on the SDL dummy drivers
+# Frame time percentiles per scenario, day transition, save/load and cold startup, written as JSON
+
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+ASSET_DIRS = ['graphics', 'audio', 'data', 'font']
+FRAME_DT = 1 / 60
+
+STARTUP_SCRIPT = """
+import os, sys, time
+start = time.perf_counter()
+sys.path.insert(0, {repo!r})
+import main
+main.Game(vsync=False)
+print(time.perf_counter() - start)
+"""
+
+
+def percentiles(samples):
+    """Summary of timings in milliseconds (p50/p95/p99 need at least two samples)"""
+    ms = [sample * 1000 for sample in samples]
+    if len(ms) > 1:
+        cuts = statistics.quantiles(ms, n=100, method='inclusive')
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = ms[0]
+    return {
+        'n': len(ms),
+        'mean': round(statistics.fmean(ms), 3),
+        'p50': round(p50, 3),
+        'p95': round(p95, 3),
+        'p99': round(p99, 3),
+        'max': round(max(ms), 3),
+    }
+
+
+def make_sandbox(save_file=None):
+    """
+    Temporary working directory holding copies of the game assets, so relative
+    asset paths resolve and benchmark saves never touch the real savegame.json
+    """
+    sandbox = tempfile.mkdtemp(prefix='sprout_bench_')
+    for name in ASSET_DIRS:
+        shutil.copytree(os.path.join(REPO_DIR, name), os.path.join(sandbox, name))
+    if save_file:
+        # legacy JSON saves keep their name so SaveManager migrates them
+        target = 'savegame.json' if save_file.endswith('.json') else 'savegame.sav'
+        shutil.copy(save_file, os.path.join(sandbox, target))
+    return sandbox
+
+
+class Bench:
+    """Builds a fresh game per scenario and times it"""
+    def __init__(self, frames, seed):
+        self.frames = frames
+        self.seed = seed
+
+    def new_game(self):
+        import pygame
+        import main
+        import settings_menu
+        random.seed(self.seed)
+        settings_menu.settings_menu = None  # fresh singleton bound to the new level
+        game = main.Game(vsync=False)  # measure the frame's work, not the wait for the display
+        self.display_update = pygame.display.update
+        return game
+
+    def time_frames(self, level, frames=None):
+        samples = []
+        clock = time.perf_counter
+        for _ in range(frames or self.frames):
+            start = clock()
+            level.run(FRAME_DT, [])
+            self.display_update()
+            samples.append(clock() - start)
+        return samples
+
+    # ---- scenario setup ----
+
+    @staticmethod
+    def farmable(level):
+        soil_layer = level.soil_layer
+        return [(x, y) for y in range(soil_layer.grid_height) for x in range(soil_layer.grid_width)
+            if 'F' in soil_layer.grid[y][x]]
+
+    def plant_everything(self, level):
+        """Till, plant and water every farmable tile"""
+        from settings import TILE_SIZE
+        soil_layer = level.soil_layer
+        crops = list(level.player.seed_inventory)
+        for n, (x, y) in enumerate(self.farmable(level)):
+            pos = (x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2)
+            soil_layer.get_hit(pos)
+            soil_layer.plant_seed(pos, crops[n % len(crops)])
+            soil_layer.water(pos)
+        # let a few days pass so plants reach their taller stages
+        for _ in range(2):
+            level.reset()
+            for x, y in self.farmable(level):
+                soil_layer.water((x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2))
+
+    def scenario(self, name):
+        game = self.new_game()
+        level = game.level
+        # the player needs one update before menus can be drawn over the world
+        self.time_frames(level, 1)
+
+        if name == 'heavy_rain':
+            level.raining = True
+            level.soil_layer.raining = True
+        elif name == 'planted':
+            self.plant_everything(level)
+        elif name == 'menu_shop':
+            level.shop_active = True
+        elif name == 'menu_settings':
+            level.settings_menu.is_open = True
+        elif name == 'menu_inventory':
+            level.inventory.is_open = True
+        elif name == 'menu_book':
+            level.knowledge_book.is_open = True
+
+        # warm up caches and let rain reach a steady state before measuring
+        self.time_frames(level, 60)
+        samples = self.time_frames(level)
+
+        # leave the singletons closed for the next scenario
+        level.inventory.is_open = False
+        level.knowledge_book.is_open = False
+        return percentiles(samples)
+
+    def day_transition(self, repeats):
+        level = self.new_game().level
+        self.plant_everything(level)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            level.reset()
+            samples.append(time.perf_counter() - start)
+        return percentiles(samples)
+
+    def place_emitters(self, level):
+        """Place a drip emitter wherever a free 2x2 block of soil fits"""
+        from settings import TILE_SIZE
+        for x, y in self.farmable(level):
+            level.soil_layer.place_drip_emitter((x * TILE_SIZE + TILE_SIZE // 2, y * TILE_SIZE + TILE_SIZE // 2))
+        return sorted(emitter.tile for emitter in level.soil_layer.drip_sprites)
+
+    def save_load(self, repeats):
+        level = self.new_game().level
+        self.plant_everything(level)
+        emitters = self.place_emitters(level)
+        args = (level.player, level.soil_layer, level.learning_system, level.tree_sprites)
+        manager = level.save_manager
+
+        # save: time the main thread is blocked; save_total: until the file is on disk
+        save_samples, total_samples, load_samples = [], [], []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            manager.save_game(*args, water_tanks=level.water_tank_sprites)
+            save_samples.append(time.perf_counter() - start)
+            manager.flush()
+            total_samples.append(time.perf_counter() - start)
+        for _ in range(repeats):
+            start = time.perf_counter()
+            manager.load_game(*args, water_tanks=level.water_tank_sprites)
+            load_samples.append(time.perf_counter() - start)
+
+        # round trip into a fresh game: every saved emitter is back as a sprite, and no more can be placed on them
+        reloaded = self.new_game().level
+        if sorted(emitter.tile for emitter in reloaded.soil_layer.drip_sprites) != emitters or self.place_emitters(reloaded) != emitters:
+            raise RuntimeError('drip emitters did not survive a save and load')
+
+        result = {
+            'save': percentiles(save_samples),
+            'save_total': percentiles(total_samples),
+            'load': percentiles(load_samples),
+        }
+        result['save_total']['bytes'] = os.path.getsize(manager.filename)
+        return result
+
+
+def cold_startup(repeats):
+    """Game.__init__ (imports included) in a fresh interpreter each time"""
+    samples = []
+    for _ in range(repeats):
+        output = subprocess.run(
+            [sys.executable, '-c', STARTUP_SCRIPT.format(repo=REPO_DIR)],
+            capture_output=True, text=True, check=True, cwd=os.getcwd())
+        samples.append(float(output.stdout.strip().splitlines()[-1]))
+    return percentiles(samples)
+
+
+SCENARIOS = ['idle', 'heavy_rain', 'planted', 'menu_shop', 'menu_settings', 'menu_inventory', 'menu_book']
+
+
+def run_suite(args):
+    import pygame
+    sys.path.insert(0, REPO_DIR)
+    bench = Bench(args.frames, args.seed)
+    results = {}
+
+    for name in args.scenarios:
+        print(f'frame time: {name}', file=sys.stderr)
+        results[f'frame.{name}'] = bench.scenario(name)
+
+    print('day transition', file=sys.stderr)
+    results['reset'] = bench.day_transition(args.repeats)
+
+    print('save/load', file=sys.stderr)
+    save_load = bench.save_load(args.repeats)
+    results['save'] = save_load['save']
+    results['save_total'] = save_load['save_total']
+    results['load'] = save_load['load']
+
+    print('cold startup', file=sys.stderr)
+    results['startup'] = cold_startup(args.startup_runs)
+
+    from assets import assets
+    from text_cache import text_cache
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'platform': platform.platform(),
+            'frames': args.frames,
+            'repeats': args.repeats,
+            'seed': args.seed,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        },
+        'assets': assets.stats(),
+        'text_cache': text_cache.stats(),
+        'results': results,
+    }
+
+
+def compare(report, baseline, threshold, metric):
+    """Regressions where the current metric exceeds the baseline by more than threshold"""
+    regressions = []
+    for name, current in report['results'].items():
+        previous = baseline.get('results', {}).get(name)
+        if not previous or not previous.get(metric):
+            continue
+        ratio = current[metric] / previous[metric]
+        current['vs_baseline'] = round(ratio, 3)
+        if ratio > 1 + threshold:
+            regressions.append((name, previous[metric], current[metric], ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the performance benchmark suite headlessly')
+    parser.add_argument('--output', default='benchmark_results.json', help='where to write the JSON report')
+    parser.add_argument('--baseline', help='JSON report to compare against')
+    parser.add_argument('--threshold', type=float, default=0.15, help='allowed slowdown before a metric counts as a regression')
+    parser.add_argument('--metric', choices=['p50', 'p95', 'p99', 'mean'], default='p95')
+    parser.add_argument('--frames', type=int, default=600, help='measured frames per scenario')
+    parser.add_argument('--repeats', type=int, default=10, help='repeats for reset and save/load')
+    parser.add_argument('--startup-runs', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--save', help='save file to start every game from (default: a new game)')
+    parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=SCENARIOS)
+    args = parser.parse_args()
+
+    output = os.path.abspath(args.output)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    sandbox = make_sandbox(args.save)
+    cwd = os.getcwd()
+    os.chdir(sandbox)
+    try:
+        report = run_suite(args)
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+    regressions = compare(report, baseline, args.threshold, args.metric) if baseline else []
+    with open(output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    for name, result in report['results'].items():
+        line = f"{name:<22} p50 {result['p50']:>9.3f} ms  p95 {result['p95']:>9.3f} ms  p99 {result['p99']:>9.3f} ms"
+        if 'vs_baseline' in result:
+            line += f"  x{result['vs_baseline']:.2f}"
+        print(line)
+    print(f'Report written to {output}')
+
+    if regressions:
+        for name, previous, current, ratio in regressions:
+            print(f'REGRESSION {name}: {args.metric} {previous:.3f} -> {current:.3f} ms (x{ratio:.2f})')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,9 @@ import pygame
 from settings import *
 from knowledge_book import KNOWLEDGE_CARDS, KNOWLEDGE_CATEGORIES, QUICK_TIPS
 from knowledge_base import ACHIEVEMENT_DEFINITIONS, SKILL_DEFINITIONS
-from timer import Timer
+from assets import assets
+from text_cache import render_text
+from input_map import PRESS
 
 class KnowledgeBookUI:
     """
@@ -15,9 +17,9 @@ class KnowledgeBookUI:
     
     def __init__(self):
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font('./font/LycheeSoda.ttf', 28)
-        self.title_font = pygame.font.Font('./font/LycheeSoda.ttf', 36)
-        self.small_font = pygame.font.Font('./font/LycheeSoda.ttf', 18)
+        self.font = assets.font('./font/LycheeSoda.ttf', 28)
+        self.title_font = assets.font('./font/LycheeSoda.ttf', 36)
+        self.small_font = assets.font('./font/LycheeSoda.ttf', 18)
         
         # Book state
         self.is_open = False
@@ -29,12 +31,6 @@ class KnowledgeBookUI:
         self.tabs = ["Guide", "Achievements", "Skills"]
         self.active_tab = 0 # 0: Guide, 1: Achievements, 2: Skills
         
-        # Navigation timer
-        self.timer = Timer(200)
-        
-        # Cooldown to prevent immediate close after open
-        self.open_time = 0
-        
         # Book dimensions (taller to fit more content)
         self.book_width = 800
         self.book_height = 650
@@ -45,71 +41,64 @@ class KnowledgeBookUI:
         """Open or close the book"""
         self.is_open = not self.is_open
         if self.is_open:
-            self.open_time = pygame.time.get_ticks()
             # Update cards list if needed
             self.cards = list(KNOWLEDGE_CARDS.keys())
     
-    def update(self):
-        """Handle input when book is open"""
-        if not self.is_open:
-            return
-        
-        keys = pygame.key.get_pressed()
-        self.timer.update()
-        current_time = pygame.time.get_ticks()
-        
-        # Don't allow close for 500ms after opening (prevents double-toggle)
-        if current_time - self.open_time < 500:
-            return
-        
-        # Only Escape closes (B is handled by Level to toggle)
-        if keys[pygame.K_ESCAPE]:
-            if not self.timer.active:
-                self.timer.activate()
-                self.is_open = False
-        
-        if not self.timer.active:
-            # Page Navigation
-            if keys[pygame.K_LEFT]:
-                self.current_page = max(0, self.current_page - 1)
-                self.timer.activate()
+    def handle_input(self, event):
+        """Page and tab controls while the book is open (B is handled by Level to toggle)"""
+        if not event.pressed:
+            return False
+        actions = event.actions
+
+        if 'back' in actions and event.kind == PRESS:
+            self.is_open = False
+
+        # Page Navigation
+        elif 'menu_left' in actions:
+            self.current_page = max(0, self.current_page - 1)
+        
+        elif 'menu_right' in actions:
+            # Limit depends on active tab
+            if self.active_tab == 0:
+                limit = len(self.cards) - 1
+            elif self.active_tab == 1:
+                limit = 5 # roughly
+            else:
+                limit = 0 # Skills fits on one page
             
-            if keys[pygame.K_RIGHT]:
-                # Limit depends on active tab
-                if self.active_tab == 0:
-                    limit = len(self.cards) - 1
-                elif self.active_tab == 1:
-                    limit = 5 # roughly
-                else:
-                    limit = 0 # Skills fits on one page
-                
-                self.current_page = min(limit, self.current_page + 1)
-                self.timer.activate()
+            self.current_page = min(limit, self.current_page + 1)
 
-            # Tab Navigation (1, 2, 3)
-            if keys[pygame.K_1]:
-                self.active_tab = 0
-                self.current_page = 0
-                self.timer.activate()
-            if keys[pygame.K_2]:
-                self.active_tab = 1
-                self.current_page = 0
-                self.timer.activate()
-            if keys[pygame.K_3]:
-                self.active_tab = 2
-                self.current_page = 0
-                self.timer.activate()
+        # Tab Navigation (1, 2, 3)
+        elif 'tab_1' in actions:
+            self.active_tab = 0
+            self.current_page = 0
+        elif 'tab_2' in actions:
+            self.active_tab = 1
+            self.current_page = 0
+        elif 'tab_3' in actions:
+            self.active_tab = 2
+            self.current_page = 0
+
+        else:
+            return False
+        return True
     
+    # Modal frame protocol (see retained.py): how strongly the world behind is dimmed
+    dim_alpha = 200
+
+    def render_key(self):
+        """Everything display() depends on; the cached frame is redrawn when it changes"""
+        achievements = skills = None
+        if self.learning_system:
+            achievements = frozenset(self.learning_system.achievements)
+            skills = tuple(self.learning_system.skill_tree.get_unlocked_skills())
+        return (self.active_tab, self.current_page, len(self.cards), achievements, skills)
+
     def display(self):
         """Render the knowledge book"""
         if not self.is_open:
             return
         
-        # Dim background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.display_surface.blit(overlay, (0, 0))
-        
         # Book background
         book_rect = pygame.Rect(self.book_x, self.book_y, self.book_width, self.book_height)
         pygame.draw.rect(self.display_surface, (45, 35, 25), book_rect, 0, 10)
@@ -119,12 +108,12 @@ class KnowledgeBookUI:
         titles = ["📖 Sustainable Guide", "🏆 Achievements", "🌳 Skill Tree"]
         title_text = titles[self.active_tab]
         
-        title = self.title_font.render(title_text, False, (255, 230, 180))
+        title = render_text(self.title_font, title_text, False, (255, 230, 180))
         title_rect = title.get_rect(midtop=(SCREEN_WIDTH // 2, self.book_y + 15))
         self.display_surface.blit(title, title_rect)
 
         # Tab Hints
-        tab_hint = self.small_font.render("Tabs: [1] Guide   [2] Achievements   [3] Skills", False, (200, 200, 200))
+        tab_hint = render_text(self.small_font, "Tabs: [1] Guide   [2] Achievements   [3] Skills", False, (200, 200, 200))
         tab_rect = tab_hint.get_rect(midtop=(SCREEN_WIDTH // 2, self.book_y + 55))
         self.display_surface.blit(tab_hint, tab_rect)
         
@@ -143,7 +132,7 @@ class KnowledgeBookUI:
             self._render_card(card)
         
         # Page indicator
-        page_text = self.small_font.render(
+        page_text = render_text(self.small_font, 
             f"Page {self.current_page + 1}/{len(self.cards)}", 
             False, 
             (200, 200, 200)
@@ -174,7 +163,7 @@ class KnowledgeBookUI:
         total_count = len(achievements_list)
         
         # Progress header
-        progress_text = self.small_font.render(
+        progress_text = render_text(self.small_font, 
             f"Progress: {unlocked_count}/{total_count} achievements unlocked",
             False, (255, 215, 0)
         )
@@ -196,31 +185,31 @@ class KnowledgeBookUI:
             
             # Icon/Status
             status = "🔓" if is_unlocked else "🔒"
-            status_surf = self.font.render(status, False, text_color)
+            status_surf = render_text(self.font, status, False, text_color)
             self.display_surface.blit(status_surf, (entry_rect.left + 15, entry_rect.centery - 15))
             
             # Name - always show the name for discoverability
-            name_surf = self.font.render(data['name'], False, text_color)
+            name_surf = render_text(self.font, data['name'], False, text_color)
             self.display_surface.blit(name_surf, (entry_rect.left + 60, entry_rect.top + 10))
             
             # Description
             desc_text = data['description'] if is_unlocked else data['condition']
-            desc_surf = self.small_font.render(desc_text, False, (200, 200, 200) if is_unlocked else (120, 120, 120))
+            desc_surf = render_text(self.small_font, desc_text, False, (200, 200, 200) if is_unlocked else (120, 120, 120))
             self.display_surface.blit(desc_surf, (entry_rect.left + 60, entry_rect.bottom - 25))
             
             # Points
-            pts_surf = self.small_font.render(f"+{data['points']} pts", False, (255, 215, 0) if is_unlocked else (100, 100, 100))
+            pts_surf = render_text(self.small_font, f"+{data['points']} pts", False, (255, 215, 0) if is_unlocked else (100, 100, 100))
             pts_rect = pts_surf.get_rect(midright=(entry_rect.right - 15, entry_rect.centery))
             self.display_surface.blit(pts_surf, pts_rect)
         
         # Page indicator
         if total_pages > 1:
-            page_text = self.small_font.render(
+            page_text = render_text(self.small_font, 
                 f"◀ Page {current_ach_page + 1}/{total_pages} ▶",
                 False, (200, 200, 200)
             )
         else:
-            page_text = self.small_font.render(
+            page_text = render_text(self.small_font, 
                 "ESC to close",
                 False, (200, 200, 200)
             )
@@ -287,12 +276,12 @@ class KnowledgeBookUI:
             
             # Icon (Generic for now)
             icon = "☀" if is_unlocked else "🔒"
-            icon_surf = self.title_font.render(icon, False, text_color)
+            icon_surf = render_text(self.title_font, icon, False, text_color)
             icon_rect = icon_surf.get_rect(center=pos)
             self.display_surface.blit(icon_surf, icon_rect)
             
             # Label
-            label_surf = self.small_font.render(label, False, text_color)
+            label_surf = render_text(self.small_font, label, False, text_color)
             label_rect = label_surf.get_rect(midtop=(pos[0], pos[1] + radius + 10))
             self.display_surface.blit(label_surf, label_rect)
             
@@ -304,7 +293,7 @@ class KnowledgeBookUI:
                 elif "overwater" in cond: cond = "No Overwater 3 days"
                 elif "50" in cond: cond = "Score 50+"
                 
-                cond_surf = self.small_font.render(f"Requires: {cond}", False, (150, 100, 100))
+                cond_surf = render_text(self.small_font, f"Requires: {cond}", False, (150, 100, 100))
                 cond_rect = cond_surf.get_rect(midtop=(pos[0], pos[1] + radius + 30))
                 self.display_surface.blit(cond_surf, cond_rect)
 
@@ -316,19 +305,19 @@ class KnowledgeBookUI:
         max_content_y = self.book_y + self.book_height - 80  # Leave room for page nav
         
         # Card title
-        title = self.font.render(card["title"], False, (255, 220, 100))
+        title = render_text(self.font, card["title"], False, (255, 220, 100))
         self.display_surface.blit(title, (content_x, content_y))
         content_y += 35
         
         # Category badge
         category = card.get("category", "General")
         cat_data = KNOWLEDGE_CATEGORIES.get(category, {"icon": "📚", "color": (200, 200, 200)})
-        cat_text = self.small_font.render(f"{cat_data['icon']} {category}", False, cat_data['color'])
+        cat_text = render_text(self.small_font, f"{cat_data['icon']} {category}", False, cat_data['color'])
         self.display_surface.blit(cat_text, (content_x, content_y))
         content_y += 25
         
         # Summary
-        summary = self.small_font.render(card["summary"], False, (255, 255, 255))
+        summary = render_text(self.small_font, card["summary"], False, (255, 255, 255))
         self.display_surface.blit(summary, (content_x, content_y))
         content_y += 30
         
@@ -346,7 +335,7 @@ class KnowledgeBookUI:
             if content_y + line_height > max_content_y - 50:  # Leave room for effect box
                 break
             if line.strip():
-                text_surf = self.small_font.render(line.strip(), False, (220, 220, 220))
+                text_surf = render_text(self.small_font, line.strip(), False, (220, 220, 220))
                 self.display_surface.blit(text_surf, (content_x, content_y))
             content_y += line_height
         
@@ -358,7 +347,7 @@ class KnowledgeBookUI:
             pygame.draw.rect(self.display_surface, (60, 50, 40), effect_rect, 0, 5)
             pygame.draw.rect(self.display_surface, (100, 200, 100), effect_rect, 2, 5)
             
-            effect_surf = self.small_font.render(f"🎮 {effect_text}", False, (150, 255, 150))
+            effect_surf = render_text(self.small_font, f"🎮 {effect_text}", False, (150, 255, 150))
             self.display_surface.blit(effect_surf, (content_x, effect_y + 5))
 
 
@@ -0,0 +1,54 @@
+# Derived Stats - Cached player stats that are recomputed only when one of their inputs changes
+# Skill unlocks, placed tanks, fatigue and badges invalidate the stats that depend on them
+
+class DerivedStats:
+    """
+    Stats built from a base value and a chain of modifiers.
+
+    Data Structure: HASH MAP of cached values + reverse map input -> stats
+    Purpose: reading a stat is a dict lookup. Each modifier names the
+    inputs it reads (e.g. 'skills', 'fatigue'), and invalidate(input) drops
+    only the cached stats that depend on it. They are recomputed the next
+    time they are read. Modifiers cost nothing on frames where none of
+    their inputs changed.
+    """
+    def __init__(self):
+        self.bases = {}      # stat -> base value, or a callable returning it
+        self.modifiers = {}  # stat -> [modifier(value) -> value]
+        self.dependents = {}  # input -> stats to invalidate
+        self.cache = {}
+        self.recomputes = 0
+
+    def define(self, stat, base, inputs=()):
+        self.bases[stat] = base
+        self.modifiers.setdefault(stat, [])
+        self._depend(stat, inputs)
+        self.cache.pop(stat, None)
+
+    def add_modifier(self, stat, modifier, inputs):
+        """modifier(value) -> value, rerun whenever one of inputs is invalidated"""
+        self.modifiers[stat].append(modifier)
+        self._depend(stat, inputs)
+        self.cache.pop(stat, None)
+
+    def _depend(self, stat, inputs):
+        for name in inputs:
+            self.dependents.setdefault(name, set()).add(stat)
+
+    def __getitem__(self, stat):
+        try:
+            return self.cache[stat]
+        except KeyError:
+            pass
+        base = self.bases[stat]
+        value = base() if callable(base) else base
+        for modifier in self.modifiers[stat]:
+            value = modifier(value)
+        self.cache[stat] = value
+        self.recomputes += 1
+        return value
+
+    def invalidate(self, name):
+        """An input changed: forget every stat built from it"""
+        for stat in self.dependents.get(name, ()):
+            self.cache.pop(stat, None)
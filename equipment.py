@@ -1,5 +1,6 @@
 import pygame
 from settings import *
+from assets import assets
 import os
 
 class PlacedWaterTank(pygame.sprite.Sprite):
@@ -13,9 +14,8 @@ class PlacedWaterTank(pygame.sprite.Sprite):
         # Load the barrel image
         barrel_path = './graphics/objects/barrel.png'
         if os.path.exists(barrel_path):
-            self.image = pygame.image.load(barrel_path).convert_alpha()
-            # Scale to 2x2 tile size
-            self.image = pygame.transform.scale(self.image, (tank_size, tank_size))
+            # Scaled to 2x2 tile size once and shared by every tank
+            self.image = assets.image(barrel_path, (tank_size, tank_size))
         else:
             # Fallback: simple brown rectangle
             self.image = pygame.Surface((tank_size, tank_size), pygame.SRCALPHA)
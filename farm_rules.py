@@ -0,0 +1,192 @@
+# Farm Rules - Till, plant, water, fertilize, harvest and day-transition rules over the packed soil grid
+# SoilLayer, Player and Level add sprites, sounds and input around them; the headless simulation calls them directly
+
+import os
+
+from knowledge_base import CROP_DATA, FERTILIZER_DATA, SOIL_IMPACTS
+from soil_grid import FARMABLE, TILLED, WATERED, PLANTED
+
+RAIN_COLLECTED = 5         # water a rainy day adds to the reserve (twice that to the rain tank)
+TANK_RAIN_BONUS = 15       # extra rain tank water per placed water tank on a rainy day
+TANK_CAPACITY_BONUS = 20   # max water reserve added per placed water tank
+SKILL_CAPACITY_BONUS = 20  # max water reserve added by the Water Management skill
+
+
+def crop_stages(path='./graphics/fruit'):
+    """Last growth stage per crop, counted from its frame files (no images are loaded)"""
+    return {crop: len(os.listdir(os.path.join(path, crop))) - 1 for crop in CROP_DATA}
+
+
+# =============================================================================
+# TILES
+# =============================================================================
+
+def impact(soil, learning_system, x, y, impact_type):
+    """Apply a soil health change and log it to the learning system"""
+    soil.change_health(x, y, SOIL_IMPACTS.get(impact_type, {}).get('soil', 0))
+    learning_system.log_action(impact_type)
+
+
+def till(soil, x, y):
+    """Hoe a farmable tile. True if it was not tilled before."""
+    if soil.has(x, y, FARMABLE) and not soil.has(x, y, TILLED):
+        soil.set(x, y, TILLED)
+        return True
+    return False
+
+
+def rain(soil, learning_system):
+    """Water every tilled tile; returns the (x, y) tiles that were still dry"""
+    dry = soil.water_tilled()
+    # Rain counts as watering
+    learning_system.watered_today = True
+    return dry
+
+
+def plant(soil, learning_system, x, y, crop, max_age):
+    """Plant crop on a tilled, empty tile (rotation and monocropping change the soil). True if planted."""
+    if not soil.has(x, y, TILLED) or soil.has(x, y, PLANTED):
+        return False
+
+    last_crop = soil.get_crop(x, y)
+    if last_crop and last_crop == crop:
+        # Monocropping penalty
+        impact(soil, learning_system, x, y, 'monocrop')
+    elif last_crop and last_crop != crop:
+        # Crop rotation bonus
+        impact(soil, learning_system, x, y, 'rotation')
+        learning_system.rotation_count += 1
+
+    i = soil.index(x, y)
+    soil.set_crop(x, y, crop)
+    soil.set(x, y, PLANTED)
+    soil.age[i] = 0
+    soil.max_age[i] = max_age
+    soil.unwatered[i] = 0
+    return True
+
+
+def water(soil, learning_system, x, y):
+    """Water a tilled tile; a third watering in one day over-waters it. True if watered."""
+    if not soil.has(x, y, TILLED):
+        return False
+    soil.set(x, y, WATERED)
+
+    # Track water count for this tile (for over-watering detection; correct watering is judged at end of day)
+    if soil.add_water(x, y) > 2:
+        impact(soil, learning_system, x, y, 'over_water')
+        learning_system.overwatered_today = True
+    learning_system.watered_today = True
+    return True
+
+
+def fertilize(soil, learning_system, x, y, fertilizer):
+    """Apply fertilizer to a tilled tile. True if it was applied."""
+    if not soil.has(x, y, TILLED):
+        return False
+
+    fert_data = FERTILIZER_DATA.get(fertilizer, {})
+    soil_effect = fert_data.get('soil_effect', 0)
+    soil.change_health(x, y, soil_effect)
+
+    # Bonus when the fertilizer suits the crop growing here
+    bonus_score = 0
+    bonus_msg = ""
+    if soil.has(x, y, PLANTED):
+        current_crop = soil.get_crop(x, y)
+        if current_crop in fert_data.get('best_for', []):
+            bonus_score = 5
+            bonus_msg = f" Perfect for {current_crop.capitalize()}! (+{bonus_score})"
+
+    if fert_data.get('type') == 'organic':
+        learning_system.log_action('organic_fert', f'+{soil_effect} soil')
+        learning_system.add_notification(f"🌿 Organic fertilizer applied{bonus_msg}")
+        learning_system.organic_fertilizer_count += 1
+    else:
+        learning_system.log_action('chemical_fert', f'{soil_effect} soil')
+        learning_system.add_notification(f"⚗️ Chemical fertilizer applied{bonus_msg}")
+
+    learning_system.total_score += fert_data.get('score_effect', 0) + bonus_score
+    return True
+
+
+def harvest(soil, learning_system, x, y):
+    """Clear a ripe plant from its tile; returns how many crops it yields (two from healthy soil)"""
+    soil.clear(x, y, PLANTED)
+    if learning_system.calculate_yield_modifier(soil.health[soil.index(x, y)]) >= 1.5:
+        learning_system.add_notification("🌾 Bonus harvest from healthy soil!")
+        return 2
+    return 1
+
+
+# =============================================================================
+# WATER ECONOMY
+# =============================================================================
+
+def pay_water(farmer, cost):
+    """Take cost water from the rain tank, or else from the reserve. False if neither holds enough."""
+    if farmer.rain_tank.use_water(cost):
+        return True
+    if farmer.water_reserve >= cost:
+        farmer.water_reserve -= cost
+        return True
+    return False
+
+
+def max_water_reserve(base, skills, water_tank_bonus):
+    """Reserve capacity: base + Water Management skill + placed tanks"""
+    skill_bonus = SKILL_CAPACITY_BONUS if 'Water Management' in skills else 0
+    return base + skill_bonus + water_tank_bonus
+
+
+def place_water_tank(farmer, learning_system):
+    """A placed tank raises the farmer's max water reserve"""
+    farmer.water_tank_bonus += TANK_CAPACITY_BONUS
+    learning_system.add_notification(f"💧 Water capacity +{TANK_CAPACITY_BONUS}! (Max: {farmer.max_water_reserve})")
+
+
+def collect_rainwater(farmer, learning_system, amount=RAIN_COLLECTED):
+    """Rain fills the rain tank (twice as efficiently) and some of the reserve"""
+    farmer.rain_tank.collect_rain(amount * 2)
+    farmer.water_reserve = min(farmer.max_water_reserve, farmer.water_reserve + amount)
+    learning_system.add_notification(f"💧 Rain Tank filled: {int(farmer.rain_tank.get_fill_percentage()*100)}%")
+
+
+# =============================================================================
+# DAY TRANSITION
+# =============================================================================
+
+def end_day(soil, learning_system, raining):
+    """
+    The night: one batched SoilGrid.day_tick (watering verdicts, growth,
+    deaths and tomorrow's rain), its verdicts logged, then achievements and
+    skill unlocks. Returns the DayResult (for syncing sprites) and the stats.
+    """
+    rain_tomorrow = learning_system.get_next_weather() == 'rain'
+    result = soil.day_tick(raining, rain_tomorrow)
+    for impact_type, count in result.verdicts.items():
+        learning_system.log_actions(impact_type, count)
+
+    stats = {'avg_soil_health': soil.average_health()}
+    learning_system.check_achievements(stats)
+    learning_system.check_skill_unlocks(stats)
+    return result, stats
+
+
+def start_day(learning_system, farmer, water_tanks=0):
+    """Advance the weather and day counter; a rainy morning collects water. Returns whether it rains."""
+    learning_system.advance_day()
+    learning_system.clear_daily_log()
+
+    raining = learning_system.get_current_weather() == 'rain'
+    if raining:
+        # Rain counts as watering (the soil was already watered by end_day)
+        learning_system.watered_today = True
+        collect_rainwater(farmer, learning_system)
+
+        # Bonus collection from placed water tanks
+        tank_bonus = water_tanks * TANK_RAIN_BONUS
+        if tank_bonus > 0:
+            farmer.rain_tank.collect_rain(tank_bonus)
+            learning_system.add_notification(f"💧 Tanks collected +{tank_bonus} water!")
+    return raining
@@ -0,0 +1,66 @@
+# Frame Pacing - Fixed-timestep accumulator for the main loop
+# The simulation advances in equal steps whatever the frame rate, and drawing interpolates between the last two steps
+
+class FramePacer:
+    """
+    Turns variable frame times into a whole number of fixed simulation steps.
+
+    Each frame, advance(frame_seconds) adds the elapsed time to an
+    accumulator and returns how many steps of `step` seconds to simulate.
+    Whatever is left over is less than one step; alpha (0..1) says how far
+    the frame lies between the last two simulated states, for drawing.
+
+    At most max_steps run per frame. Time beyond that is dropped, so a long
+    stall slows the game down rather than making it step forever to catch
+    up. With adaptive set, frames that needed catch-up steps skip drawing
+    (at most max_skipped in a row) to give the time back to the simulation.
+    """
+    def __init__(self, step_hz, max_steps=5, adaptive=True, max_skipped=2):
+        self.step = 1 / step_hz
+        self.max_steps = max_steps
+        self.adaptive = adaptive
+        self.max_skipped = max_skipped
+        self.accumulator = 0.0
+        self.skipped = 0  # consecutive frames not drawn
+        self.behind = False  # the last frame needed catch-up steps
+
+        # counters for profiling
+        self.frames = 0
+        self.steps = 0
+        self.renders = 0
+        self.dropped = 0.0  # seconds of simulation given up
+
+    def advance(self, frame_seconds):
+        """Add a frame's elapsed time; returns the number of steps to simulate"""
+        self.frames += 1
+        self.accumulator += frame_seconds
+        steps = min(int(self.accumulator / self.step), self.max_steps)
+        self.accumulator -= steps * self.step
+        if self.accumulator >= self.step:
+            self.dropped += self.accumulator - self.accumulator % self.step
+            self.accumulator %= self.step
+        self.steps += steps
+        self.behind = steps > 1
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.step
+
+    def should_render(self):
+        """False when this frame's drawing should be skipped to let the simulation catch up"""
+        if self.adaptive and self.behind and self.skipped < self.max_skipped:
+            self.skipped += 1
+            return False
+        self.skipped = 0
+        self.renders += 1
+        return True
+
+    def stats(self):
+        return {
+            'frames': self.frames,
+            'steps': self.steps,
+            'renders': self.renders,
+            'skipped_renders': self.frames - self.renders,
+            'dropped_seconds': round(self.dropped, 3),
+        }
@@ -0,0 +1,126 @@
+# Input Map - Named actions, rebindable key bindings and event dispatch to the active context
+# The SDL event queue is read once per frame; nothing polls the keyboard
+
+from typing import NamedTuple
+import pygame
+
+PRESS = 'press'
+RELEASE = 'release'
+REPEAT = 'repeat'  # key held past the repeat delay (pygame.key.set_repeat)
+
+# action -> keys; one key may serve several actions, each context picks the ones it knows
+DEFAULT_BINDINGS = {
+    # world
+    'move_up': [pygame.K_w],
+    'move_down': [pygame.K_s],
+    'move_left': [pygame.K_a],
+    'move_right': [pygame.K_d],
+    'use_tool': [pygame.K_SPACE],
+    'next_tool': [pygame.K_q],
+    'use_seed': [pygame.K_LCTRL],
+    'next_seed': [pygame.K_e],
+    'next_fertilizer': [pygame.K_f],
+    'apply_fertilizer': [pygame.K_r],
+    'next_irrigation': [pygame.K_o],
+    'next_equipment': [pygame.K_g],
+    'place_equipment': [pygame.K_t],
+    'interact': [pygame.K_RETURN],
+    'toggle_book': [pygame.K_b],
+    'toggle_inventory': [pygame.K_i],
+    'toggle_settings': [pygame.K_p],
+
+    # menus
+    'menu_up': [pygame.K_UP],
+    'menu_down': [pygame.K_DOWN],
+    'menu_left': [pygame.K_LEFT],
+    'menu_right': [pygame.K_RIGHT],
+    'confirm': [pygame.K_SPACE, pygame.K_RETURN],
+    'back': [pygame.K_ESCAPE],
+    'tab_1': [pygame.K_1],
+    'tab_2': [pygame.K_2],
+    'tab_3': [pygame.K_3],
+    'next_tab': [pygame.K_TAB],
+    'previous_tab': [pygame.K_q],
+    'search': [pygame.K_s],
+    'decrease': [pygame.K_a],
+    'increase': [pygame.K_d],
+}
+
+
+class InputEvent(NamedTuple):
+    kind: str       # PRESS, RELEASE or REPEAT
+    key: int
+    unicode: str    # typed character for presses and repeats, '' otherwise
+    actions: tuple  # every action bound to key
+
+    @property
+    def pressed(self):
+        """A press or a repeat (for actions that should auto-repeat while held)"""
+        return self.kind != RELEASE
+
+
+class InputMap:
+    """
+    Turns key events into InputEvents carrying named actions.
+
+    Data Structure: HASH MAP key -> actions (rebuilt by bind())
+    Purpose: each frame costs O(events). dispatch() walks the events once,
+    looks up the actions of each key and offers the InputEvent to the
+    active contexts, top of the stack first. A context is anything with
+    handle_input(event) returning True when it used the event, which stops
+    it there. The stack is asked for again for every event, so a key that
+    opens a menu sends the keys after it to that menu.
+
+    Held keys are tracked from KEYDOWN/KEYUP, so continuous input such as
+    movement asks held(action) instead of polling the keyboard.
+    """
+    def __init__(self, bindings=DEFAULT_BINDINGS):
+        self.bindings = {}  # action -> keys
+        self.key_actions = {}  # key -> actions
+        self.held_keys = set()
+        for action, keys in bindings.items():
+            self.bind(action, *keys)
+
+    def bind(self, action, *keys):
+        """Bind action to keys, replacing its previous keys"""
+        self.bindings[action] = tuple(keys)
+        key_actions = {}
+        for bound_action, bound_keys in self.bindings.items():
+            for key in bound_keys:
+                key_actions.setdefault(key, []).append(bound_action)
+        self.key_actions = {key: tuple(actions) for key, actions in key_actions.items()}
+
+    def keys_for(self, action):
+        return self.bindings.get(action, ())
+
+    def held(self, action):
+        return any(key in self.held_keys for key in self.bindings.get(action, ()))
+
+    def release_all(self):
+        """Forget held keys (e.g. focus lost, so their KEYUPs will never arrive)"""
+        self.held_keys.clear()
+
+    def dispatch(self, events, contexts):
+        """Offer every key event to contexts() (top first) until one handles it"""
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                kind = REPEAT if event.key in self.held_keys else PRESS
+                self.held_keys.add(event.key)
+                unicode = event.unicode
+            elif event.type == pygame.KEYUP:
+                kind = RELEASE
+                self.held_keys.discard(event.key)
+                unicode = ''
+            else:
+                if event.type == pygame.WINDOWFOCUSLOST:
+                    self.release_all()
+                continue
+
+            input_event = InputEvent(kind, event.key, unicode, self.key_actions.get(event.key, ()))
+            for context in contexts():
+                if context.handle_input(input_event):
+                    break
+
+
+# the bindings every module shares
+input_map = InputMap()
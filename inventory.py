@@ -4,6 +4,9 @@
 import pygame
 from settings import *
 from knowledge_base import FERTILIZER_DATA
+from assets import assets
+from text_cache import render_text
+from input_map import PRESS
 
 def get_item_category(item_name):
     """Get the category of an item by name"""
@@ -30,9 +33,9 @@ class Inventory:
         
         # Font setup
         self.font_path = './font/LycheeSoda.ttf'
-        self.title_font = pygame.font.Font(self.font_path, 32)
-        self.item_font = pygame.font.Font(self.font_path, 20)
-        self.quantity_font = pygame.font.Font(self.font_path, 16)
+        self.title_font = assets.font(self.font_path, 32)
+        self.item_font = assets.font(self.font_path, 20)
+        self.quantity_font = assets.font(self.font_path, 16)
         
         # Grid settings (8 columns x 4 rows)
         self.cols = 8
@@ -60,10 +63,6 @@ class Inventory:
         # Selection
         self.selected_slot = 0
         
-        # Input cooldowns
-        self.input_timer = pygame.time.get_ticks()
-        self.input_cooldown = 150
-        
         # Colors (Minecraft-inspired dark theme)
         self.bg_color = (29, 29, 29)           # Dark gray background
         self.border_color = (60, 60, 60)       # Lighter gray border
@@ -93,10 +92,8 @@ class Inventory:
         
         for name in icon_names:
             try:
-                icon = pygame.image.load(f'{overlay_path}{name}.png').convert_alpha()
-                # Scale to fit in slot
-                icon = pygame.transform.scale(icon, (48, 48))
-                self.item_icons[name] = icon
+                # Scaled to fit in slot
+                self.item_icons[name] = assets.image(f'{overlay_path}{name}.png', (48, 48))
             except:
                 pass  # Icon not found, will show text instead
         
@@ -128,8 +125,8 @@ class Inventory:
                 pygame.draw.rect(surf, color, (8, 12, 32, 28), border_radius=4)
                 pygame.draw.rect(surf, (255, 255, 255), (8, 12, 32, 28), 2, border_radius=4)
                 # Draw label
-                font = pygame.font.Font(self.font_path, 14)
-                text = font.render(label, True, (0, 0, 0) if sum(color) > 400 else (255, 255, 255))
+                font = assets.font(self.font_path, 14)
+                text = render_text(font, label, True, (0, 0, 0) if sum(color) > 400 else (255, 255, 255))
                 text_rect = text.get_rect(center=(24, 26))
                 surf.blit(text, text_rect)
                 self.item_icons[name] = surf
@@ -166,8 +163,6 @@ class Inventory:
             self.current_category = 0
             self.search_text = ""
             self.search_active = False
-            # Reset input timer to prevent immediate close from same keypress
-            self.input_timer = pygame.time.get_ticks()
             # Build hash map of all items for search
             self._build_item_hash_map()
     
@@ -257,72 +252,65 @@ class Inventory:
     
     def handle_text_input(self, event):
         """Handle text input for search"""
-        if event.type == pygame.KEYDOWN and self.search_active:
-            if event.key == pygame.K_BACKSPACE:
-                self.search_text = self.search_text[:-1]
-            elif event.key == pygame.K_RETURN:
-                self.search_active = False
-            elif event.key == pygame.K_ESCAPE:
-                self.search_text = ""
-                self.search_active = False
-            elif event.unicode.isalnum() or event.unicode == '_':
-                self.search_text += event.unicode.lower()
+        if event.key == pygame.K_BACKSPACE:
+            self.search_text = self.search_text[:-1]
+        elif event.key == pygame.K_RETURN:
+            self.search_active = False
+        elif event.key == pygame.K_ESCAPE:
+            self.search_text = ""
+            self.search_active = False
+        elif event.unicode.isalnum() or event.unicode == '_':
+            self.search_text += event.unicode.lower()
     
-    def input(self):
-        """Handle keyboard input for navigation"""
-        current_time = pygame.time.get_ticks()
-        if current_time - self.input_timer < self.input_cooldown:
-            return
-            
-        keys = pygame.key.get_pressed()
+    def handle_input(self, event):
+        """Keyboard navigation; while searching every key goes to the search text"""
+        if not event.pressed:
+            return self.search_active
+        if self.search_active:
+            self.handle_text_input(event)
+            return True
+
+        actions = event.actions
+        press = event.kind == PRESS
         items = self.get_category_items()
         num_items = len(items)
         
-        # Close inventory (but not if typing in search)
-        if not self.search_active and (keys[pygame.K_i] or keys[pygame.K_ESCAPE]):
+        # Close inventory
+        if ('toggle_inventory' in actions or 'back' in actions) and press:
             self.is_open = False
-            self.input_timer = current_time
-            return
         
         # S key to toggle search mode
-        if keys[pygame.K_s] and not self.search_active:
+        elif 'search' in actions and press:
             self.search_active = True
             self.search_text = ""
-            self.input_timer = current_time
-            return
         
         # Tab switching
-        if keys[pygame.K_TAB]:
+        elif 'next_tab' in actions:
             self.current_category = (self.current_category + 1) % len(self.categories)
             self.selected_slot = 0
-            self.input_timer = current_time
-            return
         
         # Q to go to previous tab
-        if keys[pygame.K_q]:
+        elif 'previous_tab' in actions:
             self.current_category = (self.current_category - 1) % len(self.categories)
             self.selected_slot = 0
-            self.input_timer = current_time
-            return
         
         # Arrow key navigation
-        if num_items > 0:
-            if keys[pygame.K_RIGHT]:
-                self.selected_slot = (self.selected_slot + 1) % num_items
-                self.input_timer = current_time
-            elif keys[pygame.K_LEFT]:
-                self.selected_slot = (self.selected_slot - 1) % num_items
-                self.input_timer = current_time
-            elif keys[pygame.K_DOWN]:
-                new_slot = self.selected_slot + self.cols
-                if new_slot < num_items:
-                    self.selected_slot = new_slot
-                self.input_timer = current_time
-            elif keys[pygame.K_UP]:
-                new_slot = self.selected_slot - self.cols
-                if new_slot >= 0:
-                    self.selected_slot = new_slot
-                self.input_timer = current_time
+        elif num_items > 0 and 'menu_right' in actions:
+            self.selected_slot = (self.selected_slot + 1) % num_items
+        elif num_items > 0 and 'menu_left' in actions:
+            self.selected_slot = (self.selected_slot - 1) % num_items
+        elif num_items > 0 and 'menu_down' in actions:
+            new_slot = self.selected_slot + self.cols
+            if new_slot < num_items:
+                self.selected_slot = new_slot
+        elif num_items > 0 and 'menu_up' in actions:
+            new_slot = self.selected_slot - self.cols
+            if new_slot >= 0:
+                self.selected_slot = new_slot
+
+        else:
+            return False
+        return True
     
     def draw_background(self):
         """Draw inventory background panel"""
@@ -331,7 +319,7 @@ class Inventory:
         pygame.draw.rect(self.display_surface, self.border_color, self.rect, 3, border_radius=8)
         
         # Title
-        title = self.title_font.render("INVENTORY", True, self.text_color)
+        title = render_text(self.title_font, "INVENTORY", True, self.text_color)
         title_rect = title.get_rect(midtop=(SCREEN_WIDTH // 2, self.rect.top + 10))
         self.display_surface.blit(title, title_rect)
     
@@ -355,7 +343,7 @@ class Inventory:
             pygame.draw.rect(self.display_surface, self.border_color, tab_rect, 2, border_radius=4)
             
             # Tab text
-            text = self.item_font.render(category, True, self.text_color)
+            text = render_text(self.item_font, category, True, self.text_color)
             text_rect = text.get_rect(center=tab_rect.center)
             self.display_surface.blit(text, text_rect)
     
@@ -398,13 +386,13 @@ class Inventory:
         else:
             # Fallback: draw item name abbreviation
             abbrev = name[:3].upper()
-            text = self.item_font.render(abbrev, True, self.text_color)
+            text = render_text(self.item_font, abbrev, True, self.text_color)
             text_rect = text.get_rect(center=slot_rect.center)
             self.display_surface.blit(text, text_rect)
         
         # Draw quantity badge (bottom-right corner) in "x5" format
         if quantity > 0:
-            qty_text = self.quantity_font.render(f"x{quantity}", True, self.text_color)
+            qty_text = render_text(self.quantity_font, f"x{quantity}", True, self.text_color)
             qty_rect = qty_text.get_rect(bottomright=(slot_rect.right - 4, slot_rect.bottom - 2))
             
             # Badge background
@@ -419,7 +407,7 @@ class Inventory:
             help_text = "Type to search  |  ESC: Cancel  |  ENTER: Done"
         else:
             help_text = "S: Search  |  TAB/Q: Tabs  |  I/ESC: Close"
-        text = self.item_font.render(help_text, True, (180, 180, 180))
+        text = render_text(self.item_font, help_text, True, (180, 180, 180))
         text_rect = text.get_rect(midbottom=(SCREEN_WIDTH // 2, help_y))
         self.display_surface.blit(text, text_rect)
     
@@ -446,7 +434,7 @@ class Inventory:
             display_text = "Press S to search"
         
         text_color = self.text_color if self.search_text else (120, 120, 120)
-        text = self.item_font.render(display_text, True, text_color)
+        text = render_text(self.item_font, display_text, True, text_color)
         text_rect = text.get_rect(midleft=(bar_x + 10, bar_rect.centery))
         self.display_surface.blit(text, text_rect)
         
@@ -469,20 +457,28 @@ class Inventory:
             
             info_y = self.rect.bottom - 55
             info_text = f"Selected: {name}"
-            text = self.item_font.render(info_text, True, (200, 200, 100))
+            text = render_text(self.item_font, info_text, True, (200, 200, 100))
             text_rect = text.get_rect(midbottom=(SCREEN_WIDTH // 2, info_y))
             self.display_surface.blit(text, text_rect)
     
+    # Modal frame protocol (see retained.py): how strongly the world behind is dimmed
+    dim_alpha = 150
+
+    def render_key(self):
+        """Everything display() depends on; the cached frame is redrawn when it changes"""
+        cursor = self.search_active and (pygame.time.get_ticks() // 500) % 2 == 0
+        player = self.player
+        return (
+            self.current_category, self.selected_slot, self.search_active, self.search_text, cursor,
+            tuple(player.seed_inventory.items()), tuple(player.item_inventory.items()),
+            tuple(player.fertilizer_inventory.items()),
+        )
+
     def display(self):
         """Draw the full inventory UI"""
         if not self.is_open:
             return
             
-        # Semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.display_surface.blit(overlay, (0, 0))
-        
         # Draw components
         self.draw_background()
         self.draw_search_bar()
@@ -490,14 +486,6 @@ class Inventory:
         self.draw_slots()
         self.draw_item_info()
         self.draw_help()
-    
-    def update(self):
-        """Update and display inventory"""
-        if not self.is_open:
-            return
-        
-        self.input()
-        self.display()
 
 
 # Singleton pattern for inventory
@@ -8,6 +8,7 @@ from knowledge_base import (
     INITIAL_SOIL_HEALTH, MIN_SOIL_HEALTH, MAX_SOIL_HEALTH
 )
 from farm_graph import FarmGraph
+from notifications import NotificationBus, LOW, NORMAL, HIGH
 
 # ==============================================================================
 # SKILL NODE CLASS (Tree Data Structure)
@@ -50,6 +51,7 @@ class SkillTree:
     def __init__(self):
         self.nodes = {}  # Dictionary to store all nodes by ID
         self.root = None
+        self.listeners = []  # callables run after skills are unlocked
         self._build_tree()
     
     def _build_tree(self):
@@ -98,6 +100,9 @@ class SkillTree:
                 self.nodes["intercropping"].unlock()
                 unlocked_skills.append("Intercropping")
         
+        if unlocked_skills:
+            for listener in self.listeners:
+                listener()
         return unlocked_skills
     
     def get_unlocked_skills(self):
@@ -155,8 +160,8 @@ class LearningSystem:
         self.organic_fertilizer_count = 0
         self.rotation_count = 0
         
-        # Notification queue for UI
-        self.notifications = []
+        # Notification bus for UI (bounded; repeated messages are merged into counted toasts)
+        self.notifications = NotificationBus()
     
     def _initialize_weather_queue(self):
         """Initialize weather queue with some events"""
@@ -175,6 +180,12 @@ class LearningSystem:
             return self.event_queue[0]
         return "normal"
     
+    def get_next_weather(self):
+        """Get tomorrow's weather (peek at second slot of queue)"""
+        if len(self.event_queue) > 1:
+            return self.event_queue[1]
+        return "normal"
+    
     def advance_day(self):
         """Process day transition - dequeue current weather, enqueue new"""
         import random
@@ -215,8 +226,23 @@ class LearningSystem:
         self.total_score += score_change
         
         # Add notification
-        if message:
-            self.notifications.append(message)
+        self.notifications.post(message, LOW)
+    
+    def log_actions(self, action_type, count):
+        """Log the same action count times at once (batched end-of-day verdicts)"""
+        if count <= 0:
+            return
+        impact = SOIL_IMPACTS.get(action_type, {})
+        message = impact.get("message", f"{action_type}: ")
+        self.daily_actions.extend([message] * count)
+        
+        # Update day score
+        score_change = impact.get("score", 0) * count
+        self.day_score += score_change
+        self.total_score += score_change
+        
+        # Add notifications (one toast counting all of them)
+        self.notifications.post(message, LOW, count)
     
     def get_daily_summary(self):
         """Get end-of-day summary from action list"""
@@ -295,7 +321,7 @@ class LearningSystem:
         # Award points for new achievements
         for achievement in newly_unlocked:
             self.total_score += achievement["points"]
-            self.notifications.append(f"🏆 Achievement: {achievement['name']} (+{achievement['points']})")
+            self.notifications.post(f"🏆 Achievement: {achievement['name']} (+{achievement['points']})", HIGH)
         
         return newly_unlocked
     
@@ -313,22 +339,16 @@ class LearningSystem:
         
         unlocked = self.skill_tree.check_unlocks(stats)
         for skill_name in unlocked:
-            self.notifications.append(f"🔓 Skill Unlocked: {skill_name}")
+            self.notifications.post(f"🔓 Skill Unlocked: {skill_name}", HIGH)
         
         return unlocked
     
     # =========================================================================
     # NOTIFICATIONS
     # =========================================================================
-    def get_notifications(self):
-        """Get and clear pending notifications"""
-        notifs = self.notifications.copy()
-        self.notifications = []
-        return notifs
-    
-    def add_notification(self, message):
+    def add_notification(self, message, priority=NORMAL):
         """Add a notification message"""
-        self.notifications.append(message)
+        self.notifications.post(message, priority)
     
     # =========================================================================
     # CONSEQUENCE CALCULATIONS
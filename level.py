@@ -3,33 +3,44 @@ from settings import *
 from player import Player
 from overlay import Overlay
 from sprites import Generic, Water, WildFlower, Tree, Interaction, Particle
-from pytmx.util_pygame import load_pygame
+from map_data import load_map
 from support import *
+from assets import assets
 from transition import Transition
 from soil import SoilLayer
 from sky import Rain, Sky
 from random import randint
 from menu import Menu
 from learning_system import LearningSystem
+import farm_rules
 from knowledge_base import MAX_WATER_RESERVE
 from book_ui import get_knowledge_book
 from settings_menu import get_settings_menu
 from equipment import PlacedWaterTank
 from save_manager import SaveManager
 from inventory import get_inventory
+from spatial_hash import CollisionGroup, StaticHitbox
+from static_chunks import ChunkLayer, bake_rows
+from animation import animation_clock
+from retained import ModalFrame
+from timer import ui_timers, game_timers
+from input_map import input_map, PRESS
 
 class Level:
 	def __init__(self):
 
 		# get the display surface
 		self.display_surface = pygame.display.get_surface()
+
+		# timers belonging to a previous level (e.g. before a new game) must not fire into this one
+		game_timers.clear()
         
 		# Reset flag
 		self.reset_pending = False
 
 		# sprite groups
 		self.all_sprites = CameraGroup()
-		self.collision_sprites = pygame.sprite.Group()
+		self.collision_sprites = CollisionGroup()
 		self.tree_sprites = pygame.sprite.Group()
 		self.interaction_sprites = pygame.sprite.Group()
 		self.water_tank_sprites = pygame.sprite.Group()  # FEATURE: Placed water tanks
@@ -76,22 +87,23 @@ class Level:
 		
 		# Inventory system
 		self.inventory = get_inventory(self.player)
-		self.inventory_toggle_timer = pygame.time.get_ticks()
-		self.book_toggle_timer = pygame.time.get_ticks()
+
+		# full-screen menus are drawn over a frozen snapshot of the world
+		self.modal_frame = ModalFrame(self.display_surface)
 
 		# music
-		self.success = pygame.mixer.Sound('./audio/success.wav')
+		self.success = assets.sound('./audio/success.wav')
 		self.success.set_volume(0.3)
-		self.music = pygame.mixer.Sound('./audio/music.mp3')
+		self.music = assets.sound('./audio/music.mp3')
 		self.music.set_volume(0)  # Initial volume (muted by default)
 		self.music.play(loops = -1)
 		
 		# Settings menu (created after music so it can control volume)
 		self.settings_menu = get_settings_menu(self)
-		self.settings_toggle_timer = pygame.time.get_ticks()
 
 		# SAVE SYSTEM
 		self.save_manager = SaveManager()
+		self.saved_action_count = 0
 		try:
 			# Pass tree sprites to load their state
 			self.save_manager.load_game(self.player, self.soil_layer, self.learning_system, self.tree_sprites, water_tanks=self.water_tank_sprites)
@@ -110,28 +122,30 @@ class Level:
 		self.soil_layer.raining = self.raining
 
 	def setup(self):
-		tmx_data = load_pygame('./data/map.tmx')
+		# parsed once per process and shared with SoilLayer and Rain
+		game_map = load_map()
 
-		# house 
-		for layer in ['HouseFloor', 'HouseFurnitureBottom']:
-			for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-				Generic((x * TILE_SIZE,y * TILE_SIZE), surf, self.all_sprites, LAYERS['house bottom'])
+		# house and fence: static tiles baked into chunks (floor) and y-sorted row strips (walls, furniture, fence)
+		floor_tiles = [((x * TILE_SIZE, y * TILE_SIZE), surf)
+			for layer in ['HouseFloor', 'HouseFurnitureBottom'] for x, y, surf in game_map.tiles(layer)]
+		self.static_floor = ChunkLayer(floor_tiles)
+		self.all_sprites.add_layer_renderer(LAYERS['house bottom'], self.static_floor.draw)
 
-		for layer in ['HouseWalls', 'HouseFurnitureTop']:
-			for x, y, surf in tmx_data.get_layer_by_name(layer).tiles():
-				Generic((x * TILE_SIZE,y * TILE_SIZE), surf, self.all_sprites)
+		main_tiles = [((x * TILE_SIZE, y * TILE_SIZE), surf)
+			for layer in ['HouseWalls', 'HouseFurnitureTop', 'Fence'] for x, y, surf in game_map.tiles(layer)]
+		bake_rows(main_tiles, self.all_sprites, LAYERS['main'])
 
-		# Fence
-		for x, y, surf in tmx_data.get_layer_by_name('Fence').tiles():
-			Generic((x * TILE_SIZE,y * TILE_SIZE), surf, [self.all_sprites, self.collision_sprites])
+		# Fence collisions live only in the collision index
+		for x, y, surf in game_map.tiles('Fence'):
+			StaticHitbox(surf.get_rect(topleft = (x * TILE_SIZE, y * TILE_SIZE)), self.collision_sprites)
 
 		# water 
-		water_frames = import_folder('./graphics/water')
-		for x, y, surf in tmx_data.get_layer_by_name('Water').tiles():
-			Water((x * TILE_SIZE,y * TILE_SIZE), water_frames, self.all_sprites)
+		water_track = animation_clock.track('water', import_folder('./graphics/water'), 5)
+		for x, y, surf in game_map.tiles('Water'):
+			Water((x * TILE_SIZE,y * TILE_SIZE), water_track, self.all_sprites)
 
 		# trees 
-		for obj in tmx_data.get_layer_by_name('Trees'):
+		for obj in game_map.objects('Trees'):
 			Tree(
 				pos = (obj.x, obj.y), 
 				surf = obj.image, 
@@ -141,15 +155,15 @@ class Level:
 				all_sprites = self.all_sprites)
 
 		# wildflowers 
-		for obj in tmx_data.get_layer_by_name('Decoration'):
+		for obj in game_map.objects('Decoration'):
 			WildFlower((obj.x, obj.y), obj.image, [self.all_sprites, self.collision_sprites])
 
 		# collion tiles
-		for x, y, surf in tmx_data.get_layer_by_name('Collision').tiles():
-			Generic((x * TILE_SIZE, y * TILE_SIZE), pygame.Surface((TILE_SIZE, TILE_SIZE)), self.collision_sprites)
+		for x, y in game_map.tile_positions('Collision'):
+			StaticHitbox((x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE), self.collision_sprites)
 
 		# Player 
-		for obj in tmx_data.get_layer_by_name('Player'):
+		for obj in game_map.objects('Player'):
 			if obj.name == 'Start':
 				self.player = Player(
 					pos = (obj.x,obj.y), 
@@ -169,7 +183,7 @@ class Level:
 
 		Generic(
 			pos = (0,0),
-			surf = pygame.image.load('./graphics/world/ground.png').convert_alpha(),
+			surf = assets.image('./graphics/world/ground.png'),
 			groups = self.all_sprites,
 			z = LAYERS['ground'])
 
@@ -181,6 +195,9 @@ class Level:
 	def toggle_shop(self):
 
 		self.shop_active = not self.shop_active
+		if not self.shop_active:
+			# purchases and sales are only journaled once the shop closes
+			self.checkpoint()
 	
 	def place_water_tank(self, pos):
 		"""Place a water tank in the world at the given position"""
@@ -195,50 +212,24 @@ class Level:
 			collision_groups=[self.collision_sprites]
 		)
 		
-		# Increase player's max water capacity by 20 (via bonus)
-		self.player.water_tank_bonus = getattr(self.player, 'water_tank_bonus', 0) + 20
-		
-		# Force update to apply immediately
-		self.player.apply_skill_effects()
-		self.learning_system.add_notification(f"💧 Water capacity +20! (Max: {self.player.max_water_reserve})")
+		# Increase player's max water capacity (via bonus)
+		farm_rules.place_water_tank(self.player, self.learning_system)
 
 	def reset(self):
-		# LEARNING SYSTEM - End of day processing
-		# Evaluate watering and reset water counts
-		self.soil_layer.reset_daily_water_counts()
-		
-		# Check for achievements and skill unlocks
-		stats = {
-			'avg_soil_health': self.soil_layer.get_average_soil_health()
-		}
-		self.learning_system.check_achievements(stats)
-		self.learning_system.check_skill_unlocks(stats)
+		# LEARNING SYSTEM - End of day processing (the rules are shared with simulation.py)
+		# One batched soil pass: watering verdicts, soil health, plant growth and
+		# deaths, water reset and tomorrow's rain; then achievements and skill unlocks
+		result, _ = farm_rules.end_day(self.soil_layer.soil, self.learning_system, self.soil_layer.raining)
+		self.soil_layer.apply_day(result)
 		
 		# Generate and store day summary
 		self.day_summary_text = self.learning_system.get_daily_summary()
 		
-		# Advance to next day in learning system
-		self.learning_system.advance_day()
-		self.learning_system.clear_daily_log()
-		
-		# plants
-		self.soil_layer.update_plants()
-
-		# soil
-		self.soil_layer.remove_water()
+		# Advance to next day: a rainy morning collects rainwater (more with placed tanks)
+		farm_rules.start_day(self.learning_system, self.player, len(self.water_tank_sprites))
 		
 		# Sync weather from learning system queue
 		self._sync_weather()
-		if self.raining:
-			self.soil_layer.water_all()
-			# Collect rainwater into player's reserve
-			self.player.collect_rainwater(5)
-			
-			# Bonus collection from placed water tanks
-			tank_bonus = len(self.water_tank_sprites.sprites()) * 15
-			if tank_bonus > 0:
-				self.player.rain_tank.collect_rain(tank_bonus)
-				self.learning_system.add_notification(f"💧 Tanks collected +{tank_bonus} water!")
 		
 		# Auto-save after day transition (update trees first)
 		# Regrow trees logic
@@ -255,10 +246,15 @@ class Level:
 
 		self.save_manager.save_game(self.player, self.soil_layer, self.learning_system, self.tree_sprites, water_tanks=self.water_tank_sprites)
 
-	def save(self):
-		"""Public method to trigger save (e.g. on quit)"""
+	def checkpoint(self):
+		"""Journal the changes since the last save, so a crash loses at most the current action"""
+		self.saved_action_count = self.player.action_count
 		self.save_manager.save_game(self.player, self.soil_layer, self.learning_system, self.tree_sprites, water_tanks=self.water_tank_sprites)
 
+	def save(self):
+		"""Public method to trigger save (e.g. on quit) - waits for the write to finish"""
+		self.save_manager.save_game(self.player, self.soil_layer, self.learning_system, self.tree_sprites, water_tanks=self.water_tank_sprites, wait=True)
+
 		# sky - reset day/night cycle
 		self.sky.reset_cycle()
 
@@ -266,107 +262,215 @@ class Level:
 		if self.soil_layer.plant_sprites:
 			for plant in self.soil_layer.plant_sprites.sprites():
 				if plant.harvestable and plant.rect.colliderect(self.player.hitbox):
-					# Calculate yield based on soil health
-					yield_modifier = self.soil_layer.calculate_yield_modifier(plant.rect.center)
-					
-					# Add to inventory (base + modifier bonus)
-					self.player_add(plant.plant_type)
-					if yield_modifier >= 1.5:
-						# Bonus harvest for healthy soil!
+					# Add to inventory (a bonus crop from healthy soil)
+					for _ in range(farm_rules.harvest(self.soil_layer.soil, self.learning_system, *plant.tile)):
 						self.player_add(plant.plant_type)
-						self.learning_system.add_notification("🌾 Bonus harvest from healthy soil!")
 					
 					plant.kill()
+					self.player.action_count += 1
 					Particle(plant.rect.topleft, plant.image, self.all_sprites, z = LAYERS['main'])
-					self.soil_layer.grid[plant.rect.centery // TILE_SIZE][plant.rect.centerx // TILE_SIZE].remove('P')
+
+	def active_modal(self):
+		"""The full-screen menu currently shown, if any (same precedence as input handling)"""
+		if self.settings_menu.is_open:
+			return self.settings_menu
+		if self.inventory.is_open:
+			return self.inventory
+		if self.knowledge_book.is_open:
+			return self.knowledge_book
+		if self.shop_active:
+			return self.menu
+		return None
 
 	def run(self, dt, events=None):
-		if events is None:
-			events = []
-		
-		# drawing logic
-		self.display_surface.fill('black')
-		self.all_sprites.custom_draw(self.player)
-		
-		# Handle keyboard input for book toggle (works in all states except sleeping)
-		keys = pygame.key.get_pressed()
-		current_time = pygame.time.get_ticks()
-		
-		# B key to toggle Knowledge Book
-		if keys[pygame.K_b] and not self.player.sleep and not self.shop_active and not self.settings_menu.is_open and not self.inventory.is_open:
-			if current_time - self.book_toggle_timer > 400:
+		"""One simulation step followed by drawing it"""
+		self.update(dt, events)
+		self.draw()
+
+	def input_contexts(self):
+		"""Key events go to the open menu first, then to the level (menu toggles and the player)"""
+		modal = self.active_modal()
+		return (modal, self) if modal else (self,)
+
+	def handle_input(self, event):
+		"""Menu toggles (works in all states except sleeping), then world actions for the player"""
+		if event.kind == PRESS and not self.player.sleep and not self.shop_active:
+			actions = event.actions
+			if 'toggle_book' in actions and not self.settings_menu.is_open and not self.inventory.is_open:
 				self.knowledge_book.toggle()
-				self.book_toggle_timer = current_time
-		
-		# I key to toggle Inventory
-		if keys[pygame.K_i] and not self.player.sleep and not self.shop_active and not self.settings_menu.is_open and not self.knowledge_book.is_open:
-			if current_time - self.inventory_toggle_timer > 400:
+				return True
+			if 'toggle_inventory' in actions and not self.settings_menu.is_open and not self.knowledge_book.is_open:
 				self.inventory.toggle()
-				self.inventory_toggle_timer = current_time
-		
-		# P key to toggle Settings Menu
-		if keys[pygame.K_p] and not self.player.sleep and not self.shop_active and not self.knowledge_book.is_open and not self.inventory.is_open:
-			if current_time - self.settings_toggle_timer > 400:
+				return True
+			if 'toggle_settings' in actions and not self.knowledge_book.is_open and not self.inventory.is_open:
 				self.settings_menu.toggle()
-				self.settings_toggle_timer = current_time
-		
-		# Main game state updates
-		if self.settings_menu.is_open:
-			self.settings_menu.update()
-		elif self.inventory.is_open:
-			# Inventory is open - update it and handle text input events
-			for event in events:
-				self.inventory.handle_text_input(event)
-			self.inventory.update()
-		elif self.knowledge_book.is_open:
-			# Book is open - update and display it
-			self.knowledge_book.update()
-			self.knowledge_book.display()
-		elif self.shop_active:
-			pass  # Menu updates handled below
-		else:
+				return True
+		if self.active_modal() is None:
+			return self.player.handle_input(event)
+		return False
+
+	def update(self, dt, events=None):
+		"""Advance the game by dt seconds (Game calls this in fixed steps)"""
+		if events is None:
+			events = []
+		ui_timers.update()
+
+		input_map.dispatch(events, self.input_contexts)
+
+		# the world only runs while no menu is open
+		if self.active_modal() is None:
+			# game time stands still while the player sleeps
+			if not self.player.sleep:
+				game_timers.advance(dt)
+			animation_clock.tick(dt)
 			self.all_sprites.update(dt)
 			self.plant_collision()
+			if self.player.action_count != self.saved_action_count:
+				self.checkpoint()
 
-		# weather & overlay (drawn before menus so menus appear on top)
-		self.overlay.display()
-		if self.raining and not self.shop_active:
-			self.rain.update()
-		self.sky.display(dt)
+		# weather
+		if self.active_modal() is None:
+			self.rain.update(dt, self.raining)
+		self.sky.update(dt)
 		
 		# Check for automatic day transition when night ends
 		if self.sky.night_complete:
 			self.sky.night_complete = False
 			self.reset()
 			self.sky.reset_cycle()
+			# a new day started under any open menu: its world snapshot is out of date
+			self.modal_frame.release()
+
+		# sleep transition
+		if self.player.sleep:
+			self.transition.update()
+
+	def draw(self, alpha=1):
+		"""
+		Draw the current state. alpha (0..1) places the player and camera
+		between the last two simulation steps.
+		"""
+		modal = self.active_modal()
+
+		# while a menu is open the world is paused, so the snapshot taken when it opened is reused
+		if modal is None or not self.modal_frame.frozen:
+			self.display_surface.fill('black')
+			self.all_sprites.custom_draw(self.player, alpha)
+			self.overlay.display()
+			self.sky.draw()
 
 		# Draw menus/book LAST so they appear on top of everything
-		if self.settings_menu.is_open:
-			self.settings_menu.display()
-		elif self.inventory.is_open:
-			self.inventory.display()
-		elif self.knowledge_book.is_open:
-			self.knowledge_book.display()
-		elif self.shop_active:
-			self.menu.update()
+		if modal is not None:
+			if not self.modal_frame.frozen:
+				self.modal_frame.capture_world()
+			self.modal_frame.draw(modal)
+		elif self.modal_frame.frozen:
+			self.modal_frame.release()
 
 		# transition overlay
 		if self.player.sleep:
-			self.transition.play()
+			self.transition.draw()
 
 class CameraGroup(pygame.sprite.Group):
+	"""
+	Sprite group that draws the world through a camera.
+
+	Sprites are kept in one bucket per z layer. Each bucket stays sorted by
+	centery and is only re-sorted when a sprite moves out of order, and only
+	sprites overlapping the camera view are blitted.
+	"""
 	def __init__(self):
 		super().__init__()
 		self.display_surface = pygame.display.get_surface()
 		self.offset = pygame.math.Vector2()
-
-	def custom_draw(self, player):
-		self.offset.x = player.rect.centerx - SCREEN_WIDTH / 2
-		self.offset.y = player.rect.centery - SCREEN_HEIGHT / 2
-
-		for layer in LAYERS.values():
-			for sprite in sorted(self.sprites(), key = lambda sprite: sprite.rect.centery):
-				if sprite.z == layer:
-					offset_rect = sprite.rect.copy()
-					offset_rect.center -= self.offset
-					self.display_surface.blit(sprite.image, offset_rect)
\ No newline at end of file
+		self.view_rect = pygame.Rect(0, 0, SCREEN_WIDTH, SCREEN_HEIGHT)
+
+		# z layer -> list of sprites sorted by centery
+		self.layers = {layer: [] for layer in LAYERS.values()}
+		self.sprite_layers = {}  # sprite -> z of the bucket holding it
+		self.pending = []        # sprites added since the last draw
+		self.dirty_layers = set()
+		self.layer_renderers = {}  # z layer -> callables drawing non-sprite content
+
+	def add_layer_renderer(self, layer, renderer):
+		"""Draw extra content on a layer after its sprites: renderer(surface, offset)"""
+		self.layers.setdefault(layer, [])
+		self.layer_renderers.setdefault(layer, []).append(renderer)
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite)
+		# z and rect are usually set after the sprite joins its groups,
+		# so bucketing waits until the next draw
+		self.pending.append(sprite)
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		layer = self.sprite_layers.pop(sprite, None)
+		if layer is not None:
+			self.dirty_layers.add(layer)
+
+	def sync_layers(self):
+		"""Drop removed sprites from their buckets and bucket new ones"""
+		for layer in self.dirty_layers:
+			self.layers[layer] = [sprite for sprite in self.layers[layer] if self.sprite_layers.get(sprite) == layer]
+		self.dirty_layers.clear()
+
+		for sprite in self.pending:
+			if sprite in self.spritedict and sprite not in self.sprite_layers:
+				self.move_to_layer(sprite)
+		self.pending.clear()
+
+	def move_to_layer(self, sprite):
+		self.sprite_layers[sprite] = sprite.z
+		self.layers.setdefault(sprite.z, []).append(sprite)
+
+	def visible_sprites(self, layer):
+		"""Sprites of one layer inside the view, in draw order"""
+		bucket = self.layers[layer]
+		view_rect = self.view_rect
+		visible = []
+		last_y = None
+		ordered = True
+		moved = False
+
+		for sprite in bucket:
+			if sprite.z != layer:
+				# z changed since bucketing (e.g. a plant growing out of the ground)
+				self.move_to_layer(sprite)
+				moved = True
+				continue
+			rect = sprite.rect
+			if last_y is not None and rect.centery < last_y:
+				ordered = False
+			last_y = rect.centery
+			if view_rect.colliderect(rect):
+				visible.append(sprite)
+
+		if moved:
+			bucket = [sprite for sprite in bucket if self.sprite_layers.get(sprite) == layer]
+			self.layers[layer] = bucket
+		if not ordered:
+			bucket.sort(key = lambda sprite: sprite.rect.centery)
+			visible.sort(key = lambda sprite: sprite.rect.centery)
+		return visible
+
+	def custom_draw(self, player, alpha = 1):
+		# alpha < 1 draws the player (and the camera following it) part way back along its last move
+		back = 1 - alpha
+		shift = (round((player.previous_center[0] - player.rect.centerx) * back),
+			round((player.previous_center[1] - player.rect.centery) * back))
+
+		self.offset.x = player.rect.centerx + shift[0] - SCREEN_WIDTH / 2
+		self.offset.y = player.rect.centery + shift[1] - SCREEN_HEIGHT / 2
+		offset_x, offset_y = int(self.offset.x), int(self.offset.y)
+		self.view_rect.topleft = (offset_x, offset_y)
+
+		self.sync_layers()
+		player.rect.move_ip(shift)
+		for layer in sorted(self.layers):
+			self.display_surface.blits(
+				[(sprite.image, sprite.rect.move(-offset_x, -offset_y)) for sprite in self.visible_sprites(layer)],
+				False)
+			for renderer in self.layer_renderers.get(layer, ()):
+				renderer(self.display_surface, (offset_x, offset_y))
+		player.rect.move_ip(-shift[0], -shift[1])
@@ -1,14 +1,22 @@
 import pygame, sys
 from settings import *
 from level import Level
+from frame_pacing import FramePacer
 import settings_menu as sm_module
 
 class Game:
-	def __init__(self):
+	def __init__(self, vsync = VSYNC):
 		pygame.init()
-		self.screen = pygame.display.set_mode((SCREEN_WIDTH,SCREEN_HEIGHT))
+		try:
+			self.screen = pygame.display.set_mode((SCREEN_WIDTH,SCREEN_HEIGHT), vsync = int(vsync))
+		except pygame.error:
+			# no vsync-capable renderer on this display
+			self.screen = pygame.display.set_mode((SCREEN_WIDTH,SCREEN_HEIGHT))
 		pygame.display.set_caption('Sprout land')
+		pygame.key.set_repeat(KEY_REPEAT_DELAY, KEY_REPEAT_INTERVAL)
 		self.clock = pygame.time.Clock()
+		self.pacer = FramePacer(SIMULATION_HZ, MAX_STEPS_PER_FRAME, ADAPTIVE_RENDER, MAX_SKIPPED_RENDERS)
+		self.pending_events = []  # events waiting for the next simulation step
 		self.level = Level()
 
 	def run(self):
@@ -20,17 +28,24 @@ class Game:
 					self.level.save()
 					pygame.quit()
 					sys.exit()
-  
-			dt = self.clock.tick() / 1000
-			self.level.run(dt, events)
-            
-			# Check for game reset
-			if getattr(self.level, 'reset_pending', False):
-				self.level = Level()
-				sm_module.settings_menu = None # Reset singleton
-                
-			pygame.display.update()
+			self.pending_events.extend(events)
+
+			# simulate in fixed steps, however long the last frame took
+			steps = self.pacer.advance(self.clock.tick(FPS) / 1000)
+			for _ in range(steps):
+				self.level.update(self.pacer.step, self.pending_events)
+				self.pending_events = []
+
+				# Check for game reset
+				if getattr(self.level, 'reset_pending', False):
+					self.level = Level()
+					sm_module.settings_menu = None # Reset singleton
+					break
+
+			if self.pacer.should_render():
+				self.level.draw(self.pacer.alpha)
+				pygame.display.update()
 
 if __name__ == '__main__':
 	game = Game()
-	game.run()
\ No newline at end of file
+	game.run()
@@ -0,0 +1,130 @@
+# Map Data - Parse map.tmx once and share it with every consumer
+# Layer tiles, object groups and world size from one parse, baked to disk and reused while the map files are unchanged
+
+import glob
+import os
+import pickle
+from collections import namedtuple
+
+from pytmx import TiledMap, TiledTileLayer, TiledObjectGroup
+from pytmx.util_pygame import pygame_image_loader
+
+from settings import TILE_SIZE
+
+MAP_PATH = './data/map.tmx'
+BAKE_VERSION = 1
+
+# a tile image as pytmx would load it: tileset file, colorkey, alpha mode, area and flip flags
+ImageRef = namedtuple('ImageRef', 'path colorkey pixelalpha rect flags')
+MapObject = namedtuple('MapObject', 'name x y width height image')
+
+
+def _recording_loader(filename, colorkey, **kwargs):
+    """pytmx image loader that records what to load instead of decoding anything"""
+    pixelalpha = kwargs.get('pixelalpha', True)
+
+    def load(rect=None, flags=None):
+        return ImageRef(filename, colorkey, pixelalpha, rect, flags)
+    return load
+
+
+def _parse(path):
+    """Everything the game reads from the map, as plain picklable data"""
+    tmx = TiledMap(path, image_loader=_recording_loader)
+    layers, objects, used = {}, {}, set()
+    for layer in tmx.layers:
+        if isinstance(layer, TiledTileLayer):
+            layers[layer.name] = [(x, y, gid) for x, y, gid in layer.iter_data() if gid]
+            used.update(gid for _, _, gid in layers[layer.name])
+        elif isinstance(layer, TiledObjectGroup):
+            objects[layer.name] = [(obj.name, obj.x, obj.y, obj.width, obj.height, obj.gid) for obj in layer]
+            used.update(obj.gid for obj in layer if obj.gid)
+    return {
+        'size': (tmx.width, tmx.height),
+        'tile_size': (tmx.tilewidth, tmx.tileheight),
+        'layers': layers,
+        'objects': objects,
+        'images': {gid: tmx.images[gid] for gid in used if tmx.images[gid] is not None},
+    }
+
+
+def _signature(path):
+    """Modification times and sizes of the map and its tilesets"""
+    files = [path] + sorted(glob.glob(os.path.join(os.path.dirname(path), '**', '*.tsx'), recursive=True))
+    return [BAKE_VERSION] + [(name, os.stat(name).st_mtime_ns, os.stat(name).st_size) for name in files]
+
+
+def _load_baked(path):
+    """Parsed map from the bake file next to the map, re-parsed (and re-baked) when a map file changed"""
+    bake_path = path + '.bake'
+    signature = _signature(path)
+    try:
+        with open(bake_path, 'rb') as f:
+            baked = pickle.load(f)
+        if baked['signature'] == signature:
+            return baked['data']
+    except (OSError, EOFError, KeyError, TypeError, pickle.UnpicklingError):
+        pass
+
+    data = _parse(path)
+    try:
+        temp_name = bake_path + '.tmp'
+        with open(temp_name, 'wb') as f:
+            pickle.dump({'signature': signature, 'data': data}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_name, bake_path)
+    except OSError:
+        pass  # read-only install: parse every time
+    return data
+
+
+class GameMap:
+    """
+    One parsed map. Tile and object images are decoded on first use with
+    pytmx's own pygame loader (each tileset image once), so headless users
+    that only need positions never touch a display.
+    """
+    def __init__(self, data):
+        self.width, self.height = data['size']
+        self.tile_width, self.tile_height = data['tile_size']
+        self.world_size = (self.width * TILE_SIZE, self.height * TILE_SIZE)
+        self._layers = data['layers']
+        self._objects = data['objects']
+        self._refs = data['images']
+        self._images = {}
+        self._tilesets = {}
+
+    def image(self, gid):
+        surf = self._images.get(gid)
+        if surf is None:
+            ref = self._refs[gid]
+            key = (ref.path, ref.colorkey, ref.pixelalpha)
+            loader = self._tilesets.get(key)
+            if loader is None:
+                loader = self._tilesets[key] = pygame_image_loader(ref.path, ref.colorkey, pixelalpha=ref.pixelalpha)
+            surf = self._images[gid] = loader(ref.rect, ref.flags)
+        return surf
+
+    def tile_positions(self, layer):
+        """(x, y) of every tile in a tile layer, without loading images"""
+        return [(x, y) for x, y, _ in self._layers[layer]]
+
+    def tiles(self, layer):
+        """(x, y, surface) for every tile in a tile layer, row by row like pytmx's layer.tiles()"""
+        image = self.image
+        return [(x, y, image(gid)) for x, y, gid in self._layers[layer]]
+
+    def objects(self, layer):
+        """MapObjects of an object group (image is None for plain shapes)"""
+        return [MapObject(name, x, y, width, height, self.image(gid) if gid else None)
+                for name, x, y, width, height, gid in self._objects[layer]]
+
+
+_maps = {}
+
+
+def load_map(path=MAP_PATH, bake=True):
+    """The shared GameMap for a map file, parsed (or read from its bake) once per process"""
+    game_map = _maps.get(path)
+    if game_map is None:
+        game_map = _maps[path] = GameMap(_load_baked(path) if bake else _parse(path))
+    return game_map
@@ -4,8 +4,11 @@
 import pygame
 from settings import *
 from timer import Timer
+from input_map import PRESS
 from knowledge_base import CROP_DATA, FERTILIZER_DATA, EQUIPMENT_DATA
-from quiz_system import QUIZZES, has_badge, get_shop_discount, earned_badges
+from quiz_system import QUIZZES, has_badge, award_badge, earned_badges
+from assets import assets
+from text_cache import render_text
 
 class Menu:
     def __init__(self, player, toggle_menu):
@@ -13,9 +16,9 @@ class Menu:
         self.player = player
         self.toggle_menu = toggle_menu
         self.display_surface = pygame.display.get_surface()
-        self.font = pygame.font.Font('./font/LycheeSoda.ttf', 28)
-        self.small_font = pygame.font.Font('./font/LycheeSoda.ttf', 20)
-        self.title_font = pygame.font.Font('./font/LycheeSoda.ttf', 36)
+        self.font = assets.font('./font/LycheeSoda.ttf', 28)
+        self.small_font = assets.font('./font/LycheeSoda.ttf', 20)
+        self.title_font = assets.font('./font/LycheeSoda.ttf', 36)
 
         # Menu dimensions
         self.width = 550
@@ -33,7 +36,6 @@ class Menu:
         
         # Selection
         self.index = 0
-        self.timer = Timer(150)
         
         # Quiz State
         self.quiz_active = False
@@ -43,7 +45,7 @@ class Menu:
         self.quiz_score = 0
         self.quiz_selected_option = 0
         self.quiz_feedback = ""
-        self.quiz_feedback_timer = 0
+        self.quiz_feedback_timer = Timer(1000, self.next_question)  # feedback is shown while active
         self.quiz_complete = False
         
         # Colors
@@ -76,7 +78,7 @@ class Menu:
 
     def display_money(self):
         # ... existing display_money code ...
-        money_text = self.title_font.render(f'${self.player.money}', False, self.colors['price'])
+        money_text = render_text(self.title_font, f'${self.player.money}', False, self.colors['price'])
         money_rect = money_text.get_rect(midbottom=(SCREEN_WIDTH // 2, self.menu_y + self.height - 80))
         
         # Money background
@@ -86,10 +88,10 @@ class Menu:
         self.display_surface.blit(money_text, money_rect)
         
         # Show Discount if applicable
-        discount = get_shop_discount()
+        discount = self.player.stats['shop_discount']
         if discount < 1.0:
             off_pct = int((1.0 - discount) * 100)
-            disc_text = self.small_font.render(f'-{off_pct}% Badge Discount Active!', False, self.colors['quiz_gold'])
+            disc_text = render_text(self.small_font, f'-{off_pct}% Badge Discount Active!', False, self.colors['quiz_gold'])
             disc_rect = disc_text.get_rect(midtop=(money_rect.centerx, money_rect.bottom + 5))
             self.display_surface.blit(disc_text, disc_rect)
 
@@ -97,7 +99,7 @@ class Menu:
         # ... existing draw_tabs ...
         # Hide tabs during quiz
         if self.quiz_active:
-            title_text = self.font.render("Sustainability Quiz", False, self.colors['text'])
+            title_text = render_text(self.font, "Sustainability Quiz", False, self.colors['text'])
             title_rect = title_text.get_rect(center=(self.menu_x + self.width//2, self.menu_y + 25))
             self.display_surface.blit(title_text, title_rect)
             return
@@ -117,7 +119,7 @@ class Menu:
             pygame.draw.rect(self.display_surface, color, tab_rect, 0, 8)
             
             # Tab text
-            tab_text = self.font.render(tab_name, False, text_color)
+            tab_text = render_text(self.font, tab_name, False, text_color)
             tab_text_rect = tab_text.get_rect(center=tab_rect.center)
             self.display_surface.blit(tab_text, tab_text_rect)
 
@@ -139,7 +141,7 @@ class Menu:
         start_idx = max(0, self.index - max_items + 1) if self.index >= max_items else 0
         
         if not items:
-            empty_text = self.font.render("No items available", False, (150,150,150))
+            empty_text = render_text(self.font, "No items available", False, (150,150,150))
             self.display_surface.blit(empty_text, (self.menu_x + 60, content_y + 40))
         
         for idx, (action, item) in enumerate(items[start_idx:start_idx + max_items]):
@@ -167,22 +169,22 @@ class Menu:
                     name_str = f"✓ {name} (DONE)"
                     name_color = self.colors['quiz_gold']
             
-            name_text = self.font.render(name_str, False, name_color)
+            name_text = render_text(self.font, name_str, False, name_color)
             self.display_surface.blit(name_text, (item_rect.x + 15, item_rect.y + 10))
             
             # Subtext (Amount or Badge)
             if action == 'take_quiz':
                 quiz = QUIZZES[item]
-                badge_text = self.small_font.render(f"Badge: {quiz['badge']}", False, (180, 180, 180))
+                badge_text = render_text(self.small_font, f"Badge: {quiz['badge']}", False, (180, 180, 180))
                 self.display_surface.blit(badge_text, (item_rect.x + 15, item_rect.y + 35))
                 
                 # Play button at far right
-                price_text = self.font.render("PLAY", False, self.colors['buy'])
+                price_text = render_text(self.font, "PLAY", False, self.colors['buy'])
                 self.display_surface.blit(price_text, (item_rect.right - 70, item_rect.centery - price_text.get_height()//2))
 
             else:
                 # Normal Items
-                amount_text = self.small_font.render(f'x{amount}', False, (200, 200, 200))
+                amount_text = render_text(self.small_font, f'x{amount}', False, (200, 200, 200))
                 self.display_surface.blit(amount_text, (item_rect.right - 120, item_rect.centery - amount_text.get_height()//2))
                 
                 # Price
@@ -193,7 +195,7 @@ class Menu:
                     price_color = self.colors['buy']
                     price_str = f'-${price}'
                 
-                price_text = self.font.render(price_str, False, price_color)
+                price_text = render_text(self.font, price_str, False, price_color)
                 self.display_surface.blit(price_text, (item_rect.right - 60, item_rect.centery - price_text.get_height()//2))
 
     def draw_quiz(self):
@@ -204,8 +206,8 @@ class Menu:
             return
             
         # Display feedback if timer is active
-        if pygame.time.get_ticks() < self.quiz_feedback_timer:
-            feedback_surf = self.title_font.render(self.quiz_feedback, False, self.colors['quiz_gold'])
+        if self.quiz_feedback_timer.active:
+            feedback_surf = render_text(self.title_font, self.quiz_feedback, False, self.colors['quiz_gold'])
             f_rect = feedback_surf.get_rect(center=(self.menu_x + self.width//2, self.menu_y + self.height//2))
             
             bg_rect = f_rect.inflate(40, 40)
@@ -219,7 +221,7 @@ class Menu:
             q_data = self.quiz_questions[self.quiz_question_index]
             
             # Progress Header
-            prog_text = self.small_font.render(f"Question {self.quiz_question_index + 1}/{len(self.quiz_questions)}", False, (200,200,200))
+            prog_text = render_text(self.small_font, f"Question {self.quiz_question_index + 1}/{len(self.quiz_questions)}", False, (200,200,200))
             self.display_surface.blit(prog_text, (self.menu_x + 30, self.menu_y + 80))
 
             # Question text (wrapping)
@@ -237,7 +239,7 @@ class Menu:
             
             y_offset = self.menu_y + 110
             for line in lines:
-                q_surf = self.font.render(line, False, self.colors['text'])
+                q_surf = render_text(self.font, line, False, self.colors['text'])
                 q_rect = q_surf.get_rect(center=(self.menu_x + self.width//2, y_offset))
                 self.display_surface.blit(q_surf, q_rect)
                 y_offset += 30
@@ -253,7 +255,7 @@ class Menu:
                 else:
                     pygame.draw.rect(self.display_surface, self.colors['item_bg'], opt_rect, 0, 5)
                     
-                opt_text = self.small_font.render(option, False, self.colors['text'])
+                opt_text = render_text(self.small_font, option, False, self.colors['text'])
                 self.display_surface.blit(opt_text, (opt_rect.x + 15, opt_rect.centery - opt_text.get_height()//2))
                 
                 y_offset += 55
@@ -264,12 +266,12 @@ class Menu:
         score = self.quiz_score
         
         # Result Text
-        res_text = self.title_font.render(f"Quiz Complete!", False, self.colors['text'])
+        res_text = render_text(self.title_font, f"Quiz Complete!", False, self.colors['text'])
         res_rect = res_text.get_rect(midtop=(self.menu_x + self.width//2, self.menu_y + 100))
         self.display_surface.blit(res_text, res_rect)
         
         score_color = (100, 255, 100) if score == total else (255, 100, 100)
-        score_text = self.title_font.render(f"Score: {score}/{total}", False, score_color)
+        score_text = render_text(self.title_font, f"Score: {score}/{total}", False, score_color)
         score_rect = score_text.get_rect(midtop=(self.menu_x + self.width//2, self.menu_y + 160))
         self.display_surface.blit(score_text, score_rect)
         
@@ -278,24 +280,24 @@ class Menu:
         if score == total:
              msg = "Perfect! Badge Earned!"
              badge = QUIZZES[self.current_quiz_id]['badge']
-             badge_surf = self.font.render(f"🏆 {badge}", False, self.colors['quiz_gold'])
+             badge_surf = render_text(self.font, f"🏆 {badge}", False, self.colors['quiz_gold'])
              badge_rect = badge_surf.get_rect(center=(self.menu_x + self.width//2, msg_y + 50))
              self.display_surface.blit(badge_surf, badge_rect)
         else:
              msg = "Get all questions right to earn the badge!"
              
-        msg_text = self.small_font.render(msg, False, (200, 200, 200))
+        msg_text = render_text(self.small_font, msg, False, (200, 200, 200))
         msg_rect = msg_text.get_rect(center=(self.menu_x + self.width//2, msg_y))
         self.display_surface.blit(msg_text, msg_rect)
         
         # Continue prompt
-        cont_text = self.small_font.render("Press SPACE to return", False, (150, 150, 150))
+        cont_text = render_text(self.small_font, "Press SPACE to return", False, (150, 150, 150))
         cont_rect = cont_text.get_rect(midbottom=(self.menu_x + self.width//2, self.menu_y + self.height - 40))
         self.display_surface.blit(cont_text, cont_rect)
 
     def _get_item_details(self, action, item):
         # ... existing _get_item_details ...
-        discount = get_shop_discount()
+        discount = self.player.stats['shop_discount']
         
         if action == 'sell':
             name = item.title()
@@ -333,9 +335,23 @@ class Menu:
         
         return name, amount, price
 
-    def update(self):
-        self.input()
-        
+    # Modal frame protocol (see retained.py): the shop leaves the world undimmed
+    dim_alpha = 0
+
+    def render_key(self):
+        """Everything display() depends on; the cached frame is redrawn when it changes"""
+        player = self.player
+        return (
+            self.current_tab, self.index, len(self.tab_items[0]),
+            self.quiz_active, self.current_quiz_id, self.quiz_question_index,
+            self.quiz_score, self.quiz_selected_option, self.quiz_complete,
+            self.quiz_feedback, self.quiz_feedback_timer.active,
+            player.money, player.water_reserve, frozenset(earned_badges),
+            tuple(player.item_inventory.values()), tuple(player.seed_inventory.values()),
+            tuple(player.fertilizer_inventory.values()), tuple(player.equipment_inventory.items()),
+        )
+
+    def display(self):
         # Draw background
         pygame.draw.rect(self.display_surface, self.colors['bg'], (self.menu_x, self.menu_y, self.width, self.height), 0, 15)
         pygame.draw.rect(self.display_surface, (100, 100, 120), (self.menu_x, self.menu_y, self.width, self.height), 4, 15)
@@ -344,159 +360,156 @@ class Menu:
         self.draw_items()
         self.display_money()
 
-    def input(self):
-        keys = pygame.key.get_pressed()
-        self.timer.update()
+    def handle_input(self, event):
+        """Shop and quiz controls; returns True for the events it uses"""
+        if not event.pressed:
+            return False
+        actions = event.actions
+        press = event.kind == PRESS
 
-        if keys[pygame.K_ESCAPE]:
+        if 'back' in actions and press:
             if self.quiz_active:
                 self.quiz_active = False # Back to list
-                self.timer.activate()
             else:
                 self.toggle_menu()
+            return True
 
-        if not self.timer.active:
-            # Quiz Mode Input
-            if self.quiz_active:
-                if self.quiz_complete:
-                    if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-                        # Reset all quiz state when exiting
-                        self.quiz_active = False
-                        self.quiz_complete = False
-                        self.quiz_question_index = 0
-                        self.quiz_score = 0
-                        self.quiz_feedback = ""
-                        # Use longer timer to prevent immediate re-trigger
-                        self.timer = Timer(500)
-                        self.timer.activate()
-                    return
-
-                # Don't accept input during feedback timer
-                if pygame.time.get_ticks() < self.quiz_feedback_timer:
-                    # Check if timer just expired to advance question
-                    return 
-                elif self.quiz_feedback != "":
-                    # Timer expired, advance question
+        # Quiz Mode Input
+        if self.quiz_active:
+            if self.quiz_complete:
+                if 'confirm' in actions and press:
+                    # Reset all quiz state when exiting
+                    self.quiz_active = False
+                    self.quiz_complete = False
+                    self.quiz_question_index = 0
+                    self.quiz_score = 0
                     self.quiz_feedback = ""
-                    self.quiz_question_index += 1
-                    self.quiz_selected_option = 0
-                    
-                    if self.quiz_question_index >= len(self.quiz_questions):
-                        self.quiz_complete = True
-                        # Award Badge if perfect score
-                        if self.quiz_score == len(self.quiz_questions):
-                            badge = QUIZZES[self.current_quiz_id]['badge']
-                            earned_badges.add(badge)
-                    return
+                    return True
+                return False
 
-                # Question Input
-                q_data = self.quiz_questions[self.quiz_question_index]
-                if keys[pygame.K_UP]:
-                    self.quiz_selected_option = max(0, self.quiz_selected_option - 1)
-                    self.timer.activate()
-                if keys[pygame.K_DOWN]:
-                    self.quiz_selected_option = min(len(q_data['options']) - 1, self.quiz_selected_option + 1)
-                    self.timer.activate()
-                if keys[pygame.K_SPACE]:
-                    self.timer.activate()
-                    # Check Answer
-                    selected_text = q_data['options'][self.quiz_selected_option]
-                    correct_text = q_data['a']
-                    
-                    if selected_text == correct_text:
-                        self.quiz_score += 1
-                        self.quiz_feedback = "Correct!"
-                    else:
-                        self.quiz_feedback = f"Incorrect!"
-                    
-                    self.quiz_feedback_timer = pygame.time.get_ticks() + 1000
+            # Don't accept input while the feedback is shown
+            if self.quiz_feedback_timer.active:
+                return False
+
+            # Question Input
+            q_data = self.quiz_questions[self.quiz_question_index]
+            if 'menu_up' in actions:
+                self.quiz_selected_option = max(0, self.quiz_selected_option - 1)
+                return True
+            if 'menu_down' in actions:
+                self.quiz_selected_option = min(len(q_data['options']) - 1, self.quiz_selected_option + 1)
+                return True
+            if 'confirm' in actions and press:
+                # Check Answer
+                selected_text = q_data['options'][self.quiz_selected_option]
+                correct_text = q_data['a']
+                
+                if selected_text == correct_text:
+                    self.quiz_score += 1
+                    self.quiz_feedback = "Correct!"
+                else:
+                    self.quiz_feedback = f"Incorrect!"
+                
+                self.quiz_feedback_timer.activate()
+                return True
+            return False
+
+        # Normal Menu Input
+        if 'menu_right' in actions:
+            self.current_tab = (self.current_tab + 1) % 5
+            self.index = 0
+        elif 'menu_left' in actions:
+            self.current_tab = (self.current_tab - 1) % 5
+            self.index = 0
+        elif 'menu_up' in actions:
+            self.index = max(0, self.index - 1)
+        elif 'menu_down' in actions:
+            items_len = len(self.tab_items.get(self.current_tab, []))
+            self.index = min(items_len - 1, self.index + 1)
+        elif 'confirm' in actions:
+            # holding confirm keeps buying or selling
+            items = self.tab_items.get(self.current_tab, [])
+            if items:
+                self.select_item(*items[self.index])
+        else:
+            return False
+        return True
+
+    def next_question(self):
+        """Feedback timer expired: move on to the next question"""
+        self.quiz_feedback = ""
+        self.quiz_question_index += 1
+        self.quiz_selected_option = 0
+        
+        if self.quiz_question_index >= len(self.quiz_questions):
+            self.quiz_complete = True
+            # Award Badge if perfect score
+            if self.quiz_score == len(self.quiz_questions):
+                badge = QUIZZES[self.current_quiz_id]['badge']
+                award_badge(badge)
+
+    def select_item(self, action, item):
+        if action == 'take_quiz':
+            self.current_quiz_id = item
+            self.quiz_questions = QUIZZES[item]['questions']
+            self.quiz_active = True
+            self.quiz_question_index = 0
+            self.quiz_score = 0
+            self.quiz_selected_option = 0
+            self.quiz_complete = False
+            self.quiz_feedback = ""
+        
+        elif action == 'buy_seed':
+            price = self._get_item_details(action, item)[2]
+            if self.player.money >= price:
+                self.player.seed_inventory[item] += 1
+                self.player.money -= price
+                
+        elif action == 'buy_fert':
+            price = self._get_item_details(action, item)[2]
+            if self.player.money >= price:
+                self.player.fertilizer_inventory[item] += 1
+                self.player.money -= price
+                
+        elif action == 'buy_water':
+            price = self._get_item_details(action, item)[2]
+            if self.player.money >= price:
+                self.player.water_reserve += 10
+                self.player.money -= price
+
+        elif action == 'buy_equip':
+            price = self._get_item_details(action, item)[2]
+            equip_data = EQUIPMENT_DATA.get(item, {})
+            unlock_badge = equip_data.get('unlock_badge')
+            unlock_skill = equip_data.get('unlock_skill')
             
-            else:
-                # Normal Menu Input
-                if keys[pygame.K_RIGHT]:
-                    self.current_tab = (self.current_tab + 1) % 5
-                    self.index = 0
-                    self.timer.activate()
-                if keys[pygame.K_LEFT]:
-                    self.current_tab = (self.current_tab - 1) % 5
-                    self.index = 0
-                    self.timer.activate()
-                    
-                if keys[pygame.K_UP]:
-                    self.index = max(0, self.index - 1)
-                    self.timer.activate()
-                if keys[pygame.K_DOWN]:
-                    items_len = len(self.tab_items.get(self.current_tab, []))
-                    self.index = min(items_len - 1, self.index + 1)
-                    self.timer.activate()
-                    
-                if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-                    self.timer.activate()
-                    
-                    items = self.tab_items.get(self.current_tab, [])
-                    if items:
-                         action, item = items[self.index]
-                         
-                         if action == 'take_quiz':
-                             self.current_quiz_id = item
-                             self.quiz_questions = QUIZZES[item]['questions']
-                             self.quiz_active = True
-                             self.quiz_question_index = 0
-                             self.quiz_score = 0
-                             self.quiz_selected_option = 0
-                             self.quiz_complete = False
-                             self.quiz_feedback = ""
-                         
-                         elif action == 'buy_seed':
-                            price = self._get_item_details(action, item)[2]
-                            if self.player.money >= price:
-                                self.player.seed_inventory[item] += 1
-                                self.player.money -= price
-                                
-                         elif action == 'buy_fert':
-                            price = self._get_item_details(action, item)[2]
-                            if self.player.money >= price:
-                                self.player.fertilizer_inventory[item] += 1
-                                self.player.money -= price
-                                
-                         elif action == 'buy_water':
-                            price = self._get_item_details(action, item)[2]
-                            if self.player.money >= price:
-                                self.player.water_reserve += 10
-                                self.player.money -= price
+            # Check badge or skill requirement
+            can_buy = True
+            
+            # Check badge requirement first (from quiz)
+            if unlock_badge:
+                if not has_badge(unlock_badge):
+                    can_buy = False
+                    self.notifications.append((f"🔒 Requires {unlock_badge} badge!", pygame.time.get_ticks()))
+            # Then check skill requirement
+            elif unlock_skill and self.player.learning_system:
+                skills = self.player.learning_system.skill_tree.get_unlocked_skills()
+                if unlock_skill not in skills:
+                    can_buy = False
+                    self.notifications.append((f"🔒 Requires {unlock_skill} skill!", pygame.time.get_ticks()))
+            
+            if can_buy and self.player.money >= price:
+                self.player.equipment_inventory[item] = self.player.equipment_inventory.get(item, 0) + 1
+                self.player.money -= price
+                self.notifications.append((f"✓ Bought {equip_data.get('name', item)}!", pygame.time.get_ticks()))
+            elif can_buy:
+                self.notifications.append(("Not enough money!", pygame.time.get_ticks()))
 
-                         elif action == 'buy_equip':
-                            price = self._get_item_details(action, item)[2]
-                            equip_data = EQUIPMENT_DATA.get(item, {})
-                            unlock_badge = equip_data.get('unlock_badge')
-                            unlock_skill = equip_data.get('unlock_skill')
-                            
-                            # Check badge or skill requirement
-                            can_buy = True
-                            
-                            # Check badge requirement first (from quiz)
-                            if unlock_badge:
-                                if not has_badge(unlock_badge):
-                                    can_buy = False
-                                    self.notifications.append((f"🔒 Requires {unlock_badge} badge!", pygame.time.get_ticks()))
-                            # Then check skill requirement
-                            elif unlock_skill and self.player.learning_system:
-                                skills = self.player.learning_system.skill_tree.get_unlocked_skills()
-                                if unlock_skill not in skills:
-                                    can_buy = False
-                                    self.notifications.append((f"🔒 Requires {unlock_skill} skill!", pygame.time.get_ticks()))
-                            
-                            if can_buy and self.player.money >= price:
-                                self.player.equipment_inventory[item] = self.player.equipment_inventory.get(item, 0) + 1
-                                self.player.money -= price
-                                self.notifications.append((f"✓ Bought {equip_data.get('name', item)}!", pygame.time.get_ticks()))
-                            elif can_buy:
-                                self.notifications.append(("Not enough money!", pygame.time.get_ticks()))
-                         elif action == 'sell':
-                            price = self._get_item_details(action, item)[2]
-                            if self.player.item_inventory[item] > 0:
-                                self.player.item_inventory[item] -= 1
-                                self.player.money += price
-                                if self.player.item_inventory[item] == 0:
-                                    self._build_item_lists()
-                                    self.index = max(0, self.index - 1)
\ No newline at end of file
+        elif action == 'sell':
+            price = self._get_item_details(action, item)[2]
+            if self.player.item_inventory[item] > 0:
+                self.player.item_inventory[item] -= 1
+                self.player.money += price
+                if self.player.item_inventory[item] == 0:
+                    self._build_item_lists()
+                    self.index = max(0, self.index - 1)
@@ -0,0 +1,122 @@
+# Notifications - Bounded message bus between the game systems and the on-screen toasts
+# Identical messages are merged into one counted toast, so a flood of them costs the same as one
+
+from collections import deque
+from time import monotonic
+
+# priorities: a full bus makes room by dropping the oldest toast of the lowest priority
+LOW = 0     # routine per-action verdicts ('✔ Correct watering')
+NORMAL = 1  # direct feedback to the player ('No water!')
+HIGH = 2    # achievements and skill unlocks
+
+
+def ticks():
+    """Milliseconds on a monotonic clock (works headless, without pygame)"""
+    return int(monotonic() * 1000)
+
+
+class Toast:
+    """One on-screen notification; count grows as identical messages are merged into it"""
+    __slots__ = ('message', 'priority', 'count', 'shown_at')
+
+    def __init__(self, message, priority, count):
+        self.message = message
+        self.priority = priority
+        self.count = count
+        self.shown_at = None  # set when first drawn, so toasts queued behind a menu still get their full time
+
+    @property
+    def text(self):
+        return self.message if self.count == 1 else f'{self.message} ×{self.count}'
+
+
+class NotificationBus:
+    """
+    Fixed-capacity queue of toasts waiting for or being shown on screen.
+
+    Data Structure: RING BUFFER (deque of at most `capacity` toasts)
+                    + HASH MAP message -> toast
+    Purpose: memory and draw time stay constant however many messages are
+    posted. A message that is already queued or on screen only bumps that
+    toast's count (and restarts its display time). A new message on a full
+    bus replaces the oldest toast of lower or equal priority, or is dropped
+    if every toast outranks it. rate_limits (priority -> new toasts per
+    second) throttles how fast distinct messages of a priority can appear;
+    throttled and dropped messages are counted in `dropped`.
+    """
+    def __init__(self, capacity=5, duration=3000, rate_limits=None, clock=ticks):
+        self.capacity = capacity
+        self.duration = duration  # ms a toast stays on screen
+        self.rate_limits = {LOW: 4} if rate_limits is None else rate_limits
+        self.clock = clock
+        self.toasts = deque()
+        self.by_message = {}
+        self.allowance = {}  # priority -> (tokens, last refill time)
+        self.dropped = 0
+
+    def post(self, message, priority=NORMAL, count=1):
+        """Queue message (count times), merging it into a matching toast"""
+        if not message or count <= 0:
+            return
+        now = self.clock()
+        self.expire(now)
+
+        toast = self.by_message.get(message)
+        if toast is not None:
+            toast.count += count
+            toast.priority = max(toast.priority, priority)
+            if toast.shown_at is not None:
+                toast.shown_at = now
+            return
+
+        if not self._admit(priority, now):
+            self.dropped += count
+            return
+        if len(self.toasts) >= self.capacity:
+            # min() keeps the first, i.e. oldest, of the lowest priority
+            victim = min(self.toasts, key=lambda toast: toast.priority)
+            if victim.priority > priority:
+                self.dropped += count
+                return
+            self.toasts.remove(victim)
+            del self.by_message[victim.message]
+
+        toast = self.by_message[message] = Toast(message, priority, count)
+        self.toasts.append(toast)
+
+    def _admit(self, priority, now):
+        """Token bucket per priority: refills at rate_limits[priority] tokens a second"""
+        rate = self.rate_limits.get(priority)
+        if rate is None:
+            return True
+        tokens, last = self.allowance.get(priority, (rate, now))
+        tokens = min(rate, tokens + (now - last) * rate / 1000)
+        admitted = tokens >= 1
+        self.allowance[priority] = (tokens - 1 if admitted else tokens, now)
+        return admitted
+
+    def expire(self, now):
+        # not just from the front: a refreshed toast outlives newer ones behind it
+        expired = [toast for toast in self.toasts
+                   if toast.shown_at is not None and now - toast.shown_at >= self.duration]
+        for toast in expired:
+            self.toasts.remove(toast)
+            del self.by_message[toast.message]
+
+    def active(self):
+        """(toast, seconds-left fraction) pairs to draw this frame, oldest first"""
+        now = self.clock()
+        self.expire(now)
+        shown = []
+        for toast in self.toasts:
+            if toast.shown_at is None:
+                toast.shown_at = now
+            shown.append((toast, 1 - (now - toast.shown_at) / self.duration))
+        return shown
+
+    def clear(self):
+        self.toasts.clear()
+        self.by_message.clear()
+
+    def __len__(self):
+        return len(self.toasts)
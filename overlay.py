@@ -3,6 +3,8 @@ import os
 from settings import *
 from knowledge_base import IRRIGATION_DATA
 from inventory import get_item_category
+from assets import assets
+from text_cache import render_text
 
 class Overlay:
 	def __init__(self, player):
@@ -17,31 +19,49 @@ class Overlay:
 
 		# imports 
 		overlay_path = './graphics/overlay/'
-		self.tools_surf = {tool: pygame.image.load(f'{overlay_path}{tool}.png').convert_alpha() for tool in player.tools}
+		self.tools_surf = {tool: assets.image(f'{overlay_path}{tool}.png') for tool in player.tools}
 		
 		# Load seed images with fallbacks for missing files
 		self.seeds_surf = {}
 		for seed in player.seeds:
 			img_path = f'{overlay_path}{seed}.png'
 			if os.path.exists(img_path):
-				self.seeds_surf[seed] = pygame.image.load(img_path).convert_alpha()
+				self.seeds_surf[seed] = assets.image(img_path)
 			else:
 				# Create placeholder for missing seed images
 				placeholder = pygame.Surface((64, 64), pygame.SRCALPHA)
 				pygame.draw.circle(placeholder, (100, 200, 100), (32, 32), 28)
-				font = pygame.font.Font(None, 24)
-				text = font.render(seed[:3].upper(), True, (255, 255, 255))
+				font = assets.font(None, 24)
+				text = render_text(font, seed[:3].upper(), True, (255, 255, 255))
 				placeholder.blit(text, (32 - text.get_width()//2, 32 - text.get_height()//2))
 				self.seeds_surf[seed] = placeholder
 		
 		# Font for learning system UI
-		self.font = pygame.font.Font('./font/LycheeSoda.ttf', 24)
-		self.small_font = pygame.font.Font('./font/LycheeSoda.ttf', 18)
+		self.font = assets.font('./font/LycheeSoda.ttf', 24)
+		self.small_font = assets.font('./font/LycheeSoda.ttf', 18)
 		
-		# Notification system
-		self.notifications = []
-		self.notification_timer = 0
-		self.notification_duration = 3000  # 3 seconds
+		# HUD cache: widget name -> (displayed value, surface, rect)
+		self.hud_cache = {}
+		self.toast_surfs = {}  # toast text -> (text surface, background surface), for the toasts on screen
+
+	def cached_widget(self, name, value, build):
+		"""Surface and rect of a HUD widget, rebuilt by build() only when the value it shows changes"""
+		cached = self.hud_cache.get(name)
+		if cached is None or cached[0] != value:
+			cached = self.hud_cache[name] = (value, *build())
+		return cached[1], cached[2]
+
+	def text_panel(self, font, text, color, inflate, **anchor):
+		"""Text on a rounded black background, composed into one surface"""
+		text_surf = render_text(font, text, False, color)
+		text_rect = text_surf.get_rect(**anchor)
+		bg_rect = text_rect.inflate(*inflate)
+		
+		# the display has no alpha channel, so these backgrounds always drew opaque
+		panel = pygame.Surface(bg_rect.size, pygame.SRCALPHA)
+		pygame.draw.rect(panel, 'black', panel.get_rect(), 0, 4)
+		panel.blit(text_surf, text_rect.move(-bg_rect.x, -bg_rect.y))
+		return panel, bg_rect
 
 	def display(self):
 
@@ -85,44 +105,55 @@ class Overlay:
 					screen_x = interaction.rect.centerx - offset_x
 					screen_y = interaction.rect.top - offset_y
 					
-					# Dimensions
-					rect_width = 280
-					rect_height = 70
-					rect_x = screen_x - rect_width // 2
-					rect_y = screen_y - 90
-					
-					bg_color = 'White'
-					border_color = 'Black'
-					
-					# Draw speech bubble tail (triangle pointing down)
-					tail_points = [
-						(screen_x - 10, rect_y + rect_height - 2),
-						(screen_x + 10, rect_y + rect_height - 2),
-						(screen_x, rect_y + rect_height + 15)
-					]
-					pygame.draw.polygon(self.display_surface, bg_color, tail_points)
-					pygame.draw.polygon(self.display_surface, border_color, tail_points, 2)
+					bubble, bubble_rect = self.cached_widget('shop bubble', None, self.build_shop_bubble)
+					self.display_surface.blit(bubble, bubble_rect.move(screen_x, screen_y))
 					
-					# Draw speech bubble body
-					rect = pygame.Rect(rect_x, rect_y, rect_width, rect_height)
-					pygame.draw.rect(self.display_surface, bg_color, rect, 0, 8)
-					pygame.draw.rect(self.display_surface, border_color, rect, 2, 8)
-					
-					# Cover the line between box and tail
-					cover_rect = pygame.Rect(screen_x - 8, rect_y + rect_height - 3, 16, 6)
-					pygame.draw.rect(self.display_surface, bg_color, cover_rect)
+					return # Only one trader
+
+	def build_shop_bubble(self):
+		"""Speech bubble over the trader, with its rect relative to the trader's top centre"""
+		# Dimensions
+		rect_width = 280
+		rect_height = 70
+		rect_x = -rect_width // 2
+		rect_y = -90
+		
+		bg_color = 'White'
+		border_color = 'Black'
+		
+		bounds = pygame.Rect(rect_x, rect_y, rect_width, rect_height + 18)
+		bubble = pygame.Surface(bounds.size, pygame.SRCALPHA)
+		dx, dy = -bounds.x, -bounds.y
+		
+		# Draw speech bubble tail (triangle pointing down)
+		tail_points = [
+			(dx - 10, dy + rect_y + rect_height - 2),
+			(dx + 10, dy + rect_y + rect_height - 2),
+			(dx, dy + rect_y + rect_height + 15)
+		]
+		pygame.draw.polygon(bubble, bg_color, tail_points)
+		pygame.draw.polygon(bubble, border_color, tail_points, 2)
+		
+		# Draw speech bubble body
+		rect = pygame.Rect(rect_x + dx, rect_y + dy, rect_width, rect_height)
+		pygame.draw.rect(bubble, bg_color, rect, 0, 8)
+		pygame.draw.rect(bubble, border_color, rect, 2, 8)
+		
+		# Cover the line between box and tail
+		cover_rect = pygame.Rect(dx - 8, rect.bottom - 3, 16, 6)
+		pygame.draw.rect(bubble, bg_color, cover_rect)
+
+		# Text Line 1 (Black)
+		text_surf1 = render_text(self.font, "Hi! Welcome to the shop!", False, 'Black')
+		text_rect1 = text_surf1.get_rect(midtop=(rect.centerx, rect.top + 12))
+		bubble.blit(text_surf1, text_rect1)
+		
+		# Text Line 2 (Grey)
+		text_surf2 = render_text(self.font, "PRESS ENTER to trade", False, (100, 100, 100))
+		text_rect2 = text_surf2.get_rect(midtop=(rect.centerx, rect.top + 38))
+		bubble.blit(text_surf2, text_rect2)
+		return bubble, bounds
 
-					# Text Line 1 (Black)
-					text_surf1 = self.font.render("Hi! Welcome to the shop!", False, 'Black')
-					text_rect1 = text_surf1.get_rect(midtop=(rect.centerx, rect.top + 12))
-					self.display_surface.blit(text_surf1, text_rect1)
-					
-					# Text Line 2 (Grey)
-					text_surf2 = self.font.render("PRESS ENTER to trade", False, (100, 100, 100))
-					text_rect2 = text_surf2.get_rect(midtop=(rect.centerx, rect.top + 38))
-					self.display_surface.blit(text_surf2, text_rect2)
-					
-					return # Only one trader	
 	def display_soil_health(self):
 		"""Display soil health bar for the TARGETED TILE in top-right corner"""
 		if not self.soil_layer:
@@ -133,19 +164,25 @@ class Overlay:
 		target_pos = self.player.target_pos
 		health = self.soil_layer.get_tile_soil_health(target_pos)
 		
+		panel, panel_rect = self.cached_widget('soil health', int(health * 2), lambda: self.build_soil_health(health))
+		self.display_surface.blit(panel, panel_rect)
+
+	def build_soil_health(self, health):
+		"""Label, bar and percentage for the targeted tile's health"""
+		bar_width = 200
+		bar_height = 20
+		label = render_text(self.font, 'Tile Health', False, 'White')
+		panel = pygame.Surface((max(bar_width, label.get_width()), 25 + bar_height), pygame.SRCALPHA)
+		
 		# Draw label
-		label = self.font.render('Tile Health', False, 'White')
-		label_rect = label.get_rect(topleft=SOIL_HEALTH_BAR_POS)
-		self.display_surface.blit(label, label_rect)
+		panel.blit(label, (0, 0))
 		
 		# Draw health bar background
-		bar_x = SOIL_HEALTH_BAR_POS[0]
-		bar_y = SOIL_HEALTH_BAR_POS[1] + 25
-		bar_width = 200
-		bar_height = 20
+		bar_x = 0
+		bar_y = 25
 		
 		# Background (dark)
-		pygame.draw.rect(self.display_surface, (50, 50, 50), 
+		pygame.draw.rect(panel, (50, 50, 50), 
 			(bar_x, bar_y, bar_width, bar_height), 0, 4)
 		
 		# Health fill (color changes based on health)
@@ -161,17 +198,18 @@ class Overlay:
 			color = (50, 200, 50)  # Green
 		
 		if fill_width > 0:
-			pygame.draw.rect(self.display_surface, color,
+			pygame.draw.rect(panel, color,
 				(bar_x, bar_y, fill_width, bar_height), 0, 4)
 		
 		# Border
-		pygame.draw.rect(self.display_surface, 'White',
+		pygame.draw.rect(panel, 'White',
 			(bar_x, bar_y, bar_width, bar_height), 2, 4)
 		
 		# Health value text
-		health_text = self.small_font.render(f'{int(health)}%', False, 'White')
+		health_text = render_text(self.small_font, f'{int(health)}%', False, 'White')
 		health_rect = health_text.get_rect(center=(bar_x + bar_width//2, bar_y + bar_height//2))
-		self.display_surface.blit(health_text, health_rect)
+		panel.blit(health_text, health_rect)
+		return panel, panel.get_rect(topleft=SOIL_HEALTH_BAR_POS)
 	
 	def display_score(self):
 		"""Display current score"""
@@ -179,13 +217,9 @@ class Overlay:
 			return
 			
 		score = self.learning_system.total_score
-		score_text = self.font.render(f'Score: {score}', False, 'White')
-		score_rect = score_text.get_rect(topright=(SCREEN_WIDTH - 20, 90))
-		
-		# Background
-		bg_rect = score_rect.inflate(20, 10)
-		pygame.draw.rect(self.display_surface, (0, 0, 0, 128), bg_rect, 0, 4)
-		self.display_surface.blit(score_text, score_rect)
+		panel, rect = self.cached_widget('score', score, lambda: self.text_panel(
+			self.font, f'Score: {score}', 'White', (20, 10), topright=(SCREEN_WIDTH - 20, 90)))
+		self.display_surface.blit(panel, rect)
 	
 	def display_day(self):
 		"""Display current day number"""
@@ -204,13 +238,10 @@ class Overlay:
 		}
 		weather_icon = weather_icons.get(weather, '⛅')
 		
-		day_text = self.font.render(f'Day {day} {weather_icon}', False, 'White')
-		day_rect = day_text.get_rect(topleft=DAY_DISPLAY_POS)
-		
-		# Background
-		bg_rect = day_rect.inflate(20, 10)
-		pygame.draw.rect(self.display_surface, (0, 0, 0, 128), bg_rect, 0, 4)
-		self.display_surface.blit(day_text, day_rect)
+		text = f'Day {day} {weather_icon}'
+		panel, rect = self.cached_widget('day', text, lambda: self.text_panel(
+			self.font, text, 'White', (20, 10), topleft=DAY_DISPLAY_POS))
+		self.display_surface.blit(panel, rect)
 	
 	def display_fertilizer(self):
 		"""Display selected fertilizer type"""
@@ -226,14 +257,10 @@ class Overlay:
 		icon = '🌿' if fert_type in ['compost', 'bone_meal', 'fish_emulsion', 'blood_meal', 'wood_ash'] else '⚗️'
 		color = (255, 255, 255) # White for all
 		
-		fert_text = self.small_font.render(f'{icon} {fert_type.title()}: {fert_count}', False, color)
-		fert_rect = fert_text.get_rect(topleft=(20, 60))
-		
-		# Background
-		bg_rect = fert_rect.inflate(10, 6)
-			
-		pygame.draw.rect(self.display_surface, (0, 0, 0, 150), bg_rect, 0, 4)
-		self.display_surface.blit(fert_text, fert_rect)
+		text = f'{icon} {fert_type.title()}: {fert_count}'
+		panel, rect = self.cached_widget('fertilizer', text, lambda: self.text_panel(
+			self.small_font, text, color, (10, 6), topleft=(20, 60)))
+		self.display_surface.blit(panel, rect)
 	
 	def display_water_reserve(self):
 		"""Display water reserve amount"""
@@ -241,13 +268,10 @@ class Overlay:
 		max_reserve = self.player.max_water_reserve
 		
 		# Position top-left below fertilizer
-		reserve_text = self.small_font.render(f'💧 Water: {int(reserve)}/{max_reserve}', False, (100, 180, 255))
-		reserve_rect = reserve_text.get_rect(topleft=(20, 95))
-		
-		# Background
-		bg_rect = reserve_rect.inflate(10, 6)
-		pygame.draw.rect(self.display_surface, (0, 0, 0, 150), bg_rect, 0, 4)
-		self.display_surface.blit(reserve_text, reserve_rect)
+		text = f'💧 Water: {int(reserve)}/{max_reserve}'
+		panel, rect = self.cached_widget('water reserve', text, lambda: self.text_panel(
+			self.small_font, text, (100, 180, 255), (10, 6), topleft=(20, 95)))
+		self.display_surface.blit(panel, rect)
 	
 	def display_irrigation_mode(self):
 		"""Display current irrigation mode"""
@@ -266,63 +290,47 @@ class Overlay:
 			color = (150, 150, 150)
 			text = f'🔒 {mode_name}'
 		
-		irr_text = self.small_font.render(text, False, color)
-		irr_rect = irr_text.get_rect(topleft=(20, 130))
-		
-		# Background
-		bg_rect = irr_rect.inflate(10, 6)
-		pygame.draw.rect(self.display_surface, (0, 0, 0, 150), bg_rect, 0, 4)
-		self.display_surface.blit(irr_text, irr_rect)
+		panel, rect = self.cached_widget('irrigation', text, lambda: self.text_panel(
+			self.small_font, text, color, (10, 6), topleft=(20, 130)))
+		self.display_surface.blit(panel, rect)
 	
 	def display_notifications(self):
-		"""Display notification messages"""
-		# Get new notifications from learning system
-		if self.learning_system:
-			new_notifs = self.learning_system.get_notifications()
-			for notif in new_notifs:
-				self.add_notification(notif)
-		
-		# Update and display notifications
-		current_time = pygame.time.get_ticks()
-		
-		# Remove expired notifications
-		self.notifications = [(msg, start_time) for msg, start_time in self.notifications 
-			if current_time - start_time < self.notification_duration]
+		"""Display the learning system's notification toasts"""
+		if not self.learning_system:
+			return
+		toasts = self.learning_system.notifications.active()
+
+		# only the toasts on screen keep their surfaces, so the cache is as bounded as the bus
+		texts = {toast.text for toast, _ in toasts}
+		for text in set(self.toast_surfs) - texts:
+			del self.toast_surfs[text]
 		
 		# Display active notifications
 		y_offset = 0
-		for msg, start_time in self.notifications:
-			# Calculate alpha based on time remaining
-			time_left = self.notification_duration - (current_time - start_time)
-			alpha = min(255, int(255 * (time_left / self.notification_duration)))
-			
-			# Determine color based on message type
-			if '✔' in msg or '(+' in msg:
-				color = (100, 255, 100)  # Green for positive
-			elif '✖' in msg or '(-' in msg:
-				color = (255, 100, 100)  # Red for negative
-			elif '🏆' in msg or '🔓' in msg:
-				color = (255, 215, 0)  # Gold for achievements/unlocks
-			else:
-				color = (255, 255, 255)  # White default
-			
-			notif_text = self.small_font.render(msg, False, color)
+		for toast, time_left in toasts:
+			# text and background are made once per toast text; the fade only changes the background's alpha
+			cached = self.toast_surfs.get(toast.text)
+			if cached is None:
+				notif_text = render_text(self.small_font, toast.text, False, self.toast_color(toast.message))
+				bg_surface = pygame.Surface(notif_text.get_rect().inflate(20, 10).size)
+				cached = self.toast_surfs[toast.text] = (notif_text, bg_surface)
+			notif_text, bg_surface = cached
 			notif_rect = notif_text.get_rect(center=(NOTIFICATION_POS[0], NOTIFICATION_POS[1] + y_offset))
 			
-			# Background with transparency
+			# Background with transparency, fading out with the time left
 			bg_rect = notif_rect.inflate(20, 10)
-			bg_surface = pygame.Surface((bg_rect.width, bg_rect.height), pygame.SRCALPHA)
-			bg_surface.fill((0, 0, 0, int(alpha * 0.7)))
+			bg_surface.set_alpha(int(min(255, int(255 * time_left)) * 0.7))
 			self.display_surface.blit(bg_surface, bg_rect)
 			
 			self.display_surface.blit(notif_text, notif_rect)
 			y_offset += 30
-	
-	def add_notification(self, message):
-		"""Add a notification to display"""
-		current_time = pygame.time.get_ticks()
-		self.notifications.append((message, current_time))
-		
-		# Limit number of visible notifications
-		if len(self.notifications) > 5:
-			self.notifications.pop(0)
\ No newline at end of file
+
+	def toast_color(self, msg):
+		"""Determine color based on message type"""
+		if '✔' in msg or '(+' in msg:
+			return (100, 255, 100)  # Green for positive
+		elif '✖' in msg or '(-' in msg:
+			return (255, 100, 100)  # Red for negative
+		elif '🏆' in msg or '🔓' in msg:
+			return (255, 215, 0)  # Gold for achievements/unlocks
+		return (255, 255, 255)  # White default
\ No newline at end of file
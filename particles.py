@@ -0,0 +1,79 @@
+# Particle Pool - Fixed-size, array-backed particle storage
+# Particles live in recycled slots instead of being allocated as sprites
+
+from array import array
+
+class ParticlePool:
+    """
+    Fixed number of particle slots stored in parallel flat arrays.
+
+    Data Structure: ARRAY (structure of arrays, densely packed)
+    Live particles always occupy slots 0..count-1. A dying particle is
+    replaced by the last live one, so spawning and removing are O(1) and
+    memory never grows past the capacity.
+    """
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.count = 0
+
+        # per-particle state
+        self.x = array('f', [0.0]) * capacity
+        self.y = array('f', [0.0]) * capacity
+        self.speed = array('f', [0.0]) * capacity
+        self.age = array('f', [0.0]) * capacity
+        self.lifetime = array('f', [0.0]) * capacity
+        self.frame = array('B', [0]) * capacity
+
+    def spawn(self, x, y, lifetime, frame=0, speed=0.0):
+        """Claim a free slot. Returns False when the pool is full."""
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.age[i] = 0.0
+        self.lifetime[i] = lifetime
+        self.frame[i] = frame
+        self.count += 1
+        return True
+
+    def remove(self, i):
+        """Free slot i by moving the last live particle into it"""
+        last = self.count - 1
+        if i != last:
+            self.x[i] = self.x[last]
+            self.y[i] = self.y[last]
+            self.speed[i] = self.speed[last]
+            self.age[i] = self.age[last]
+            self.lifetime[i] = self.lifetime[last]
+            self.frame[i] = self.frame[last]
+        self.count = last
+
+    def update(self, dt, direction=(0, 0)):
+        """Age every particle, recycle expired ones and move the rest along direction * speed"""
+        dir_x, dir_y = direction
+        age, lifetime, speed = self.age, self.lifetime, self.speed
+        i = 0
+        while i < self.count:
+            age[i] += dt
+            if age[i] >= lifetime[i]:
+                self.remove(i)
+                continue
+            if speed[i]:
+                step = speed[i] * dt
+                self.x[i] += dir_x * step
+                self.y[i] += dir_y * step
+            i += 1
+
+    def clear(self):
+        self.count = 0
+
+    def blit_sequence(self, surfs, offset):
+        """(surface, position) pairs for Surface.blits, shifted by the camera offset"""
+        offset_x, offset_y = offset
+        x, y, frame = self.x, self.y, self.frame
+        return [(surfs[frame[i]], (round(x[i]) - offset_x, round(y[i]) - offset_y)) for i in range(self.count)]
+
+    def __len__(self):
+        return self.count
@@ -1,10 +1,16 @@
 import pygame
 from settings import *
 from support import *
-from timer import Timer
+from assets import assets
+from timer import Timer, game_timers
 from knowledge_base import FERTILIZER_DATA, IRRIGATION_DATA, INITIAL_WATER_RESERVE, MAX_WATER_RESERVE
 from rainwater import RainTank
 from inventory import get_item_category
+from animation import animation_clock
+from input_map import input_map, PRESS
+from derived_stats import DerivedStats
+import farm_rules
+from quiz_system import badge_watchers, get_shop_discount
 
 class Player(pygame.sprite.Sprite):
 	def __init__(self, pos, group, collision_sprites, tree_sprites, interaction, soil_layer, toggle_shop):
@@ -12,34 +18,33 @@ class Player(pygame.sprite.Sprite):
 
 		self.import_assets()
 		self.status = 'down_idle'
-		self.frame_index = 0
+		# walk/tool cycle advanced by the shared animation clock
+		self.animation = animation_clock.cursor(self.animations[self.status], 4)
 
 		# general setup
-		self.image = self.animations[self.status][self.frame_index]
+		self.image = self.animation.frame
 		self.rect = self.image.get_rect(center = pos)
 		self.z = LAYERS['main']
 
 		# movement attributes
 		self.direction = pygame.math.Vector2()
 		self.pos = pygame.math.Vector2(self.rect.center)
+		self.previous_center = self.rect.center  # before the last move, for drawing between steps
+		self.get_target_pos()  # the overlay reads it even if a menu opens before the first update
 		self.base_speed = 200
-		self.speed = self.base_speed
+		# speed, max_water_reserve and shop_discount, recomputed only when their inputs change
+		self.stats = DerivedStats()
 
 		# collision
 		self.hitbox = self.rect.copy().inflate((-126,-70))
 		self.collision_sprites = collision_sprites
 
-		# timers 
+		# timers (game time, so they stand still while the world is paused)
 		self.timers = {
-			'tool use': Timer(350,self.use_tool),
-			'tool switch': Timer(200),
-			'seed use': Timer(350,self.use_seed),
-			'seed switch': Timer(200),
-			'fertilizer use': Timer(350, self.use_fertilizer),
-			'fertilizer switch': Timer(200),
-			'irrigation switch': Timer(200),
-			'equipment place': Timer(350, self.place_equipment),
-			'equipment switch': Timer(200),
+			'tool use': Timer(350,self.use_tool,game_timers),
+			'seed use': Timer(350,self.use_seed,game_timers),
+			'fertilizer use': Timer(350, self.use_fertilizer, game_timers),
+			'equipment place': Timer(350, self.place_equipment, game_timers),
 		}
 
 		# tools 
@@ -93,9 +98,6 @@ class Player(pygame.sprite.Sprite):
 		# Water reserve (for rainwater collection)
 		self.water_reserve = INITIAL_WATER_RESERVE
 		self.base_max_water_reserve = MAX_WATER_RESERVE
-		self.water_reserve = INITIAL_WATER_RESERVE
-		self.base_max_water_reserve = MAX_WATER_RESERVE
-		self.max_water_reserve = self.base_max_water_reserve
 		self.water_tank_bonus = 0 # Updates from placed water tanks
 		
 	# FEATURE: Rainwater Harvesting Tank
@@ -111,6 +113,9 @@ class Player(pygame.sprite.Sprite):
 		self.selected_equipment = self.equipment_types[self.equipment_index]
 		
 		self.money = 200
+		
+		# Counts farm actions so Level can checkpoint the save after each one
+		self.action_count = 0
 
 		# interaction
 		self.tree_sprites = tree_sprites
@@ -125,11 +130,15 @@ class Player(pygame.sprite.Sprite):
 		# Fatigue System (Sleep Penalty)
 		self.fatigue = 0 # 0 = rested, >0 = tired
 
+		self.define_stats()
+		badge_watchers.add(self)
+
 		# sound
-		self.watering = pygame.mixer.Sound('./audio/water.mp3')
+		self.watering = assets.sound('./audio/water.mp3')
 		self.watering.set_volume(0.2)
 
 	def use_tool(self):
+		self.action_count += 1
 		if self.selected_tool == 'hoe':
 			self.soil_layer.get_hit(self.target_pos)
 		
@@ -142,27 +151,10 @@ class Player(pygame.sprite.Sprite):
 			# Get water cost based on irrigation mode
 			water_cost = IRRIGATION_DATA[self.selected_irrigation]['water_cost']
 			
-			# FEATURE: Rainwater Harvesting
-			# Try to use rain tank first
-			used_rain_tank = False
-			if self.rain_tank.use_water(water_cost):
-				used_rain_tank = True
-				if self.learning_system:
-					# Bonus score for using rainwater?
-					pass
-			
-			# If rain tank didn't have enough, check main reserve
-			if used_rain_tank or self.water_reserve >= water_cost:
-				if not used_rain_tank:
-					self.water_reserve -= water_cost
-				
+			# FEATURE: Rainwater Harvesting - the rain tank is used first, then the main reserve
+			if farm_rules.pay_water(self, water_cost):
 				self.soil_layer.water(self.target_pos)
 				self.watering.play()
-				
-				# Feedback about source
-				if self.learning_system and used_rain_tank:
-					# Maybe too spammy to notify every time, but specific to feature
-					pass
 			else:
 				# Alert: no water
 				if self.learning_system:
@@ -176,6 +168,7 @@ class Player(pygame.sprite.Sprite):
 		if self.seed_inventory[self.selected_seed] > 0:
 			self.soil_layer.plant_seed(self.target_pos, self.selected_seed)
 			self.seed_inventory[self.selected_seed] -= 1
+			self.action_count += 1
 		else:
 			# Alert: no seeds
 			if self.learning_system:
@@ -186,10 +179,7 @@ class Player(pygame.sprite.Sprite):
 		if self.fertilizer_inventory[self.selected_fertilizer] > 0:
 			if self.soil_layer.apply_fertilizer(self.target_pos, self.selected_fertilizer):
 				self.fertilizer_inventory[self.selected_fertilizer] -= 1
-				
-				# Track for achievements
-				if self.learning_system and self.selected_fertilizer in ['compost', 'bone_meal', 'fish_emulsion', 'blood_meal', 'wood_ash']:
-					self.learning_system.organic_fertilizer_count += 1
+				self.action_count += 1
 		else:
 			# Alert: no fertilizer
 			if self.learning_system:
@@ -213,6 +203,7 @@ class Player(pygame.sprite.Sprite):
 			# Place on soil tile
 			if self.soil_layer.place_drip_emitter(self.target_pos):
 				self.equipment_inventory[equip_type] -= 1
+				self.action_count += 1
 				if self.learning_system:
 					self.learning_system.add_notification("🌊 Drip emitter placed!")
 			else:
@@ -224,20 +215,10 @@ class Player(pygame.sprite.Sprite):
 			if hasattr(self, 'place_tank_callback') and self.place_tank_callback:
 				self.place_tank_callback(self.target_pos)
 				self.equipment_inventory[equip_type] -= 1
+				self.action_count += 1
 				if self.learning_system:
 					self.learning_system.add_notification("💧 Water tank placed!")
 	
-	def collect_rainwater(self, amount=5):
-		"""Collect rainwater into reserve (called on rainy days)"""
-		# Fill rain tank first
-		collected = self.rain_tank.collect_rain(amount * 2) # Tank collects more efficiently
-		
-		# Also fill handheld reserve some amount
-		self.water_reserve = min(self.max_water_reserve, self.water_reserve + amount)
-		
-		if self.learning_system:
-			self.learning_system.add_notification(f"💧 Rain Tank filled: {int(self.rain_tank.get_fill_percentage()*100)}%")
-	
 	def get_unlocked_irrigation_modes(self):
 		"""Get list of irrigation modes available based on skills"""
 		unlocked = ['manual']  # Always available
@@ -261,138 +242,177 @@ class Player(pygame.sprite.Sprite):
 			self.animations[animation] = import_folder(full_path)
 
 	def animate(self,dt):
-		self.frame_index += 4 * dt
-		if self.frame_index >= len(self.animations[self.status]):
-			self.frame_index = 0
+		self.animation.play(self.animations[self.status])
+		self.image = self.animation.frame
 
-		self.image = self.animations[self.status][int(self.frame_index)]
+	def unlocked_skills(self):
+		return self.learning_system.skill_tree.get_unlocked_skills() if self.learning_system else []
+
+	def has_skill(self, name):
+		return name in self.unlocked_skills()
+
+	def define_stats(self):
+		"""Continuous effects of skills, fatigue, tanks and badges, as derived stats"""
+		stats = self.stats
 
-	def apply_skill_effects(self):
-		"""Apply continuous effects from unlocked skills"""
-		if not self.learning_system:
-			return
-			
-		skills = self.learning_system.skill_tree.get_unlocked_skills()
-		
 		# Skill: Faster Movement (Soil Care branch via Sustainable Farming -> Crop Rotation)
-		# Assuming 'Crop Rotation' gives speed boost as per user prompt logic
-		if 'Crop Rotation' in skills:
-			self.speed = self.base_speed * 1.2 # 20% faster
-		else:
-			self.speed = self.base_speed
-			
-		# Apply Fatigue Penalty
-		if self.fatigue > 0:
-			self.speed *= 0.8 # Sluggish
-			
-		# Skill: Increased Water Capacity (Water Management)
-		skill_bonus = 20 if 'Water Management' in skills else 0
-		
-		# Total Max Water = Base + Skill + Tank Bonus
-		self.max_water_reserve = self.base_max_water_reserve + skill_bonus + getattr(self, 'water_tank_bonus', 0)
+		stats.define('speed', lambda: self.base_speed)
+		stats.add_modifier('speed', lambda speed: speed * 1.2 if self.has_skill('Crop Rotation') else speed, ['skills'])
+		# Fatigue Penalty (sluggish)
+		stats.add_modifier('speed', lambda speed: speed * 0.8 if self.fatigue > 0 else speed, ['fatigue'])
+
+		# Total Max Water = Base + Skill (Water Management) + Tank Bonus
+		stats.define('max_water_reserve', lambda: farm_rules.max_water_reserve(
+			self.base_max_water_reserve, self.unlocked_skills(), self.water_tank_bonus), ['skills', 'water_tanks'])
+
+		# Shop price multiplier from quiz badges
+		stats.define('shop_discount', 1.0)
+		stats.add_modifier('shop_discount', lambda price: price * get_shop_discount(), ['badges'])
+
+	@property
+	def speed(self):
+		return self.stats['speed']
+
+	@property
+	def max_water_reserve(self):
+		return self.stats['max_water_reserve']
+
+	@property
+	def fatigue(self):
+		return self._fatigue
+
+	@fatigue.setter
+	def fatigue(self, value):
+		self._fatigue = value
+		self.stats.invalidate('fatigue')
+
+	@property
+	def water_tank_bonus(self):
+		return self._water_tank_bonus
+
+	@water_tank_bonus.setter
+	def water_tank_bonus(self, value):
+		self._water_tank_bonus = value
+		self.stats.invalidate('water_tanks')
+
+	@property
+	def learning_system(self):
+		return self._learning_system
+
+	@learning_system.setter
+	def learning_system(self, learning_system):
+		self._learning_system = learning_system
+		if learning_system:
+			learning_system.skill_tree.listeners.append(lambda: self.stats.invalidate('skills'))
+		self.stats.invalidate('skills')
+
+	def badges_changed(self):
+		self.stats.invalidate('badges')
 
 	def input(self):
-		keys = pygame.key.get_pressed()
-
+		# movement follows the held keys; discrete actions arrive through handle_input
 		if not self.timers['tool use'].active and not self.sleep:
 			# directions (WASD)
-			if keys[pygame.K_w]:
+			if input_map.held('move_up'):
 				self.direction.y = -1
 				self.status = 'up'
-			elif keys[pygame.K_s]:
+			elif input_map.held('move_down'):
 				self.direction.y = 1
 				self.status = 'down'
 			else:
 				self.direction.y = 0
 
-			if keys[pygame.K_d]:
+			if input_map.held('move_right'):
 				self.direction.x = 1
 				self.status = 'right'
-			elif keys[pygame.K_a]:
+			elif input_map.held('move_left'):
 				self.direction.x = -1
 				self.status = 'left'
 			else:
 				self.direction.x = 0
 
-			# tool use
-			if keys[pygame.K_SPACE]:
-				self.timers['tool use'].activate()
-				self.direction = pygame.math.Vector2()
-				self.frame_index = 0
-
-			# change tool
-			if keys[pygame.K_q] and not self.timers['tool switch'].active:
-				self.timers['tool switch'].activate()
-				self.tool_index += 1
-				self.tool_index = self.tool_index if self.tool_index < len(self.tools) else 0
-				self.selected_tool = self.tools[self.tool_index]
-
-			# seed use
-			if keys[pygame.K_LCTRL]:
-				self.timers['seed use'].activate()
-				self.direction = pygame.math.Vector2()
-				self.frame_index = 0
-
-			# change seed 
-			if keys[pygame.K_e] and not self.timers['seed switch'].active:
-				self.timers['seed switch'].activate()
-				self.seed_index += 1
-				self.seed_index = self.seed_index if self.seed_index < len(self.seeds) else 0
-				self.selected_seed = self.seeds[self.seed_index]
-			
-			# FERTILIZER CONTROLS
-			# F key = switch fertilizer type
-			if keys[pygame.K_f] and not self.timers['fertilizer switch'].active:
-				self.timers['fertilizer switch'].activate()
-				self.fertilizer_index += 1
-				self.fertilizer_index = self.fertilizer_index if self.fertilizer_index < len(self.fertilizers) else 0
-				self.selected_fertilizer = self.fertilizers[self.fertilizer_index]
-			
-			# R key = apply fertilizer
-			if keys[pygame.K_r] and not self.timers['fertilizer use'].active:
-				self.timers['fertilizer use'].activate()
-				self.direction = pygame.math.Vector2()
-				self.frame_index = 0
-			
-			# IRRIGATION CONTROLS
-			# I key = switch irrigation mode (only unlocked modes)
-			if keys[pygame.K_i] and not self.timers['irrigation switch'].active:
-				self.timers['irrigation switch'].activate()
-				unlocked_modes = self.get_unlocked_irrigation_modes()
-				if len(unlocked_modes) > 1:
-					current_idx = unlocked_modes.index(self.selected_irrigation) if self.selected_irrigation in unlocked_modes else 0
-					next_idx = (current_idx + 1) % len(unlocked_modes)
-					self.selected_irrigation = unlocked_modes[next_idx]
-					if self.learning_system:
-						mode_name = IRRIGATION_DATA[self.selected_irrigation]['name']
-						self.learning_system.add_notification(f"🚿 Switched to {mode_name}")
-			
-			# EQUIPMENT CONTROLS
-			# G key = switch equipment type
-			if keys[pygame.K_g] and not self.timers['equipment switch'].active:
-				self.timers['equipment switch'].activate()
-				self.equipment_index = (self.equipment_index + 1) % len(self.equipment_types)
-				self.selected_equipment = self.equipment_types[self.equipment_index]
-				from knowledge_base import EQUIPMENT_DATA
-				equip_name = EQUIPMENT_DATA[self.selected_equipment]['name']
+	def handle_input(self, event):
+		"""World actions; presses and key repeats both act, so holding a key keeps repeating it"""
+		if not event.pressed or self.timers['tool use'].active or self.sleep:
+			return False
+		actions = event.actions
+
+		# tool use
+		if 'use_tool' in actions:
+			self.timers['tool use'].activate()
+			self.direction = pygame.math.Vector2()
+			self.animation.time = 0
+
+		# change tool
+		if 'next_tool' in actions:
+			self.tool_index += 1
+			self.tool_index = self.tool_index if self.tool_index < len(self.tools) else 0
+			self.selected_tool = self.tools[self.tool_index]
+
+		# seed use
+		if 'use_seed' in actions:
+			self.timers['seed use'].activate()
+			self.direction = pygame.math.Vector2()
+			self.animation.time = 0
+
+		# change seed 
+		if 'next_seed' in actions:
+			self.seed_index += 1
+			self.seed_index = self.seed_index if self.seed_index < len(self.seeds) else 0
+			self.selected_seed = self.seeds[self.seed_index]
+		
+		# FERTILIZER CONTROLS
+		# F key = switch fertilizer type
+		if 'next_fertilizer' in actions:
+			self.fertilizer_index += 1
+			self.fertilizer_index = self.fertilizer_index if self.fertilizer_index < len(self.fertilizers) else 0
+			self.selected_fertilizer = self.fertilizers[self.fertilizer_index]
+		
+		# R key = apply fertilizer
+		if 'apply_fertilizer' in actions and not self.timers['fertilizer use'].active:
+			self.timers['fertilizer use'].activate()
+			self.direction = pygame.math.Vector2()
+			self.animation.time = 0
+		
+		# IRRIGATION CONTROLS
+		# O key = switch irrigation mode (only unlocked modes)
+		if 'next_irrigation' in actions:
+			unlocked_modes = self.get_unlocked_irrigation_modes()
+			if len(unlocked_modes) > 1:
+				current_idx = unlocked_modes.index(self.selected_irrigation) if self.selected_irrigation in unlocked_modes else 0
+				next_idx = (current_idx + 1) % len(unlocked_modes)
+				self.selected_irrigation = unlocked_modes[next_idx]
 				if self.learning_system:
-					count = self.equipment_inventory.get(self.selected_equipment, 0)
-					self.learning_system.add_notification(f"🔧 {equip_name} ({count})")
-			
-			# T key = place equipment
-			if keys[pygame.K_t] and not self.timers['equipment place'].active:
-				self.timers['equipment place'].activate()
-				self.direction = pygame.math.Vector2()
-				self.frame_index = 0
-
-			if keys[pygame.K_RETURN]:
-				collided_interaction_sprite = pygame.sprite.spritecollide(self,self.interaction,False)
-				if collided_interaction_sprite:
-					if collided_interaction_sprite[0].name == 'Trader':
-						self.toggle_shop()
-					else:
-						self.status = 'left_idle'
-						self.sleep = True
+					mode_name = IRRIGATION_DATA[self.selected_irrigation]['name']
+					self.learning_system.add_notification(f"🚿 Switched to {mode_name}")
+		
+		# EQUIPMENT CONTROLS
+		# G key = switch equipment type
+		if 'next_equipment' in actions:
+			self.equipment_index = (self.equipment_index + 1) % len(self.equipment_types)
+			self.selected_equipment = self.equipment_types[self.equipment_index]
+			from knowledge_base import EQUIPMENT_DATA
+			equip_name = EQUIPMENT_DATA[self.selected_equipment]['name']
+			if self.learning_system:
+				count = self.equipment_inventory.get(self.selected_equipment, 0)
+				self.learning_system.add_notification(f"🔧 {equip_name} ({count})")
+		
+		# T key = place equipment
+		if 'place_equipment' in actions and not self.timers['equipment place'].active:
+			self.timers['equipment place'].activate()
+			self.direction = pygame.math.Vector2()
+			self.animation.time = 0
+
+		if 'interact' in actions and event.kind == PRESS:
+			collided_interaction_sprite = pygame.sprite.spritecollide(self,self.interaction,False)
+			if collided_interaction_sprite:
+				if collided_interaction_sprite[0].name == 'Trader':
+					self.toggle_shop()
+				else:
+					self.status = 'left_idle'
+					self.sleep = True
+
+		return bool(actions)
 
 	def get_status(self):
 		
@@ -404,29 +424,25 @@ class Player(pygame.sprite.Sprite):
 		if self.timers['tool use'].active:
 			self.status = self.status.split('_')[0] + '_' + self.selected_tool
 
-	def update_timers(self):
-		for timer in self.timers.values():
-			timer.update()
-
 	def collision(self, direction):
-		for sprite in self.collision_sprites.sprites():
-			if hasattr(sprite, 'hitbox'):
-				if sprite.hitbox.colliderect(self.hitbox):
-					if direction == 'horizontal':
-						if self.direction.x > 0: # moving right
-							self.hitbox.right = sprite.hitbox.left
-						if self.direction.x < 0: # moving left
-							self.hitbox.left = sprite.hitbox.right
-						self.rect.centerx = self.hitbox.centerx
-						self.pos.x = self.hitbox.centerx
-
-					if direction == 'vertical':
-						if self.direction.y > 0: # moving down
-							self.hitbox.bottom = sprite.hitbox.top
-						if self.direction.y < 0: # moving up
-							self.hitbox.top = sprite.hitbox.bottom
-						self.rect.centery = self.hitbox.centery
-						self.pos.y = self.hitbox.centery
+		# only hitboxes indexed in the tiles around the player can collide
+		for sprite in self.collision_sprites.query(self.hitbox):
+			if sprite.hitbox.colliderect(self.hitbox):
+				if direction == 'horizontal':
+					if self.direction.x > 0: # moving right
+						self.hitbox.right = sprite.hitbox.left
+					if self.direction.x < 0: # moving left
+						self.hitbox.left = sprite.hitbox.right
+					self.rect.centerx = self.hitbox.centerx
+					self.pos.x = self.hitbox.centerx
+
+				if direction == 'vertical':
+					if self.direction.y > 0: # moving down
+						self.hitbox.bottom = sprite.hitbox.top
+					if self.direction.y < 0: # moving up
+						self.hitbox.top = sprite.hitbox.bottom
+					self.rect.centery = self.hitbox.centery
+					self.pos.y = self.hitbox.centery
 
 	def move(self,dt):
 
@@ -449,8 +465,7 @@ class Player(pygame.sprite.Sprite):
 	def update(self, dt):
 		self.input()
 		self.get_status()
-		self.update_timers()
 		self.get_target_pos()
-		self.apply_skill_effects()
+		self.previous_center = self.rect.center
 		self.move(dt)
 		self.animate(dt)
@@ -2,6 +2,8 @@
 # Quiz System Module
 # Manages sustainability quizzes, badges, and rewards.
 
+import weakref
+
 # DATA STRUCTURE: Dictionary (Questions)
 # Key: Quiz ID
 # Value: Quiz Topic data (title, questions, badge, description)
@@ -145,8 +147,28 @@ QUIZZES = {
 
 # DATA STRUCTURE: Set (Unique Badges)
 # Stores earned badges. Sets ensure no duplicates and O(1) lookup.
+# Change it through award_badge()/set_badges() so badge watchers hear about it.
 earned_badges = set()
 
+# objects with a badges_changed() method (e.g. players caching the shop discount)
+badge_watchers = weakref.WeakSet()
+
+def _notify_badge_watchers():
+    for watcher in list(badge_watchers):
+        watcher.badges_changed()
+
+def award_badge(badge_name):
+    """Add a badge to the earned set"""
+    if badge_name not in earned_badges:
+        earned_badges.add(badge_name)
+        _notify_badge_watchers()
+
+def set_badges(badge_names):
+    """Replace every earned badge (loading a save)"""
+    earned_badges.clear()
+    earned_badges.update(badge_names)
+    _notify_badge_watchers()
+
 def has_badge(badge_name):
     """Check if player has a specific badge"""
     return badge_name in earned_badges
@@ -0,0 +1,59 @@
+# Retained Menus - Full-screen menus drawn over a frozen snapshot of the world
+# The composed frame is reused until the open menu's render key changes, so an idle menu costs one blit per frame
+
+import pygame
+
+
+class ModalFrame:
+    """
+    Frame cache for modal menus.
+
+    When a menu opens, Level captures the world it just drew (sprites,
+    overlay and sky) once. While the menu stays open the world is not
+    drawn again. The menu is drawn over that snapshot, dimmed by the menu's
+    dim_alpha, and the result is kept. Every later frame blits the kept
+    frame, until menu.render_key() returns something different.
+
+    Menus provide display() (draws the menu only, no dimming), dim_alpha
+    and render_key() (a hashable value covering everything display()
+    shows).
+    """
+    def __init__(self, display_surface):
+        self.display_surface = display_surface
+        self.world = None       # undimmed snapshot of the world
+        self.owner = None       # menu the background was dimmed for
+        self.background = None  # world dimmed for owner
+        self.frame = None       # background with owner drawn over it
+        self.key = None
+
+    @property
+    def frozen(self):
+        return self.world is not None
+
+    def capture_world(self):
+        """Keep what is on the display now as the world behind menus"""
+        self.world = self.display_surface.copy()
+        self.owner = self.background = self.frame = self.key = None
+
+    def release(self):
+        """Forget the snapshot: the menu closed, or the world changed under it (e.g. a new day)"""
+        self.world = self.owner = self.background = self.frame = self.key = None
+
+    def draw(self, menu):
+        key = (id(menu), menu.render_key())
+        if self.frame is not None and key == self.key:
+            self.display_surface.blit(self.frame, (0, 0))
+            return
+
+        if menu is not self.owner:
+            self.owner = menu
+            self.background = self.world.copy()
+            if menu.dim_alpha:
+                dim = pygame.Surface(self.background.get_size())
+                dim.set_alpha(menu.dim_alpha)
+                self.background.blit(dim, (0, 0))
+
+        self.display_surface.blit(self.background, (0, 0))
+        menu.display()
+        self.frame = self.display_surface.copy()
+        self.key = key
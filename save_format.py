@@ -0,0 +1,130 @@
+# Save Format - Versioned binary save files with sparse tile encoding
+# A small header, a compact JSON block for player/learning data and packed arrays for worked tiles only
+# Journal files append length + CRC framed records in the same encoding
+
+import json
+import struct
+import sys
+import zlib
+from array import array
+
+from soil_grid import TILE_FIELDS
+
+MAGIC = b'SPRT'
+VERSION = 1
+FLAG_COMPRESSED = 1
+
+# magic, version, flags, payload length
+HEADER = struct.Struct('<4sHHI')
+# grid width, grid height, sparse tile count
+TILES_HEADER = struct.Struct('<HHI')
+META_LENGTH = struct.Struct('<I')
+# journal record frame: payload length, crc32 of payload
+RECORD = struct.Struct('<II')
+
+
+class SaveFormatError(ValueError):
+    """Raised for files that are not saves in this format or are truncated"""
+
+
+def is_binary_save(head):
+    return head[:len(MAGIC)] == MAGIC
+
+
+def _to_bytes(values):
+    # saves are little-endian regardless of the machine that wrote them
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_bytes(typecode, payload, offset, count):
+    values = array(typecode)
+    end = offset + values.itemsize * count
+    if end > len(payload):
+        raise SaveFormatError('save file is truncated')
+    values.frombytes(payload[offset:end])
+    if sys.byteorder == 'big' and values.itemsize > 1:
+        values.byteswap()
+    return values, end
+
+
+def encode(save_data, soil_grid, compress=True, indices=None):
+    """
+    Bytes for a save: header + (optionally zlib-compressed) payload.
+
+    Payload: length-prefixed compact JSON of everything except the soil
+    tiles, then the grid size, the indices of the stored tiles (all
+    non-default tiles unless indices is given) and one packed array per
+    tile field holding only those tiles.
+    """
+    meta = json.dumps(save_data, separators=(',', ':')).encode('utf-8')
+    indices = array('I', soil_grid.sparse_indices() if indices is None else indices)
+    fields = soil_grid.gather(indices)
+
+    parts = [META_LENGTH.pack(len(meta)), meta,
+             TILES_HEADER.pack(soil_grid.width, soil_grid.height, len(indices)),
+             _to_bytes(indices)]
+    parts.extend(_to_bytes(fields[name]) for name, _ in TILE_FIELDS)
+    payload = b''.join(parts)
+
+    flags = 0
+    if compress:
+        payload = zlib.compress(payload, 6)
+        flags |= FLAG_COMPRESSED
+    return HEADER.pack(MAGIC, VERSION, flags, len(payload)) + payload
+
+
+def decode(raw):
+    """
+    Parse a binary save. Returns (save_data, tiles) where tiles is a dict
+    with width, height, indices and the per-field arrays.
+    """
+    if len(raw) < HEADER.size:
+        raise SaveFormatError('save file is truncated')
+    magic, version, flags, length = HEADER.unpack_from(raw)
+    if magic != MAGIC:
+        raise SaveFormatError('not a binary save file')
+    if version > VERSION:
+        raise SaveFormatError(f'save version {version} is newer than this game supports ({VERSION})')
+
+    payload = raw[HEADER.size:HEADER.size + length]
+    if len(payload) != length:
+        raise SaveFormatError('save file is truncated')
+    if flags & FLAG_COMPRESSED:
+        payload = zlib.decompress(payload)
+
+    (meta_length,) = META_LENGTH.unpack_from(payload)
+    offset = META_LENGTH.size
+    save_data = json.loads(payload[offset:offset + meta_length].decode('utf-8'))
+    offset += meta_length
+
+    width, height, count = TILES_HEADER.unpack_from(payload, offset)
+    offset += TILES_HEADER.size
+    indices, offset = _from_bytes('I', payload, offset, count)
+    tiles = {'width': width, 'height': height, 'indices': indices}
+    for name, typecode in TILE_FIELDS:
+        tiles[name], offset = _from_bytes(typecode, payload, offset, count)
+    return save_data, tiles
+
+
+def frame_record(raw):
+    """Journal record: length and CRC32 ahead of an encoded save"""
+    return RECORD.pack(len(raw), zlib.crc32(raw)) + raw
+
+
+def iter_records(journal):
+    """
+    Encoded saves from a journal, in order. Stops quietly at the first
+    torn or corrupt record (a crash during an append).
+    """
+    offset = 0
+    while offset + RECORD.size <= len(journal):
+        length, crc = RECORD.unpack_from(journal, offset)
+        start = offset + RECORD.size
+        raw = journal[start:start + length]
+        if len(raw) != length or zlib.crc32(raw) != crc:
+            return
+        yield raw
+        offset = start + length
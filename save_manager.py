@@ -1,22 +1,170 @@
 import json
 import os
+import threading
 import pygame
-from quiz_system import earned_badges
+import save_format
+from quiz_system import earned_badges, set_badges
+from spatial_hash import refresh_hitbox
 
 class SaveManager:
-    def __init__(self, filename='savegame.json'):
+    """
+    Saves and loads the game.
+
+    Saves use the binary format in save_format.py (only worked tiles are
+    stored). A legacy JSON save is still loaded when no binary save exists
+    and is migrated by the next save.
+
+    save_game only snapshots the state on the main thread; a background
+    worker encodes it. The first save of a session writes a full snapshot
+    atomically (temp file, fsync, rename). Later saves append only what
+    changed since the previous save (sections, plants, tiles) to a journal
+    next to it, so their cost follows what happened rather than the size of
+    the farm. The journal is compacted into a new snapshot every
+    COMPACT_EVERY records or once it outgrows the snapshot. load_game
+    replays snapshot plus journal; a record torn by a crash is ignored.
+    If several saves queue up while one is being written, only the newest
+    is written next.
+    """
+    COMPACT_EVERY = 32
+
+    def __init__(self, filename='savegame.sav', legacy_filename='savegame.json'):
         self.filename = filename
+        self.legacy_filename = legacy_filename
+        self.journal_filename = filename + '.journal'
+
+        # state last written to disk (writer thread only)
+        self._base = None       # {'sections': ..., 'plants': ..., 'grid': ...}
+        self._seq = 0           # sequence number of the last journal record
+        self._journal_records = 0
+        self._journal_bytes = 0
+        self._snapshot_bytes = 0
+
+        # background writer state (guarded by the condition's lock)
+        self._condition = threading.Condition()
+        self._pending = None    # newest snapshot waiting to be written
+        self._writing = False
+        self._worker = None
+        self.last_error = None
+
+    def save_game(self, player, soil_layer, learning_system, trees=None, water_tanks=None, wait=False):
+        """
+        Snapshot the game state and hand it to the background writer.
+        wait=True (the save on quit) blocks until it is written and reports it;
+        the per-action checkpoints stay quiet.
+        """
+        save_data = self._snapshot(player, soil_layer, learning_system, trees, water_tanks)
+        
+        with self._condition:
+            self._pending = save_data
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._write_loop, name='save-writer', daemon=True)
+                self._worker.start()
+            self._condition.notify_all()
+        
+        if wait:
+            self.flush()
+            if self.last_error is None:
+                print("Game Saved!")
+
+    def flush(self, timeout=None):
+        """Block until every queued save has been written. Returns False on timeout."""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._writing, timeout)
 
-    def save_game(self, player, soil_layer, learning_system, trees=None, water_tanks=None):
-        """Save game state to JSON file"""
+    def _write_loop(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None)
+                save_data, self._pending = self._pending, None
+                self._writing = True
+            try:
+                self._write(save_data)
+                self.last_error = None
+            except Exception as e:
+                self.last_error = e
+                print(f"Error saving game: {e}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, save_data):
+        """Append a journal record, or write a full snapshot when there is no base or it is time to compact"""
+        sections = {key: value for key, value in save_data.items() if key != 'soil'}
+        plants = {(plant['x'], plant['y']): plant for plant in save_data['soil']['plants']}
+        grid = save_data['soil']['soil_grid']
+        
+        if (self._base is None or self._journal_records >= self.COMPACT_EVERY
+                or self._journal_bytes > self._snapshot_bytes):
+            self._write_snapshot(sections, plants, grid)
+        else:
+            self._append_journal(sections, plants, grid)
+        self._base = {'sections': sections, 'plants': plants, 'grid': grid}
+
+    def _write_snapshot(self, sections, plants, grid):
+        """Encode and write to a temp file next to the save, fsync it, then rename it over the save"""
+        meta = dict(sections, soil={'plants': list(plants.values())}, journal_seq=self._seq)
+        raw = save_format.encode(meta, grid)
+        
+        temp_name = self.filename + '.tmp'
+        with open(temp_name, 'wb') as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_name, self.filename)
+        
+        # the snapshot now holds everything the journal did (its records are
+        # also skipped by sequence number if removing it fails)
+        if os.path.exists(self.journal_filename):
+            os.remove(self.journal_filename)
+        self._fsync_directory()
+        
+        self._snapshot_bytes = len(raw)
+        self._journal_records = 0
+        self._journal_bytes = 0
+
+    def _append_journal(self, sections, plants, grid):
+        """Append one record with the changes since the last write. Returns False if nothing changed."""
+        base = self._base
+        changed_sections = {key: value for key, value in sections.items() if base['sections'].get(key) != value}
+        plants_set = [plant for tile, plant in plants.items() if base['plants'].get(tile) != plant]
+        plants_removed = [list(tile) for tile in base['plants'] if tile not in plants]
+        changed_tiles = grid.changed_indices(base['grid'])
+        if not (changed_sections or plants_set or plants_removed or changed_tiles):
+            return False
+        
+        self._seq += 1
+        meta = {'seq': self._seq, 'sections': changed_sections,
+                'plants_set': plants_set, 'plants_removed': plants_removed}
+        record = save_format.frame_record(save_format.encode(meta, grid, indices=changed_tiles))
+        with open(self.journal_filename, 'ab') as f:
+            f.write(record)
+            f.flush()
+            os.fsync(f.fileno())
+        
+        self._journal_records += 1
+        self._journal_bytes += len(record)
+        return True
+
+    def _fsync_directory(self):
+        # make renames and removals durable where directories can be fsync'd
+        if hasattr(os, 'O_DIRECTORY'):
+            directory = os.open(os.path.dirname(os.path.abspath(self.filename)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    def _snapshot(self, player, soil_layer, learning_system, trees=None, water_tanks=None):
+        """Copy everything a save needs; cheap enough to run on the main thread"""
         
         # 1. Player Data
         player_data = {
             'money': player.money,
-            'item_inventory': player.item_inventory,
-            'seed_inventory': player.seed_inventory,
-            'fertilizer_inventory': player.fertilizer_inventory,
-            'equipment_inventory': getattr(player, 'equipment_inventory', {}),
+            'item_inventory': dict(player.item_inventory),
+            'seed_inventory': dict(player.seed_inventory),
+            'fertilizer_inventory': dict(player.fertilizer_inventory),
+            'equipment_inventory': dict(getattr(player, 'equipment_inventory', {})),
             'water_reserve': player.water_reserve,
             'max_water_reserve': getattr(player, 'max_water_reserve', 100),
             'selected_tool_index': player.tool_index,
@@ -27,25 +175,9 @@ class SaveManager:
         # We need to serialize the grid. 
         # For simplicity, we'll store active plants and modified tiles.
         # This might be large, but for a small farm it's fine.
-        grid_data = []
-        rows = len(soil_layer.grid)
-        cols = len(soil_layer.grid[0])
-        
-        for y in range(rows):
-            for x in range(cols):
-                # Check for plant
-                plant = None
-                # Check sprite groups for plant at this position
-                # This is a bit inefficient, but accurate.
-                # Better: Check soil_layer.grid[y][x] flags if they exist, 
-                # but valid plants are sprites.
-                # Let's check collisions or just iterate sprites?
-                # Iterating all plant sprites is better.
-                pass
-
-        # Optimized Soil saving:
-        # Save soil health grid
-        soil_health = soil_layer.soil_health_grid # 2D array
+        # The packed soil arrays are copied here (a memory copy) and encoded
+        # sparsely on the writer thread
+        soil_grid = soil_layer.soil.copy()
         
         # Save plants
         plants_data = []
@@ -64,10 +196,7 @@ class SaveManager:
             })
 
         soil_data = {
-            'soil_health': soil_health,
-            'grid': soil_layer.grid,
-            'water_count': soil_layer.water_count_grid,
-            'last_crop': soil_layer.last_crop_grid,
+            'soil_grid': soil_grid,
             'plants': plants_data
         }
 
@@ -75,7 +204,7 @@ class SaveManager:
         learning_data = {
             'day': learning_system.current_day,
             'score': learning_system.total_score,
-            'daily_actions': learning_system.daily_actions,
+            'daily_actions': list(learning_system.daily_actions),
             'achievements': list(learning_system.achievements), # Set to list
             'skills': self._serialize_skills(learning_system.skill_tree)
         }
@@ -94,7 +223,6 @@ class SaveManager:
         # 5. Water Tank Data
         tank_data = []
         if water_tanks:
-            print(f"Saving {len(water_tanks)} water tanks...")
             for tank in water_tanks:
                 tank_data.append({
                     'x': tank.rect.x,
@@ -114,20 +242,62 @@ class SaveManager:
             'water_tanks': tank_data
         }
 
-        with open(self.filename, 'w') as f:
-            json.dump(save_data, f, indent=4)
-        
-        print("Game Saved!")
+        return save_data
+
+    def delete_save(self):
+        """Remove the save (and any legacy JSON save) once pending writes are done"""
+        self.flush()
+        for name in (self.journal_filename, self.filename, self.legacy_filename):
+            if name and os.path.exists(name):
+                os.remove(name)
+        self._base = None
+
+    def read_save(self):
+        """
+        (data, tile_batches) from the binary save with its journal replayed,
+        or (data, None) from a legacy JSON save when there is no binary one
+        yet. None if there is no save. Tile batches are applied in order.
+        """
+        if os.path.exists(self.filename):
+            with open(self.filename, 'rb') as f:
+                data, tiles = save_format.decode(f.read())
+            tile_batches = [tiles]
+            self._seq = data.pop('journal_seq', 0)
+            
+            if os.path.exists(self.journal_filename):
+                with open(self.journal_filename, 'rb') as f:
+                    journal = f.read()
+                plants = {(plant['x'], plant['y']): plant for plant in data.get('soil', {}).get('plants', [])}
+                for raw in save_format.iter_records(journal):
+                    record, tiles = save_format.decode(raw)
+                    if record['seq'] <= self._seq:
+                        continue  # already folded into the snapshot
+                    self._seq = record['seq']
+                    data.update(record['sections'])
+                    for x, y in record['plants_removed']:
+                        plants.pop((x, y), None)
+                    for plant in record['plants_set']:
+                        plants[(plant['x'], plant['y'])] = plant
+                    tile_batches.append(tiles)
+                data['soil'] = {'plants': list(plants.values())}
+            return data, tile_batches
+        if self.legacy_filename and os.path.exists(self.legacy_filename):
+            print("Loading legacy JSON save (it will be migrated on the next save)")
+            with open(self.legacy_filename, 'r') as f:
+                return json.load(f), None
+        return None
 
     def load_game(self, player, soil_layer, learning_system, trees=None, water_tanks=None):
-        """Load game state from JSON file"""
-        if not os.path.exists(self.filename):
-            print("No save file found.")
-            return False
+        """Load game state from the save file"""
+        # never read a save that is still being written
+        self.flush()
 
         try:
-            with open(self.filename, 'r') as f:
-                data = json.load(f)
+            save = self.read_save()
+            if save is None:
+                print("No save file found.")
+                return False
+            data, tile_batches = save
             
             # 1. Load Player
             p_data = data.get('player', {})
@@ -137,7 +307,7 @@ class SaveManager:
             player.fertilizer_inventory = p_data.get('fertilizer_inventory', player.fertilizer_inventory)
             player.equipment_inventory = p_data.get('equipment_inventory', {})
             player.water_reserve = p_data.get('water_reserve', 0)
-            player.max_water_reserve = p_data.get('max_water_reserve', 100)
+            # max_water_reserve is derived from skills and tanks, so the saved value is not restored
 
             # 2. Load Learning System
             l_data = data.get('learning', {})
@@ -149,27 +319,32 @@ class SaveManager:
             
             # Load Quiz Badges
             if 'badges' in data:
-                earned_badges.clear()
-                for badge in data['badges']:
-                    earned_badges.add(badge)
+                set_badges(data['badges'])
 
             # 3. Load Soil/Plants
             s_data = data.get('soil', {})
             
-            # Restore soil health
-            saved_health = s_data.get('soil_health')
-            if saved_health:
-                soil_layer.soil_health_grid = saved_health
-            
-            # Restore Grid and Tiles
-            if 'grid' in s_data:
-                soil_layer.grid = s_data['grid']
+            # Restore soil health, flags, water counts and crop history into the packed arrays
+            if tile_batches is not None:
+                soil = soil_layer.soil
+                soil.reset()
+                for tiles in tile_batches:
+                    if (tiles['width'], tiles['height']) != (soil.width, soil.height):
+                        raise ValueError(f"save grid is {tiles['width']}x{tiles['height']}, map is {soil.width}x{soil.height}")
+                    soil.scatter(tiles['indices'], tiles)
                 soil_layer.create_soil_tiles()
-            
-            if 'water_count' in s_data:
-                soil_layer.water_count_grid = s_data['water_count']
-            if 'last_crop' in s_data:
-                soil_layer.last_crop_grid = s_data['last_crop']
+                soil_layer.create_drip_emitters()
+            else:
+                # legacy JSON save: nested lists
+                soil_layer.soil.load_lists(
+                    flags=s_data.get('grid'),
+                    health=s_data.get('soil_health'),
+                    water_count=s_data.get('water_count'),
+                    last_crop=s_data.get('last_crop'))
+                
+                # Restore Tiles
+                if 'grid' in s_data:
+                    soil_layer.create_soil_tiles()
             
             # Clear existing plants
             for sprite in soil_layer.plant_sprites.sprites():
@@ -191,18 +366,8 @@ class SaveManager:
                     # self.plant_sprites.add(Plant(plant_type, groups, tile, check_watered))
                     
                     # We need the 'soil' tile object at x,y.
-                    # soil_layer.soil_sprites has them. 
-                    # Finding exact sprite by grid pos is annoying unless we map it.
-                    
-                    # Better: Iterate soil sprites and match position.
-                    target_pixel_x = x * 64
-                    target_pixel_y = y * 64
-                    
-                    found_tile = None
-                    for tile in soil_layer.soil_sprites.sprites():
-                        if tile.rect.x == target_pixel_x and tile.rect.y == target_pixel_y:
-                            found_tile = tile
-                            break
+                    # soil_layer.soil_sprites is indexed by grid position.
+                    found_tile = soil_layer.soil_sprites.get((x, y))
                     
                     if found_tile:
                         # Recreate plant
@@ -223,9 +388,8 @@ class SaveManager:
                     # Pass collision_groups explicitly as 3rd arg
                     PlacedWaterTank((t['x'], t['y']), [water_tanks, soil_layer.all_sprites], [soil_layer.collision_sprites])
                 
-                # Recalculate player bonus from tanks
+                # Recalculate player bonus from tanks (max_water_reserve follows)
                 player.water_tank_bonus = len(water_tanks) * 20
-                player.apply_skill_effects() # Force update max_water_reserve
             
             print("Game Loaded!")
             
@@ -250,6 +414,7 @@ class SaveManager:
                                  tree.image = tree.stump_surf
                                  tree.rect = tree.image.get_rect(midbottom = tree.rect.midbottom)
                                  tree.hitbox = tree.rect.copy().inflate(-10,-tree.rect.height * 0.6)
+                                 refresh_hitbox(tree)
                                  
                                  # Kill apples if dead
                                  for apple in tree.apple_sprites.sprites():
@@ -4,6 +4,18 @@ SCREEN_WIDTH = 1280
 SCREEN_HEIGHT = 720
 TILE_SIZE = 64
 
+# frame pacing (the simulation runs in fixed steps, drawing is capped separately)
+FPS = 60                  # render cap, 0 for uncapped
+VSYNC = True
+SIMULATION_HZ = 60        # fixed simulation steps per second
+MAX_STEPS_PER_FRAME = 5   # catch-up limit; past it the game slows down instead of spiralling
+ADAPTIVE_RENDER = True    # skip drawing frames while the simulation is catching up
+MAX_SKIPPED_RENDERS = 2   # consecutive frames that may be skipped before one is drawn anyway
+
+# held keys repeat after a delay, then at an interval (milliseconds)
+KEY_REPEAT_DELAY = 300
+KEY_REPEAT_INTERVAL = 150
+
 # overlay positions 
 OVERLAY_POSITIONS = {
 	'tool' : (40, SCREEN_HEIGHT - 15), 
@@ -30,6 +42,16 @@ LAYERS = {
 	'rain drops': 10
 }
 
+# day/night tint lookup table resolution (sunset and sunrise step through this many colours)
+SKY_TINT_STEPS = 128
+
+# rain particles (rates are per second, spawned around the camera view)
+RAIN_DROP_RATE = 150
+RAIN_FLOOR_RATE = 120
+RAIN_MAX_DROPS = 150
+RAIN_MAX_FLOOR = 120
+RAIN_SPAWN_MARGIN = 200
+
 APPLE_POS = {
 	'Small': [(18,17), (30,37), (12,50), (30,45), (20,30), (30,10)],
 	'Large': [(30,24), (60,65), (50,50), (16,40),(45,50), (42,70)]
@@ -2,9 +2,10 @@
 # Press P to open settings during gameplay
 
 import pygame
-import os
 from settings import *
-from timer import Timer
+from input_map import input_map, PRESS
+from assets import assets
+from text_cache import render_text
 
 class SettingsMenu:
     """
@@ -15,13 +16,12 @@ class SettingsMenu:
     def __init__(self, level):
         self.display_surface = pygame.display.get_surface()
         self.level = level
-        self.font = pygame.font.Font('./font/LycheeSoda.ttf', 24)
-        self.title_font = pygame.font.Font('./font/LycheeSoda.ttf', 32)
-        self.small_font = pygame.font.Font('./font/LycheeSoda.ttf', 18)
+        self.font = assets.font('./font/LycheeSoda.ttf', 24)
+        self.title_font = assets.font('./font/LycheeSoda.ttf', 32)
+        self.small_font = assets.font('./font/LycheeSoda.ttf', 18)
         
         # Menu state
         self.is_open = False
-        self.open_time = 0
         
         # Settings
         self.music_volume = 0.3
@@ -41,79 +41,62 @@ class SettingsMenu:
         self.audio_options = ['Music Volume', 'SFX Volume']
         self.selected = 0
         
-        # Controls list
+        # Controls list (key labels come from the current bindings)
         self.controls = [
-            ('Arrow Keys', 'Move player'),
-            ('Space', 'Use current tool'),
-            ('Q', 'Switch tool'),
-            ('E', 'Switch seed'),
-            ('Left Ctrl', 'Plant seed'),
-            ('F', 'Switch fertilizer'),
-            ('R', 'Apply fertilizer'),
-            ('I', 'Switch irrigation mode'),
-            ('B', 'Open Knowledge Book'),
-            ('P', 'Open Settings'),
-            ('Enter', 'Interact (shop/bed)'),
-            ('Escape', 'Close menus'),
+            (('move_up', 'move_left', 'move_down', 'move_right'), 'Move player'),
+            (('use_tool',), 'Use current tool'),
+            (('next_tool',), 'Switch tool'),
+            (('next_seed',), 'Switch seed'),
+            (('use_seed',), 'Plant seed'),
+            (('next_fertilizer', 'apply_fertilizer'), 'Switch / apply fertilizer'),
+            (('next_irrigation',), 'Switch irrigation mode'),
+            (('toggle_inventory',), 'Open Inventory'),
+            (('toggle_book',), 'Open Knowledge Book'),
+            (('toggle_settings',), 'Open Settings'),
+            (('interact',), 'Interact (shop/bed)'),
+            (('back',), 'Close menus'),
         ]
-        
-        # Timer
-        self.timer = Timer(150)
     
     def toggle(self):
         self.is_open = not self.is_open
-        if self.is_open:
-            self.open_time = pygame.time.get_ticks()
     
-    def update(self):
-        if not self.is_open:
-            return
-        
-        keys = pygame.key.get_pressed()
-        self.timer.update()
-        current_time = pygame.time.get_ticks()
-        
-        if current_time - self.open_time < 300:
-            return
-        
-        if not self.timer.active:
-            # Switch tabs
-            if keys[pygame.K_LEFT]:
-                 self.current_tab = (self.current_tab - 1) % len(self.tabs)
-                 self.selected = 0
-                 self.timer.activate()
-            if keys[pygame.K_RIGHT]:
-                 self.current_tab = (self.current_tab + 1) % len(self.tabs)
-                 self.selected = 0
-                 self.timer.activate()
-            
-            # Audio tab navigation
-            if self.current_tab == 0:
-                if keys[pygame.K_UP]:
-                    self.selected = max(0, self.selected - 1)
-                    self.timer.activate()
-                if keys[pygame.K_DOWN]:
-                    self.selected = min(len(self.audio_options) - 1, self.selected + 1)
-                    self.timer.activate()
-                
-                # Adjust volume with A/D keys (since left/right switch tabs)
-                if keys[pygame.K_a]:
-                    self._adjust_setting(-0.1)
-                    self.timer.activate()
-                if keys[pygame.K_d]:
-                    self._adjust_setting(0.1)
-                    self.timer.activate()
-            
-            # Game tab navigation
-            if self.current_tab == 2:
-                 if keys[pygame.K_SPACE] or keys[pygame.K_RETURN]:
-                     self.timer.activate()
-                     self._reset_game()
-            
-            # Close
-            if keys[pygame.K_ESCAPE] or keys[pygame.K_p]:
-                self.is_open = False
-                self.timer.activate()
+    def handle_input(self, event):
+        """Settings controls; returns True for the events it uses"""
+        if not event.pressed:
+            return False
+        actions = event.actions
+        press = event.kind == PRESS
+
+        # Switch tabs
+        if 'menu_left' in actions:
+            self.current_tab = (self.current_tab - 1) % len(self.tabs)
+            self.selected = 0
+        elif 'menu_right' in actions:
+            self.current_tab = (self.current_tab + 1) % len(self.tabs)
+            self.selected = 0
+
+        # Audio tab navigation
+        elif self.current_tab == 0 and 'menu_up' in actions:
+            self.selected = max(0, self.selected - 1)
+        elif self.current_tab == 0 and 'menu_down' in actions:
+            self.selected = min(len(self.audio_options) - 1, self.selected + 1)
+        # Adjust volume with A/D keys (since left/right switch tabs)
+        elif self.current_tab == 0 and 'decrease' in actions:
+            self._adjust_setting(-0.1)
+        elif self.current_tab == 0 and 'increase' in actions:
+            self._adjust_setting(0.1)
+
+        # Game tab navigation
+        elif self.current_tab == 2 and 'confirm' in actions and press:
+            self._reset_game()
+
+        # Close
+        elif ('back' in actions or 'toggle_settings' in actions) and press:
+            self.is_open = False
+
+        else:
+            return False
+        return True
     
     def _adjust_setting(self, delta):
         option = self.audio_options[self.selected]
@@ -124,22 +107,24 @@ class SettingsMenu:
             self.sfx_volume = max(0, min(1, self.sfx_volume + delta))
             self.level.success.set_volume(self.sfx_volume)
     
+    # Modal frame protocol (see retained.py): how strongly the world behind is dimmed
+    dim_alpha = 200
+
+    def render_key(self):
+        """Everything display() depends on; the cached frame is redrawn when it changes"""
+        return (self.current_tab, self.selected, self.music_volume, self.sfx_volume)
+
     def display(self):
         if not self.is_open:
             return
         
-        # Dim background
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))
-        self.display_surface.blit(overlay, (0, 0))
-        
         # Menu background
         menu_rect = pygame.Rect(self.menu_x, self.menu_y, self.width, self.height)
         pygame.draw.rect(self.display_surface, (50, 45, 55), menu_rect, 0, 12)
         pygame.draw.rect(self.display_surface, (100, 100, 120), menu_rect, 3, 12)
         
         # Title
-        title = self.title_font.render("⚙️ Settings", False, (255, 255, 255))
+        title = render_text(self.title_font, "⚙️ Settings", False, (255, 255, 255))
         self.display_surface.blit(title, (self.menu_x + 20, self.menu_y + 15))
         
         # Tabs
@@ -160,7 +145,7 @@ class SettingsMenu:
              help_text = "← → Tabs  |  SPACE/ENTER Select  |  ESC Close"
         else:
             help_text = "← → Tabs  |  ESC Close"
-        help_surf = self.small_font.render(help_text, False, (150, 150, 150))
+        help_surf = render_text(self.small_font, help_text, False, (150, 150, 150))
         help_rect = help_surf.get_rect(midbottom=(SCREEN_WIDTH // 2, self.menu_y + self.height - 15))
         self.display_surface.blit(help_surf, help_rect)
     
@@ -179,7 +164,7 @@ class SettingsMenu:
                 pygame.draw.rect(self.display_surface, (60, 55, 65), tab_rect, 0, 6)
                 color = (150, 150, 150)
             
-            text = self.font.render(tab, False, color)
+            text = render_text(self.font, tab, False, color)
             text_rect = text.get_rect(center=tab_rect.center)
             self.display_surface.blit(text, text_rect)
     
@@ -194,7 +179,7 @@ class SettingsMenu:
                 pygame.draw.rect(self.display_surface, (70, 65, 80), opt_rect, 0, 6)
             
             color = (255, 220, 100) if is_selected else (200, 200, 200)
-            text = self.font.render(option, False, color)
+            text = render_text(self.font, option, False, color)
             self.display_surface.blit(text, (self.menu_x + 30, y + 5))
             
             # Slider
@@ -219,7 +204,7 @@ class SettingsMenu:
         
         pygame.draw.rect(self.display_surface, (100, 100, 120), bg_rect, 2, 7)
         
-        pct = self.font.render(f"{int(value * 100)}%", False, (200, 200, 200))
+        pct = render_text(self.font, f"{int(value * 100)}%", False, (200, 200, 200))
         self.display_surface.blit(pct, (slider_x + slider_width + 15, y))
     
     def _draw_controls_tab(self):
@@ -228,8 +213,8 @@ class SettingsMenu:
         col2_x = self.menu_x + 180
         
         # Header
-        header1 = self.small_font.render("KEY", False, (255, 220, 100))
-        header2 = self.small_font.render("ACTION", False, (255, 220, 100))
+        header1 = render_text(self.small_font, "KEY", False, (255, 220, 100))
+        header2 = render_text(self.small_font, "ACTION", False, (255, 220, 100))
         self.display_surface.blit(header1, (col1_x, y))
         self.display_surface.blit(header2, (col2_x, y))
         y += 25
@@ -240,15 +225,16 @@ class SettingsMenu:
         y += 10
         
         # Controls list
-        for key, action in self.controls:
+        for actions, action in self.controls:
             # Key box
-            key_surf = self.small_font.render(key, False, (255, 255, 255))
+            key = ' / '.join(pygame.key.name(k).title() for a in actions for k in input_map.keys_for(a))
+            key_surf = render_text(self.small_font, key, False, (255, 255, 255))
             key_rect = pygame.Rect(col1_x - 5, y - 2, 130, 22)
             pygame.draw.rect(self.display_surface, (60, 55, 70), key_rect, 0, 4)
             self.display_surface.blit(key_surf, (col1_x, y))
             
             # Action
-            action_surf = self.small_font.render(action, False, (200, 200, 200))
+            action_surf = render_text(self.small_font, action, False, (200, 200, 200))
             self.display_surface.blit(action_surf, (col2_x, y))
             
             y += 26
@@ -257,7 +243,7 @@ class SettingsMenu:
         y = self.menu_y + 150
         
         # Warning text
-        warning = self.font.render("WARNING: This cannot be undone!", False, (255, 100, 100))
+        warning = render_text(self.font, "WARNING: This cannot be undone!", False, (255, 100, 100))
         warning_rect = warning.get_rect(center=(self.menu_x + self.width // 2, y))
         self.display_surface.blit(warning, warning_rect)
         
@@ -270,18 +256,17 @@ class SettingsMenu:
         pygame.draw.rect(self.display_surface, (200, 80, 80), btn_rect, 0, 8)
         pygame.draw.rect(self.display_surface, (255, 255, 255), btn_rect, 2, 8)
         
-        btn_text = self.font.render("Start New Game", False, (255, 255, 255))
+        btn_text = render_text(self.font, "Start New Game", False, (255, 255, 255))
         btn_text_rect = btn_text.get_rect(center=btn_rect.center)
         self.display_surface.blit(btn_text, btn_text_rect)
 
     def _reset_game(self):
-        # Delete save
-        if os.path.exists('savegame.json'):
-            try:
-                os.remove('savegame.json')
-                print("Save deleted.")
-            except Exception as e:
-                print(f"Error deleting save: {e}")
+        # Delete save (after any background save has finished, so it cannot recreate the file)
+        try:
+            self.level.save_manager.delete_save()
+            print("Save deleted.")
+        except Exception as e:
+            print(f"Error deleting save: {e}")
         
         # Flag level for reset
         self.level.reset_pending = True
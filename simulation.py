@@ -0,0 +1,285 @@
+# Headless Simulation - Fast-forward the farm without a window or audio
+# Steps whole days on the packed soil grid from a scripted plan, for balancing crops, soil impacts and prices
+
+import argparse
+import json
+import os
+import random
+import time
+
+# settings imports pygame, whose banner would land in front of the JSON on stdout
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+
+import farm_rules
+from settings import SALE_PRICES
+from knowledge_base import CROP_DATA, FERTILIZER_DATA, IRRIGATION_DATA, INITIAL_WATER_RESERVE, MAX_WATER_RESERVE
+from learning_system import LearningSystem
+from map_data import MAP_PATH, load_map
+from rainwater import RainTank
+from soil_grid import SoilGrid, FARMABLE, WATERED, PLANTED, IS_TILLED_PLANTED
+
+
+class SimPlayer:
+    """The parts of Player the economy touches: money, inventories, the water reserve and the rain tank"""
+    def __init__(self, learning_system, money=200):
+        self.learning_system = learning_system
+        self.money = money
+        self.seed_inventory = {crop: 0 for crop in CROP_DATA}
+        self.item_inventory = {crop: 0 for crop in CROP_DATA}
+        self.fertilizer_inventory = {fert: 0 for fert in FERTILIZER_DATA}
+        self.water_reserve = INITIAL_WATER_RESERVE
+        self.base_max_water_reserve = MAX_WATER_RESERVE
+        self.water_tank_bonus = 0
+        self.rain_tank = RainTank(capacity=100)
+        self.earned = 0
+        self.spent = 0
+
+    @property
+    def max_water_reserve(self):
+        return farm_rules.max_water_reserve(self.base_max_water_reserve,
+            self.learning_system.skill_tree.get_unlocked_skills(), self.water_tank_bonus)
+
+
+class FarmSimulation:
+    """
+    One farm advanced a day at a time.
+
+    Actions (till, plant, water, fertilize, harvest, buy, sell) take tile
+    coordinates and apply the same farm_rules as SoilLayer, Player and Level
+    to the SoilGrid, SimPlayer and LearningSystem; end_day() runs the same
+    farm_rules day transition as Level.reset. Nothing here needs a display
+    or mixer.
+    """
+    def __init__(self, seed=None, map_path=MAP_PATH, irrigation='manual', water_tanks=0):
+        if seed is not None:
+            random.seed(seed)
+
+        game_map = load_map(map_path)
+        self.soil = SoilGrid(game_map.width, game_map.height)
+        self.farmable = game_map.tile_positions('Farmable')
+        for x, y in self.farmable:
+            self.soil.set(x, y, FARMABLE)
+        self.farmable.sort(key=lambda tile: (tile[1], tile[0]))
+
+        self.stages = farm_rules.crop_stages()
+        self.water_cost = IRRIGATION_DATA[irrigation]['water_cost']
+        self.learning_system = LearningSystem()
+        self.player = SimPlayer(self.learning_system)
+        self.harvested = {crop: 0 for crop in CROP_DATA}
+        self.deaths = 0
+        self.history = []
+
+        # placed water tanks raise the reserve and collect extra rain
+        self.water_tanks = water_tanks
+        for _ in range(water_tanks):
+            farm_rules.place_water_tank(self.player, self.learning_system)
+
+        self.sync_weather()
+        if self.raining:
+            farm_rules.rain(self.soil, self.learning_system)
+
+    # =========================================================================
+    # WEATHER
+    # =========================================================================
+
+    def sync_weather(self):
+        self.weather = self.learning_system.get_current_weather()
+        self.raining = self.weather == 'rain'
+
+    # =========================================================================
+    # ACTIONS (SoilLayer / Player / Menu on top of the shared farm_rules)
+    # =========================================================================
+
+    def till(self, tiles):
+        for x, y in tiles:
+            if farm_rules.till(self.soil, x, y) and self.raining:
+                farm_rules.rain(self.soil, self.learning_system)
+
+    def plant(self, tiles, crop):
+        """Use one seed per tile while seeds last (like Player.use_seed, a seed is spent even if the tile is taken)"""
+        for x, y in tiles:
+            if self.player.seed_inventory[crop] <= 0:
+                break
+            self.player.seed_inventory[crop] -= 1
+            farm_rules.plant(self.soil, self.learning_system, x, y, crop, self.stages[crop])
+
+    def water(self, tiles):
+        """Water tiles while the rain tank and reserve last (like Player.use_tool, the water is spent on any tile)"""
+        for x, y in tiles:
+            if not farm_rules.pay_water(self.player, self.water_cost):
+                break
+            farm_rules.water(self.soil, self.learning_system, x, y)
+
+    def fertilize(self, tiles, fertilizer):
+        for x, y in tiles:
+            if self.player.fertilizer_inventory[fertilizer] <= 0:
+                break
+            if farm_rules.fertilize(self.soil, self.learning_system, x, y, fertilizer):
+                self.player.fertilizer_inventory[fertilizer] -= 1
+
+    def harvest(self):
+        """Collect every ripe plant"""
+        soil = self.soil
+        planted = soil.tile_indices(soil.flags.translate(IS_TILLED_PLANTED))
+        ripe = [i for i in planted if soil.age[i] >= soil.max_age[i]]
+        for i in ripe:
+            x, y = i % soil.width, i // soil.width
+            crop = soil.get_crop(x, y)
+            amount = farm_rules.harvest(soil, self.learning_system, x, y)
+            self.player.item_inventory[crop] += amount
+            self.harvested[crop] += amount
+        return len(ripe)
+
+    def buy_seeds(self, crop, amount):
+        price = CROP_DATA[crop].get('seed_price', 5)
+        amount = min(amount, self.player.money // price)
+        self.player.seed_inventory[crop] += amount
+        self.player.money -= amount * price
+        self.player.spent += amount * price
+
+    def buy_fertilizer(self, fertilizer, amount):
+        price = FERTILIZER_DATA[fertilizer].get('cost', 10)
+        amount = min(amount, self.player.money // price)
+        self.player.fertilizer_inventory[fertilizer] += amount
+        self.player.money -= amount * price
+        self.player.spent += amount * price
+
+    def buy_water(self, needed, units=10, price=5):
+        """Buy shop-sized units of 10 water until the rain tank and reserve hold at least needed"""
+        while self.player.rain_tank.current_amount + self.player.water_reserve < needed and self.player.money >= price:
+            self.player.water_reserve += units
+            self.player.money -= price
+            self.player.spent += price
+
+    def sell(self):
+        for item, amount in self.player.item_inventory.items():
+            income = amount * SALE_PRICES.get(item, 5)
+            self.player.money += income
+            self.player.earned += income
+            self.player.item_inventory[item] = 0
+
+    # =========================================================================
+    # DAY TRANSITION (the farm_rules Level.reset runs)
+    # =========================================================================
+
+    def end_day(self):
+        learning = self.learning_system
+        result, stats = farm_rules.end_day(self.soil, learning, self.raining)
+        self.deaths += len(result.died)
+
+        self.history.append({
+            'day': learning.current_day,
+            'weather': self.weather,
+            'money': self.player.money,
+            'score': learning.total_score,
+            'day_score': learning.day_score,
+            'avg_soil_health': round(stats['avg_soil_health'], 2),
+            'planted': sum(1 for flags in self.soil.flags if flags & PLANTED),
+            'died': len(result.died),
+        })
+
+        farm_rules.start_day(learning, self.player, self.water_tanks)
+        learning.notifications.clear()
+        self.sync_weather()
+
+    def run(self, days, plan):
+        """Play plan(sim) once per day, then end the day, for the given number of days"""
+        for _ in range(days):
+            plan(self)
+            self.end_day()
+        return self.summary()
+
+    def summary(self):
+        return {
+            'days': len(self.history),
+            'money': self.player.money,
+            'earned': self.player.earned,
+            'spent': self.player.spent,
+            'score': self.learning_system.total_score,
+            'avg_soil_health': round(self.soil.average_health(), 2),
+            'harvested': self.harvested,
+            'deaths': self.deaths,
+            'achievements': sorted(self.learning_system.achievements),
+        }
+
+
+# =============================================================================
+# SCRIPTED PLANS
+# =============================================================================
+
+def make_plan(crops, plot_size=12, fertilizer=None):
+    """
+    Daily routine over the first plot_size farmable tiles: harvest and sell,
+    water dry tiles unless it rains, then replant empty tiles (each tile moves
+    on to the next crop every time it is replanted) and fertilize one of them.
+    Seeds are only bought with money left after the plot's water.
+    """
+    plantings = {}
+
+    def plan(sim):
+        plot = sim.farmable[:plot_size]
+        soil = sim.soil
+        sim.harvest()
+        sim.sell()
+        sim.till(plot)
+
+        if not sim.raining:
+            dry = [(x, y) for x, y in plot if not soil.has(x, y, WATERED)]
+            sim.buy_water(len(dry) * sim.water_cost)
+            sim.water(dry)
+
+        empty = [(x, y) for x, y in plot if not soil.has(x, y, PLANTED)]
+        for tile in empty:
+            crop = crops[plantings.get(tile, 0) % len(crops)]
+            if sim.player.seed_inventory[crop] <= 0:
+                sim.buy_seeds(crop, 1)
+            if sim.player.seed_inventory[crop] > 0:
+                plantings[tile] = plantings.get(tile, 0) + 1
+                sim.plant([tile], crop)
+
+        if fertilizer and empty:
+            sim.buy_fertilizer(fertilizer, 1)
+            sim.fertilize(empty[:1], fertilizer)
+
+    return plan
+
+
+PLANS = {
+    'monocrop': lambda: make_plan(['corn']),
+    'rotation': lambda: make_plan(list(CROP_DATA)),
+    'organic': lambda: make_plan(list(CROP_DATA), fertilizer='compost'),
+    'chemical': lambda: make_plan(['corn'], fertilizer='urea'),
+    'idle': lambda: (lambda sim: None),
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fast-forward the farm headlessly and print a JSON summary')
+    parser.add_argument('--days', type=int, default=120, help='days to simulate')
+    parser.add_argument('--plan', choices=sorted(PLANS), default='rotation')
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--runs', type=int, default=1, help='independent runs (seeds seed, seed+1, ...)')
+    parser.add_argument('--tanks', type=int, default=0, help='water tanks placed from the start')
+    parser.add_argument('--history', action='store_true', help='include the per-day history')
+    args = parser.parse_args()
+
+    results = []
+    start = time.perf_counter()
+    for run in range(args.runs):
+        seed = None if args.seed is None else args.seed + run
+        sim = FarmSimulation(seed=seed, water_tanks=args.tanks)
+        summary = sim.run(args.days, PLANS[args.plan]())
+        if args.history:
+            summary['history'] = sim.history
+        results.append(summary)
+    elapsed = time.perf_counter() - start
+
+    print(json.dumps({
+        'plan': args.plan,
+        'runs': results,
+        'days_per_second': round(args.days * args.runs / elapsed) if elapsed else None,
+    }, indent=2))
+
+
+if __name__ == '__main__':
+    main()
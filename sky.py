@@ -1,16 +1,31 @@
 import pygame 
 from settings import *
 from support import import_folder
-from sprites import Generic
-from random import randint, choice
+from map_data import load_map
+from particles import ParticlePool
+from random import randint
 
 class Sky:
+	"""
+	Day/night lighting, applied as a multiply over the finished world frame.
+
+	The tint is looked up in a table of SKY_TINT_STEPS colours running from
+	day (white) to night, so sunset and sunrise only index the table. Index 0
+	is pure white, which leaves every pixel unchanged, so daytime frames skip
+	the pass entirely. Otherwise the tint is applied with one blended fill
+	and no full-screen surface, unless light sources are registered.
+
+	Light sources are callables light(tint_surf, tint) that draw brighter
+	areas (e.g. lit windows) into the tint before it is applied.
+	"""
 	def __init__(self):
 		self.display_surface = pygame.display.get_surface()
 		self.full_surf = pygame.Surface((SCREEN_WIDTH,SCREEN_HEIGHT))
-		self.day_color = [255,255,255]  # Bright day
+		self.day_color = (255,255,255)  # Bright day
 		self.night_color = (38,101,189)  # Dark night
-		self.current_color = [255,255,255]
+		self.tints = self.build_tints(self.day_color, self.night_color, SKY_TINT_STEPS)
+		self.tint_index = 0
+		self.lights = []
 		
 		# 4-phase cycle timing (in milliseconds)
 		self.bright_day_duration = 90000   # Stay bright (1:30)
@@ -21,103 +36,139 @@ class Sky:
 		self.phase_start_time = pygame.time.get_ticks()
 		self.current_phase = 'day'  # 'day', 'sunset', 'night', 'sunrise'
 		self.night_complete = False
+
+	@staticmethod
+	def build_tints(day, night, steps):
+		"""Lookup table: tints[i] is the colour i/steps of the way from day to night"""
+		return [tuple(int(d - (d - n) * i / steps) for d, n in zip(day, night)) for i in range(steps + 1)]
+
+	@property
+	def current_color(self):
+		return self.tints[self.tint_index]
+
+	def add_light(self, light):
+		self.lights.append(light)
 	
-	def display(self, dt):
+	def update(self, dt):
+		"""Advance the day/night cycle (runs even while a menu holds the world frozen)"""
 		current_time = pygame.time.get_ticks()
 		elapsed = current_time - self.phase_start_time
+		last = len(self.tints) - 1
 		
 		if self.current_phase == 'day':
 			# BRIGHT DAY: stay at full brightness
-			self.current_color = [255, 255, 255]
+			self.tint_index = 0
 			if elapsed >= self.bright_day_duration:
 				self.current_phase = 'sunset'
 				self.phase_start_time = current_time
 		
 		elif self.current_phase == 'sunset':
 			# SUNSET: gradually darken
-			progress = min(1.0, elapsed / self.sunset_duration)
-			for index, value in enumerate(self.night_color):
-				self.current_color[index] = 255 - (255 - value) * progress
+			self.tint_index = int(last * min(1.0, elapsed / self.sunset_duration))
 			if elapsed >= self.sunset_duration:
 				self.current_phase = 'night'
 				self.phase_start_time = current_time
 		
 		elif self.current_phase == 'night':
 			# DARK NIGHT: stay dark
-			for index, value in enumerate(self.night_color):
-				self.current_color[index] = value
+			self.tint_index = last
 			if elapsed >= self.dark_night_duration:
 				self.current_phase = 'sunrise'
 				self.phase_start_time = current_time
 		
 		elif self.current_phase == 'sunrise':
 			# SUNRISE: gradually brighten
-			progress = min(1.0, elapsed / self.sunrise_duration)
-			for index, value in enumerate(self.night_color):
-				self.current_color[index] = value + (255 - value) * progress
+			self.tint_index = last - int(last * min(1.0, elapsed / self.sunrise_duration))
 			if elapsed >= self.sunrise_duration:
 				self.current_phase = 'day'
 				self.phase_start_time = current_time
 				self.night_complete = True  # Signal new day
-		
-		self.full_surf.fill(self.current_color)
-		self.display_surface.blit(self.full_surf, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
+
+	def draw(self):
+		if not self.tint_index:
+			return  # multiplying by white changes nothing
+
+		tint = self.tints[self.tint_index]
+		if not self.lights:
+			self.display_surface.fill(tint, special_flags = pygame.BLEND_RGB_MULT)
+			return
+
+		self.full_surf.fill(tint)
+		for light in self.lights:
+			light(self.full_surf, tint)
+		self.display_surface.blit(self.full_surf, (0,0), special_flags = pygame.BLEND_RGB_MULT)
 	
 	def reset_cycle(self):
 		"""Reset to start of day (called after sleeping or day transition)"""
-		self.current_color = [255, 255, 255]
+		self.tint_index = 0
 		self.phase_start_time = pygame.time.get_ticks()
 		self.current_phase = 'day'
 		self.night_complete = False
 
-class Drop(Generic):
-	def __init__(self, surf, pos, moving, groups, z):
-		
-		# general setup
-		super().__init__(pos, surf, groups, z)
-		self.lifetime = randint(400,500)
-		self.start_time = pygame.time.get_ticks()
-
-		# moving 
-		self.moving = moving
-		if self.moving:
-			self.pos = pygame.math.Vector2(self.rect.topleft)
-			self.direction = pygame.math.Vector2(-2,4)
-			self.speed = randint(200,250)
-
-	def update(self,dt):
-		# movement
-		if self.moving:
-			self.pos += self.direction * self.speed * dt
-			self.rect.topleft = (round(self.pos.x), round(self.pos.y))
-
-		# timer
-		if pygame.time.get_ticks() - self.start_time >= self.lifetime:
-			self.kill()
-
 class Rain:
+	"""
+	Rain drawn from two fixed-size particle pools (falling drops and floor
+	splashes) instead of short-lived sprites. Particles spawn at a fixed
+	rate per second around the camera view and each pool is drawn with one
+	blits() call from its layer in the camera group.
+	"""
 	def __init__(self, all_sprites):
 		self.all_sprites = all_sprites
 		self.rain_drops = import_folder('./graphics/rain/drops/')
 		self.rain_floor = import_folder('./graphics/rain/floor/')
-		self.floor_w, self.floor_h =  pygame.image.load('./graphics/world/ground.png').get_size()
-
-	def create_floor(self):
-		Drop(
-			surf = choice(self.rain_floor), 
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			moving = False, 
-			groups = self.all_sprites, 
-			z = LAYERS['rain floor'])
-
-	def create_drops(self):
-		Drop(
-			surf = choice(self.rain_drops), 
-			pos = (randint(0,self.floor_w),randint(0,self.floor_h)), 
-			moving = True, 
-			groups = self.all_sprites, 
-			z = LAYERS['rain drops'])
-
-	def update(self):
-		self.create_floor()
-		self.create_drops()
\ No newline at end of file
+		self.floor_w, self.floor_h = load_map().world_size
+		self.world_rect = pygame.Rect(0, 0, self.floor_w, self.floor_h)
+
+		# particle pools
+		self.drops = ParticlePool(RAIN_MAX_DROPS)
+		self.floor = ParticlePool(RAIN_MAX_FLOOR)
+		self.drop_direction = pygame.math.Vector2(-2,4)
+		self.drop_spawn = 0.0
+		self.floor_spawn = 0.0
+
+		all_sprites.add_layer_renderer(LAYERS['rain floor'], self.draw_floor)
+		all_sprites.add_layer_renderer(LAYERS['rain drops'], self.draw_drops)
+
+	def spawn_area(self):
+		area = self.all_sprites.view_rect.inflate(RAIN_SPAWN_MARGIN, RAIN_SPAWN_MARGIN).clip(self.world_rect)
+		return area if area.width and area.height else self.world_rect
+
+	def create_floor(self, area):
+		self.floor.spawn(
+			x = randint(area.left, area.right),
+			y = randint(area.top, area.bottom),
+			lifetime = randint(400,500) / 1000,
+			frame = randint(0, len(self.rain_floor) - 1))
+
+	def create_drops(self, area):
+		self.drops.spawn(
+			x = randint(area.left, area.right),
+			y = randint(area.top, area.bottom),
+			lifetime = randint(400,500) / 1000,
+			frame = randint(0, len(self.rain_drops) - 1),
+			speed = randint(200,250))
+
+	def update(self, dt, raining = True):
+		# existing particles always finish their lifetime
+		self.drops.update(dt, self.drop_direction)
+		self.floor.update(dt)
+
+		if not raining:
+			self.drop_spawn = self.floor_spawn = 0.0
+			return
+
+		area = self.spawn_area()
+		self.drop_spawn += RAIN_DROP_RATE * dt
+		self.floor_spawn += RAIN_FLOOR_RATE * dt
+		while self.drop_spawn >= 1:
+			self.drop_spawn -= 1
+			self.create_drops(area)
+		while self.floor_spawn >= 1:
+			self.floor_spawn -= 1
+			self.create_floor(area)
+
+	def draw_floor(self, surface, offset):
+		surface.blits(self.floor.blit_sequence(self.rain_floor, offset), False)
+
+	def draw_drops(self, surface, offset):
+		surface.blits(self.drops.blit_sequence(self.rain_drops, offset), False)
@@ -1,12 +1,43 @@
 import pygame
 from settings import *
-from pytmx.util_pygame import load_pygame
+from map_data import load_map
 from support import *
+from assets import assets
 from random import choice
+from spatial_hash import refresh_hitbox
+import farm_rules
+from soil_grid import SoilGrid, FARMABLE, TILLED, WATERED, PLANTED, IS_TILLED, CROP_IDS, CROP_NAMES
 from knowledge_base import CROP_DATA, SOIL_IMPACTS, INITIAL_SOIL_HEALTH, MIN_SOIL_HEALTH, MAX_SOIL_HEALTH
 
+def tile_of(pos):
+	"""Grid coordinates (x, y) of the tile containing a world position"""
+	return (int(pos[0] // TILE_SIZE), int(pos[1] // TILE_SIZE))
+
+class TileGroup(pygame.sprite.Group):
+	"""
+	Sprite group with an index from grid coordinates (x, y) to its sprite.
+	Members set self.tile before joining their groups; kill() and empty()
+	keep the index in sync.
+	"""
+	def __init__(self):
+		super().__init__()
+		self.tiles = {}
+
+	def add_internal(self, sprite, layer = None):
+		super().add_internal(sprite)
+		self.tiles[sprite.tile] = sprite
+
+	def remove_internal(self, sprite):
+		super().remove_internal(sprite)
+		if self.tiles.get(sprite.tile) is sprite:
+			del self.tiles[sprite.tile]
+
+	def get(self, tile):
+		return self.tiles.get(tile)
+
 class SoilTile(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups):
+		self.tile = tile_of(pos)
 		super().__init__(groups)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
@@ -14,56 +45,76 @@ class SoilTile(pygame.sprite.Sprite):
 
 class WaterTile(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups):
+		self.tile = tile_of(pos)
 		super().__init__(groups)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
 		self.z = LAYERS['soil water']
 
 class DripEmitter(pygame.sprite.Sprite):
-	"""Drip irrigation emitter placed on soil tiles"""
+	"""Drip irrigation emitter placed on soil tiles (indexed by its top-left tile)"""
 	def __init__(self, pos, surf, groups):
+		self.tile = tile_of(pos)
 		super().__init__(groups)
 		self.image = surf
 		self.rect = self.image.get_rect(topleft = pos)
 		self.z = LAYERS['ground plant']  # Same layer as plants so it overlays nicely
 
 class Plant(pygame.sprite.Sprite):
-	def __init__(self, plant_type, groups, soil, check_watered):
+	"""Crop sprite; its growth state lives in the soil grid arrays and is stepped by SoilGrid.day_tick"""
+	def __init__(self, plant_type, groups, soil, grid):
+		self.tile = soil.tile
 		super().__init__(groups)
 		
 		# setup
 		self.soil = soil
-		self.check_watered = check_watered
+		self.grid = grid
+		self.index = grid.index(*soil.tile)
 		
 		# Growth attributes
 		self.plant_type = plant_type
 		self.frames = import_folder(f'./graphics/fruit/{plant_type}')
 		self.age = 0
 		self.max_age = len(self.frames) - 1
+		grid.max_age[self.index] = self.max_age
 		self.grow_speed = GROW_SPEED[plant_type]
 		self.harvestable = False
 		self.unwatered_days = 0
 
 		# sprite setup
-		self.image = self.frames[self.age]
+		self.image = self.frames[int(self.age)]
 		self.y_offset = -16 if plant_type == 'corn' else -8
 		self.rect = self.image.get_rect(midbottom = soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
 		self.z = LAYERS['ground plant']
 
-	def grow(self):
-		if self.check_watered(self.rect.center):
-			self.age += self.grow_speed
+	@property
+	def age(self):
+		return self.grid.age[self.index]
+
+	@age.setter
+	def age(self, value):
+		self.grid.age[self.index] = value
 
-			if int(self.age) > 0:
-				self.z = LAYERS['main']
-				self.hitbox = self.rect.copy().inflate(-26,-self.rect.height * 0.4)
+	@property
+	def unwatered_days(self):
+		return self.grid.unwatered[self.index]
 
-			if self.age >= self.max_age:
-				self.age = self.max_age
-				self.harvestable = True
+	@unwatered_days.setter
+	def unwatered_days(self, value):
+		self.grid.unwatered[self.index] = min(255, value)
 
-			self.image = self.frames[int(self.age)]
-			self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
+	def update_stage(self):
+		"""Sync image, layer and hitbox with the growth stage after the age changed"""
+		if int(self.age) > 0:
+			self.z = LAYERS['main']
+			self.hitbox = self.rect.copy().inflate(-26,-self.rect.height * 0.4)
+			refresh_hitbox(self)
+
+		if self.age >= self.max_age:
+			self.harvestable = True
+
+		self.image = self.frames[int(self.age)]
+		self.rect = self.image.get_rect(midbottom = self.soil.rect.midbottom + pygame.math.Vector2(0,self.y_offset))
 
 class SoilLayer:
 	def __init__(self, all_sprites, collision_sprites):
@@ -71,10 +122,11 @@ class SoilLayer:
 		# sprite groups
 		self.all_sprites = all_sprites
 		self.collision_sprites = collision_sprites
-		self.soil_sprites = pygame.sprite.Group()
-		self.water_sprites = pygame.sprite.Group()
-		self.plant_sprites = pygame.sprite.Group()
-		self.drip_sprites = pygame.sprite.Group()  # FEATURE: Drip Emitters
+		# tile-indexed groups: group.get((x, y)) finds the sprite on a tile
+		self.soil_sprites = TileGroup()
+		self.water_sprites = TileGroup()
+		self.plant_sprites = TileGroup()
+		self.drip_sprites = TileGroup()  # FEATURE: Drip Emitters
 
 		# graphics
 		self.soil_surfs = import_folder_dict('./graphics/soil/')
@@ -111,107 +163,81 @@ class SoilLayer:
 			pygame.draw.circle(self.drip_surf, (50, 50, 50), center, 6, 1)
 
 		self.create_soil_grid()
-		self.create_hit_rects()
+		self.crop_stages = farm_rules.crop_stages()
 		
 		# Learning system reference (will be set by Level)
 		self.learning_system = None
 
 		# sounds
-		self.hoe_sound = pygame.mixer.Sound('./audio/hoe.wav')
+		self.hoe_sound = assets.sound('./audio/hoe.wav')
 		self.hoe_sound.set_volume(0.1)
 
-		self.plant_sound = pygame.mixer.Sound('./audio/plant.wav') 
+		self.plant_sound = assets.sound('./audio/plant.wav') 
 		self.plant_sound.set_volume(0.2)
 
 	def create_soil_grid(self):
-		ground = pygame.image.load('./graphics/world/ground.png')
-		h_tiles, v_tiles = ground.get_width() // TILE_SIZE, ground.get_height() // TILE_SIZE
+		game_map = load_map()
+		h_tiles, v_tiles = game_map.width, game_map.height
 		
 		# Store dimensions for other grids
 		self.grid_width = h_tiles
 		self.grid_height = v_tiles
 		
-		# Original grid for tile states
-		self.grid = [[[] for col in range(h_tiles)] for row in range(v_tiles)]
-		
-		# DATA STRUCTURE: 2D ARRAY - Soil Health Grid
-		# Tracks soil health (0-100) per tile for consequence-based gameplay
-		self.soil_health_grid = [[INITIAL_SOIL_HEALTH for col in range(h_tiles)] for row in range(v_tiles)]
-		
-		# 2D Array - Water Count Grid (for over-watering detection)
-		self.water_count_grid = [[0 for col in range(h_tiles)] for row in range(v_tiles)]
-		
-		# 2D Array - Last Crop Grid (for monocropping detection)
-		self.last_crop_grid = [[None for col in range(h_tiles)] for row in range(v_tiles)]
+		# DATA STRUCTURE: ARRAY - packed soil state
+		# Tile flags (bitfield), soil health (0-100), water count, last crop and drip emitters
+		# live in flat typed arrays; grid[y][x] and the *_grid attributes are views over them
+		self.soil = SoilGrid(h_tiles, v_tiles)
 		
-		# 2D Array - Drip Emitter Grid (tracks placed emitters)
-		self.drip_emitter_grid = [[False for col in range(h_tiles)] for row in range(v_tiles)]
-		
-		for x, y, _ in load_pygame('./data/map.tmx').get_layer_by_name('Farmable').tiles():
-			self.grid[y][x].append('F')
-
-	def create_hit_rects(self):
-		self.hit_rects = []
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'F' in cell:
-					x = index_col * TILE_SIZE
-					y = index_row * TILE_SIZE
-					rect = pygame.Rect(x,y,TILE_SIZE, TILE_SIZE)
-					self.hit_rects.append(rect)
+		for x, y in game_map.tile_positions('Farmable'):
+			self.soil.set(x, y, FARMABLE)
 
-	def get_hit(self, point):
-		for rect in self.hit_rects:
-			if rect.collidepoint(point):
-				self.hoe_sound.play()
+	# compatibility views: grid[y][x] and the old per-tile 2D arrays
+	@property
+	def grid(self):
+		return self.soil.cells
+
+	@property
+	def soil_health_grid(self):
+		return self.soil.view('health')
+
+	@property
+	def water_count_grid(self):
+		return self.soil.view('water_count')
+
+	@property
+	def last_crop_grid(self):
+		return self.soil.view('crop', CROP_NAMES.__getitem__, lambda name: CROP_IDS.get(name, 0))
 
-				x = rect.x // TILE_SIZE
-				y = rect.y // TILE_SIZE
+	@property
+	def drip_emitter_grid(self):
+		return self.soil.view('emitter', bool, int)
 
-				if 'F' in self.grid[y][x]:
-					self.grid[y][x].append('X')
-					self.create_soil_tiles()
-					if self.raining:
-						self.water_all()
+	def in_grid(self, tile):
+		x, y = tile
+		return 0 <= x < self.grid_width and 0 <= y < self.grid_height
+
+	def get_hit(self, point):
+		x, y = tile = tile_of(point)
+		if self.in_grid(tile) and self.soil.has(x, y, FARMABLE):
+			self.hoe_sound.play()
+			if farm_rules.till(self.soil, x, y):
+				self.update_soil_tiles_around(x, y)
+				if self.raining:
+					self.water_all()
 
 	def water(self, target_pos):
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
-
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-				self.grid[y][x].append('W')
-				
-				# Track water count for this tile (for over-watering detection)
-				self.water_count_grid[y][x] += 1
-				
-				# Check for over-watering consequence
-				if self.learning_system and self.water_count_grid[y][x] > 2:
-					self.apply_soil_impact(x, y, 'over_water')
-					self.learning_system.overwatered_today = True
-				elif self.learning_system and self.water_count_grid[y][x] == 1:
-					# First water of the day - could be correct watering
-					pass  # Evaluation happens at end of day
-
-				pos = soil_sprite.rect.topleft
-				surf = choice(self.water_surfs)
-				WaterTile(pos, surf, [self.all_sprites, self.water_sprites])
-				
-				if self.learning_system:
-					self.learning_system.watered_today = True
+		soil_sprite = self.soil_sprites.get(tile_of(target_pos))
+		if soil_sprite:
+			farm_rules.water(self.soil, self.learning_system, *soil_sprite.tile)
+
+			pos = soil_sprite.rect.topleft
+			surf = choice(self.water_surfs)
+			WaterTile(pos, surf, [self.all_sprites, self.water_sprites])
 
 	def water_all(self):
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'X' in cell and 'W' not in cell:
-					cell.append('W')
-					x = index_col * TILE_SIZE
-					y = index_row * TILE_SIZE
-					WaterTile((x,y), choice(self.water_surfs), [self.all_sprites, self.water_sprites])
-		
-		# Rain counts as watering
-		if self.learning_system:
-			self.learning_system.watered_today = True
+		# one bulk pass over the flags; sprites only for tiles that were still dry
+		for x, y in farm_rules.rain(self.soil, self.learning_system):
+			WaterTile((x * TILE_SIZE, y * TILE_SIZE), choice(self.water_surfs), [self.all_sprites, self.water_sprites])
 
 	def remove_water(self):
 
@@ -220,55 +246,33 @@ class SoilLayer:
 			sprite.kill()
 
 		# clean up the grid
-		for row in self.grid:
-			for cell in row:
-				if 'W' in cell:
-					cell.remove('W')
+		self.soil.clear_water()
 
 	def check_watered(self, pos):
-		x = pos[0] // TILE_SIZE
-		y = pos[1] // TILE_SIZE
-		cell = self.grid[y][x]
-		is_watered = 'W' in cell
-		return is_watered
+		x = int(pos[0] // TILE_SIZE)
+		y = int(pos[1] // TILE_SIZE)
+		return self.soil.has(x, y, WATERED)
 
 	def plant_seed(self, target_pos, seed):
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
-				self.plant_sound.play()
-
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-
-				if 'P' not in self.grid[y][x]:
-					# Check for monocropping (same crop planted repeatedly)
-					last_crop = self.last_crop_grid[y][x]
-					if self.learning_system:
-						if last_crop and last_crop == seed:
-							# Monocropping penalty
-							self.apply_soil_impact(x, y, 'monocrop')
-						elif last_crop and last_crop != seed:
-							# Crop rotation bonus
-							self.apply_soil_impact(x, y, 'rotation')
-							self.learning_system.rotation_count += 1
-					
-					# Update last crop for this tile
-					self.last_crop_grid[y][x] = seed
-					
-					self.grid[y][x].append('P')
-					Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.check_watered)
+		soil_sprite = self.soil_sprites.get(tile_of(target_pos))
+		if soil_sprite:
+			self.plant_sound.play()
+
+			x, y = soil_sprite.tile
+
+			if farm_rules.plant(self.soil, self.learning_system, x, y, seed, self.crop_stages[seed]):
+				Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.soil)
 
 	def _force_plant(self, soil_sprite, seed, age, harvestable, unwatered_days=0):
 		"""Force create a plant at specific stage (for loading saves)"""
-		x = soil_sprite.rect.x // TILE_SIZE
-		y = soil_sprite.rect.y // TILE_SIZE
+		x, y = soil_sprite.tile
 		
-		# Ensure P flag is present
-		if 'P' not in self.grid[y][x]:
-			self.grid[y][x].append('P')
+		# Ensure P flag is present and the tile knows its crop (drives growth speed)
+		self.soil.set(x, y, PLANTED)
+		self.soil.set_crop(x, y, seed)
 		
 		# Create plant
-		plant = Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.check_watered)
+		plant = Plant(seed, [self.all_sprites, self.plant_sprites, self.collision_sprites], soil_sprite, self.soil)
 		plant.age = age
 		plant.harvestable = harvestable
 		
@@ -279,148 +283,160 @@ class SoilLayer:
 		if int(plant.age) > 0:
 			plant.z = LAYERS['main']
 			plant.hitbox = plant.rect.copy().inflate(-26,-plant.rect.height * 0.4)
+			refresh_hitbox(plant)
 		
 		plant.unwatered_days = unwatered_days
 		return plant
 
-	def update_plants(self):
-		for plant in self.plant_sprites.sprites():
-			# Check watering status before growing
-			is_watered = self.check_watered(plant.rect.center)
-			
-			if is_watered:
-				plant.unwatered_days = 0
-				plant.grow()
-			else:
-				plant.unwatered_days += 1
-				# Crop death logic (2 days without water)
-				if plant.unwatered_days >= 2:
-					# Clean up grid
-					x = plant.rect.centerx // TILE_SIZE
-					y = plant.rect.centery // TILE_SIZE
-					if 'P' in self.grid[y][x]:
-						self.grid[y][x].remove('P')
-					
-					# Kill plant
-					plant.kill()
+	def apply_day(self, result):
+		"""Sync plant and water sprites with a night's farm_rules.end_day result"""
+		# plants
+		for tile in result.grown:
+			plant = self.plant_sprites.get(tile)
+			if plant:
+				plant.update_stage()
+		for tile in result.died:
+			plant = self.plant_sprites.get(tile)
+			if plant:
+				plant.kill()
+
+		# soil
+		for sprite in self.water_sprites.sprites():
+			sprite.kill()
+		for x, y in result.rained:
+			WaterTile((x * TILE_SIZE, y * TILE_SIZE), choice(self.water_surfs), [self.all_sprites, self.water_sprites])
+
+	def is_tilled(self, x, y):
+		return 0 <= x < self.grid_width and 0 <= y < self.grid_height and self.soil.has(x, y, TILLED)
+
+	def get_soil_tile_type(self, x, y):
+		"""Autotile variant for a tilled cell, based on its four neighbours"""
+		# tile options 
+		t = self.is_tilled(x, y - 1)
+		b = self.is_tilled(x, y + 1)
+		r = self.is_tilled(x + 1, y)
+		l = self.is_tilled(x - 1, y)
+
+		tile_type = 'o'
+
+		# all sides
+		if all((t,r,b,l)): tile_type = 'x'
+
+		# horizontal tiles only
+		if l and not any((t,r,b)): tile_type = 'r'
+		if r and not any((t,l,b)): tile_type = 'l'
+		if r and l and not any((t,b)): tile_type = 'lr'
+
+		# vertical only 
+		if t and not any((r,l,b)): tile_type = 'b'
+		if b and not any((r,l,t)): tile_type = 't'
+		if b and t and not any((r,l)): tile_type = 'tb'
+
+		# corners 
+		if l and b and not any((t,r)): tile_type = 'tr'
+		if r and b and not any((t,l)): tile_type = 'tl'
+		if l and t and not any((b,r)): tile_type = 'br'
+		if r and t and not any((b,l)): tile_type = 'bl'
+
+		# T shapes
+		if all((t,b,r)) and not l: tile_type = 'tbr'
+		if all((t,b,l)) and not r: tile_type = 'tbl'
+		if all((l,r,t)) and not b: tile_type = 'lrb'
+		if all((l,r,b)) and not t: tile_type = 'lrt'
+
+		return tile_type
+
+	def update_soil_tile(self, x, y):
+		"""Create, re-skin or remove the soil sprite of one cell to match the grid"""
+		sprite = self.soil_sprites.get((x, y))
+		if not self.is_tilled(x, y):
+			if sprite:
+				sprite.kill()
+			return
+
+		surf = self.soil_surfs[self.get_soil_tile_type(x, y)]
+		if sprite:
+			sprite.image = surf
+		else:
+			SoilTile(
+				pos = (x * TILE_SIZE, y * TILE_SIZE), 
+				surf = surf, 
+				groups = [self.all_sprites, self.soil_sprites])
+
+	def update_soil_tiles_around(self, x, y):
+		"""Incremental autotiling: only a changed cell and its neighbours can change variant"""
+		for tile_x, tile_y in ((x, y), (x, y - 1), (x, y + 1), (x - 1, y), (x + 1, y)):
+			self.update_soil_tile(tile_x, tile_y)
 
 	def create_soil_tiles(self):
-		self.soil_sprites.empty()
-		for index_row, row in enumerate(self.grid):
-			for index_col, cell in enumerate(row):
-				if 'X' in cell:
-					
-					# tile options 
-					t = 'X' in self.grid[index_row - 1][index_col]
-					b = 'X' in self.grid[index_row + 1][index_col]
-					r = 'X' in row[index_col + 1]
-					l = 'X' in row[index_col - 1]
-
-					tile_type = 'o'
-
-					# all sides
-					if all((t,r,b,l)): tile_type = 'x'
-
-					# horizontal tiles only
-					if l and not any((t,r,b)): tile_type = 'r'
-					if r and not any((t,l,b)): tile_type = 'l'
-					if r and l and not any((t,b)): tile_type = 'lr'
-
-					# vertical only 
-					if t and not any((r,l,b)): tile_type = 'b'
-					if b and not any((r,l,t)): tile_type = 't'
-					if b and t and not any((r,l)): tile_type = 'tb'
-
-					# corners 
-					if l and b and not any((t,r)): tile_type = 'tr'
-					if r and b and not any((t,l)): tile_type = 'tl'
-					if l and t and not any((b,r)): tile_type = 'br'
-					if r and t and not any((b,l)): tile_type = 'bl'
-
-					# T shapes
-					if all((t,b,r)) and not l: tile_type = 'tbr'
-					if all((t,b,l)) and not r: tile_type = 'tbl'
-					if all((l,r,t)) and not b: tile_type = 'lrb'
-					if all((l,r,b)) and not t: tile_type = 'lrt'
-
-					SoilTile(
-						pos = (index_col * TILE_SIZE,index_row * TILE_SIZE), 
-						surf = self.soil_surfs[tile_type], 
-						groups = [self.all_sprites, self.soil_sprites])
+		"""Bulk pass rebuilding every soil sprite from the grid (used after loading a save)"""
+		for sprite in self.soil_sprites.sprites():
+			sprite.kill()
+		for x, y in self.soil.tiles(self.soil.flags.translate(IS_TILLED)):
+			self.update_soil_tile(x, y)
+
+	def create_drip_emitters(self):
+		"""Rebuild one DripEmitter per 2x2 block of the emitter array (used after loading a save)"""
+		for sprite in self.drip_sprites.sprites():
+			sprite.kill()
+		# blocks never overlap, so in row-major order the first unclaimed tile is a block's top-left
+		claimed = set()
+		for x, y in self.soil.tiles(self.soil.emitter):
+			if (x, y) in claimed:
+				continue
+			claimed.update(((x, y), (x + 1, y), (x, y + 1), (x + 1, y + 1)))
+			DripEmitter(
+				pos=(x * TILE_SIZE, y * TILE_SIZE),
+				surf=self.drip_surf,
+				groups=[self.all_sprites, self.drip_sprites]
+			)
 
 	# =========================================================================
 	# LEARNING SYSTEM HELPER METHODS
 	# =========================================================================
 	
-	def apply_soil_impact(self, x, y, impact_type):
-		"""Apply soil health change and log to learning system"""
-		impact = SOIL_IMPACTS.get(impact_type, {})
-		soil_change = impact.get('soil', 0)
-		
-		# Update soil health (clamped to 0-100)
-		self.soil_health_grid[y][x] = max(MIN_SOIL_HEALTH, 
-			min(MAX_SOIL_HEALTH, self.soil_health_grid[y][x] + soil_change))
-		
-		# Log to learning system
-		if self.learning_system:
-			self.learning_system.log_action(impact_type)
-	
 	def get_average_soil_health(self):
 		"""Calculate average soil health across all farmable tiles"""
-		total_health = 0
-		tile_count = 0
-		for row_idx, row in enumerate(self.grid):
-			for col_idx, cell in enumerate(row):
-				if 'F' in cell:  # Only count farmable tiles
-					total_health += self.soil_health_grid[row_idx][col_idx]
-					tile_count += 1
-		return total_health / tile_count if tile_count > 0 else INITIAL_SOIL_HEALTH
+		return self.soil.average_health(INITIAL_SOIL_HEALTH)
 	
 	def get_tile_soil_health(self, pos):
 		"""Get soil health at a specific position"""
 		x = int(pos[0] // TILE_SIZE)
 		y = int(pos[1] // TILE_SIZE)
 		if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-			return self.soil_health_grid[y][x]
+			return self.soil.health[self.soil.index(x, y)]
 		return INITIAL_SOIL_HEALTH
 	
 	def place_drip_emitter(self, target_pos):
 		"""Place a drip emitter covering 2x2 soil tiles"""
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-				
-				# Check bounds for 2x2 area
-				if x + 1 >= self.grid_width or y + 1 >= self.grid_height:
-					return False
-				
-				# Check if all 4 tiles are farmable soil ('F')
-				if ('F' not in self.grid[y][x] or 
-					'F' not in self.grid[y][x+1] or 
-					'F' not in self.grid[y+1][x] or 
-					'F' not in self.grid[y+1][x+1]):
-					return False
-				
-				# Check if area is clear of existing emitters
-				if (self.drip_emitter_grid[y][x] or 
-					self.drip_emitter_grid[y][x+1] or 
-					self.drip_emitter_grid[y+1][x] or 
-					self.drip_emitter_grid[y+1][x+1]):
-					return False
-				
-				# Place emitter
-				self.drip_emitter_grid[y][x] = True
-				self.drip_emitter_grid[y][x+1] = True
-				self.drip_emitter_grid[y+1][x] = True
-				self.drip_emitter_grid[y+1][x+1] = True
-				
-				DripEmitter(
-					pos=(soil_sprite.rect.x, soil_sprite.rect.y),
-					surf=self.drip_surf,
-					groups=[self.all_sprites, self.drip_sprites]
-				)
-				return True
+		soil_sprite = self.soil_sprites.get(tile_of(target_pos))
+		if soil_sprite:
+			x, y = soil_sprite.tile
+			
+			# Check bounds for 2x2 area
+			if x + 1 >= self.grid_width or y + 1 >= self.grid_height:
+				return False
+			
+			area = [self.soil.index(x, y), self.soil.index(x + 1, y), self.soil.index(x, y + 1), self.soil.index(x + 1, y + 1)]
+			
+			# Check if all 4 tiles are farmable soil ('F')
+			if not all(self.soil.flags[i] & FARMABLE for i in area):
+				return False
+			
+			# Check if area is clear of existing emitters
+			if any(self.soil.emitter[i] for i in area):
+				return False
+			
+			# Place emitter
+			for i in area:
+				self.soil.emitter[i] = 1
+			
+			DripEmitter(
+				pos=(soil_sprite.rect.x, soil_sprite.rect.y),
+				surf=self.drip_surf,
+				groups=[self.all_sprites, self.drip_sprites]
+			)
+			return True
 		return False
 	
 	def has_drip_emitter(self, pos):
@@ -428,76 +444,15 @@ class SoilLayer:
 		x = int(pos[0] // TILE_SIZE)
 		y = int(pos[1] // TILE_SIZE)
 		if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
-			return self.drip_emitter_grid[y][x]
+			return bool(self.soil.emitter[self.soil.index(x, y)])
 		return False
 	
-	def calculate_yield_modifier(self, pos):
-		"""Calculate yield modifier based on soil health at position"""
-		health = self.get_tile_soil_health(pos)
-		return health / 50.0  # 50 = 100% yield, 100 = 200%, 0 = 0%
-	
-	def reset_daily_water_counts(self):
-		"""Reset water counts at end of day and evaluate watering"""
-		for row_idx in range(self.grid_height):
-			for col_idx in range(self.grid_width):
-				water_count = self.water_count_grid[row_idx][col_idx]
-				
-				# Only evaluate tiles that were worked on
-				if 'X' in self.grid[row_idx][col_idx]:
-					if water_count == 1 or water_count == 2:
-						# Correct watering
-						if self.learning_system:
-							self.apply_soil_impact(col_idx, row_idx, 'correct_water')
-					elif water_count == 0 and 'P' in self.grid[row_idx][col_idx]:
-						# Under-watering (planted but not watered), UNLESS it's raining
-						if self.learning_system and not self.raining:
-							self.apply_soil_impact(col_idx, row_idx, 'under_water')
-				
-				# Reset water count
-				self.water_count_grid[row_idx][col_idx] = 0
-	
 	def apply_fertilizer(self, target_pos, fertilizer_type):
 		"""
 		Apply fertilizer to a soil tile.
 		Returns True if successful, False otherwise.
 		"""
-		from knowledge_base import FERTILIZER_DATA
-		
-		for soil_sprite in self.soil_sprites.sprites():
-			if soil_sprite.rect.collidepoint(target_pos):
-				x = soil_sprite.rect.x // TILE_SIZE
-				y = soil_sprite.rect.y // TILE_SIZE
-				
-				# Get fertilizer effects
-				fert_data = FERTILIZER_DATA.get(fertilizer_type, {})
-				soil_effect = fert_data.get('soil_effect', 0)
-				score_effect = fert_data.get('score_effect', 0)
-				
-				# Apply soil health change
-				self.soil_health_grid[y][x] = max(MIN_SOIL_HEALTH,
-					min(MAX_SOIL_HEALTH, self.soil_health_grid[y][x] + soil_effect))
-				
-				# Log to learning system
-				if self.learning_system:
-					bonus_score = 0
-					bonus_msg = ""
-					
-					# Check for Plant and Bonus
-					if 'P' in self.grid[y][x]:
-						current_crop = self.last_crop_grid[y][x]
-						best_for = fert_data.get('best_for', [])
-						if current_crop in best_for:
-							bonus_score = 5
-							bonus_msg = f" Perfect for {current_crop.capitalize()}! (+{bonus_score})"
-					
-					if fertilizer_type == 'organic':
-						self.learning_system.log_action('organic_fert', f'+{soil_effect} soil')
-						self.learning_system.add_notification(f"🌿 Organic fertilizer applied{bonus_msg}")
-					else:
-						self.learning_system.log_action('chemical_fert', f'{soil_effect} soil')
-						self.learning_system.add_notification(f"⚗️ Chemical fertilizer applied{bonus_msg}")
-					
-					self.learning_system.total_score += score_effect + bonus_score
-				
-				return True
+		soil_sprite = self.soil_sprites.get(tile_of(target_pos))
+		if soil_sprite:
+			return farm_rules.fertilize(self.soil, self.learning_system, *soil_sprite.tile, fertilizer_type)
 		return False
\ No newline at end of file
@@ -0,0 +1,414 @@
+# Soil Grid - Compact per-tile soil state in flat typed arrays
+# Flags are a bitfield per tile; whole-farm passes run as byte-level bulk operations
+
+from array import array
+from itertools import compress
+from knowledge_base import CROP_DATA, SOIL_IMPACTS, INITIAL_SOIL_HEALTH, MIN_SOIL_HEALTH, MAX_SOIL_HEALTH
+from settings import GROW_SPEED
+
+# Tile flag bits (one byte per tile)
+FARMABLE = 1  # 'F'
+TILLED = 2    # 'X'
+WATERED = 4   # 'W'
+PLANTED = 8   # 'P'
+
+FLAG_BITS = {'F': FARMABLE, 'X': TILLED, 'W': WATERED, 'P': PLANTED}
+
+# Crop ids stored per tile; 0 means no crop
+CROP_NAMES = [None] + list(CROP_DATA)
+CROP_IDS = {name: index for index, name in enumerate(CROP_NAMES)}
+CROP_GROW_SPEED = [GROW_SPEED.get(name, 0) for name in CROP_NAMES]
+
+
+def byte_table(predicate):
+    """Translation table mapping every byte value b to 1 if predicate(b) else 0"""
+    return bytes(1 if predicate(b) else 0 for b in range(256))
+
+
+def and_masks(a, b):
+    """Element-wise AND of two equal-length 0/1 masks, done as one big-int operation"""
+    return (int.from_bytes(a, 'little') & int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+def or_masks(a, b):
+    """Element-wise OR of two equal-length 0/1 masks"""
+    return (int.from_bytes(a, 'little') | int.from_bytes(b, 'little')).to_bytes(len(a), 'little')
+
+
+# Precomputed tables for bulk passes
+IS_FARMABLE = byte_table(lambda b: b & FARMABLE)
+IS_TILLED = byte_table(lambda b: b & TILLED)
+IS_TILLED_PLANTED = byte_table(lambda b: b & (TILLED | PLANTED) == TILLED | PLANTED)
+IS_TILLED_DRY = byte_table(lambda b: b & (TILLED | WATERED) == TILLED)
+WATER_TILLED = bytes(b | WATERED if b & TILLED else b for b in range(256))
+CLEAR_WATERED = bytes(b & ~WATERED for b in range(256))
+IS_ZERO = byte_table(lambda b: b == 0)
+IS_ONE_OR_TWO = byte_table(lambda b: b in (1, 2))
+IS_ACTIVE = byte_table(lambda b: b & (TILLED | PLANTED))
+IS_WORKED = byte_table(lambda b: b & ~FARMABLE)
+IS_NONZERO = byte_table(lambda b: b != 0)
+KEEP_FARMABLE = bytes(b & FARMABLE for b in range(256))
+
+# Per-tile arrays and their array typecodes, in save order
+TILE_FIELDS = (
+    ('flags', 'B'), ('health', 'h'), ('water_count', 'B'), ('crop', 'B'),
+    ('emitter', 'B'), ('age', 'd'), ('max_age', 'B'), ('unwatered', 'B'),
+)
+
+
+class DayResult:
+    """What one day tick changed, for the caller to sync sprites and logs"""
+    __slots__ = ('verdicts', 'grown', 'died', 'rained')
+
+    def __init__(self):
+        self.verdicts = {'correct_water': 0, 'under_water': 0}  # impact type -> tiles
+        self.grown = []   # (x, y) tiles whose plant grew
+        self.died = []    # (x, y) tiles whose plant died of thirst
+        self.rained = []  # (x, y) tiles watered by the next day's rain
+
+
+class SoilGrid:
+    """
+    Soil state for the whole farm, one slot per tile in row-major order.
+
+    Data Structure: ARRAY (structure of arrays, index = y * width + x)
+    flags       bytearray  bitfield of FARMABLE / TILLED / WATERED / PLANTED
+    health      array('h') soil health 0-100
+    water_count bytearray  waterings today (saturates at 255)
+    crop        bytearray  id of the last crop planted (index into CROP_NAMES)
+    emitter     bytearray  1 where a drip emitter covers the tile
+    age         array('d') growth stage of the plant on the tile
+    max_age     bytearray  last growth stage of that plant
+    unwatered   bytearray  days that plant has gone without water
+    """
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        size = width * height
+        self.flags = bytearray(size)
+        self.health = array('h', [INITIAL_SOIL_HEALTH]) * size
+        self.water_count = bytearray(size)
+        self.crop = bytearray(size)
+        self.emitter = bytearray(size)
+        self.age = array('d', [0.0]) * size
+        self.max_age = bytearray(size)
+        self.unwatered = bytearray(size)
+
+    def __len__(self):
+        return len(self.flags)
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    # ---- single tile access ----
+
+    def has(self, x, y, bit):
+        return bool(self.flags[y * self.width + x] & bit)
+
+    def set(self, x, y, bit):
+        self.flags[y * self.width + x] |= bit
+
+    def clear(self, x, y, bit):
+        self.flags[y * self.width + x] &= ~bit
+
+    def add_water(self, x, y):
+        """Count one watering on a tile and return the new count"""
+        i = y * self.width + x
+        self.water_count[i] = min(255, self.water_count[i] + 1)
+        return self.water_count[i]
+
+    def change_health(self, x, y, delta):
+        """Add delta to a tile's soil health, clamped to the valid range"""
+        i = y * self.width + x
+        self.health[i] = max(MIN_SOIL_HEALTH, min(MAX_SOIL_HEALTH, self.health[i] + delta))
+
+    def get_crop(self, x, y):
+        return CROP_NAMES[self.crop[y * self.width + x]]
+
+    def set_crop(self, x, y, name):
+        self.crop[y * self.width + x] = CROP_IDS.get(name, 0)
+
+    # ---- whole-farm passes ----
+
+    def tile_indices(self, mask):
+        """Grid indices whose byte in a 0/1 mask is set"""
+        return compress(range(len(mask)), mask)
+
+    def tiles(self, mask):
+        """(x, y) coordinates whose byte in a 0/1 mask is set, in row-major order"""
+        width = self.width
+        return [(i % width, i // width) for i in self.tile_indices(mask)]
+
+    def water_tilled(self):
+        """Mark every tilled tile watered; returns the (x, y) tiles that were dry"""
+        dry = self.tiles(self.flags.translate(IS_TILLED_DRY))
+        self.flags[:] = self.flags.translate(WATER_TILLED)
+        return dry
+
+    def clear_water(self):
+        self.flags[:] = self.flags.translate(CLEAR_WATERED)
+
+    def reset_water_counts(self):
+        self.water_count[:] = bytes(len(self.water_count))
+
+    def watering_verdicts(self):
+        """
+        0/1 masks of tilled tiles watered correctly today (1-2 times) and of
+        planted tiles left completely dry
+        """
+        correct = and_masks(self.flags.translate(IS_TILLED), self.water_count.translate(IS_ONE_OR_TWO))
+        dry = and_masks(self.flags.translate(IS_TILLED_PLANTED), self.water_count.translate(IS_ZERO))
+        return correct, dry
+
+    def day_tick(self, rain_today, rain_tomorrow, evaluate=True):
+        """
+        Advance the whole farm by one night in a single fused pass.
+
+        Only tilled or planted tiles are visited. Each one gets its watering
+        verdict and soil-health change (when evaluate is set), and its plant
+        grows if the tile was watered or moves a day closer to dying if not.
+        Water flags and counts are then reset in bulk, and tilled tiles are
+        watered again if rain_tomorrow.
+        """
+        result = DayResult()
+        flags, counts, health = self.flags, self.water_count, self.health
+        age, max_age, unwatered, crop = self.age, self.max_age, self.unwatered, self.crop
+        correct_delta = SOIL_IMPACTS['correct_water']['soil']
+        under_delta = SOIL_IMPACTS['under_water']['soil']
+        verdicts = result.verdicts
+        width = self.width
+
+        for i in self.tile_indices(flags.translate(IS_ACTIVE)):
+            tile = flags[i]
+
+            # watering verdict: once or twice is correct, a dry planted tile is
+            # under-watered unless it rained
+            if evaluate and tile & TILLED:
+                count = counts[i]
+                delta = 0
+                if count == 1 or count == 2:
+                    delta = correct_delta
+                    verdicts['correct_water'] += 1
+                elif count == 0 and tile & PLANTED and not rain_today:
+                    delta = under_delta
+                    verdicts['under_water'] += 1
+                if delta:
+                    health[i] = max(MIN_SOIL_HEALTH, min(MAX_SOIL_HEALTH, health[i] + delta))
+
+            # plant growth and death (2 days without water)
+            if tile & PLANTED:
+                if tile & WATERED:
+                    unwatered[i] = 0
+                    age[i] = min(age[i] + CROP_GROW_SPEED[crop[i]], max_age[i])
+                    result.grown.append((i % width, i // width))
+                else:
+                    unwatered[i] = min(255, unwatered[i] + 1)
+                    if unwatered[i] >= 2:
+                        flags[i] = tile & ~PLANTED
+                        result.died.append((i % width, i // width))
+
+        self.reset_water_counts()
+        self.clear_water()
+        if rain_tomorrow:
+            result.rained = self.water_tilled()
+        return result
+
+    def average_health(self, default=INITIAL_SOIL_HEALTH):
+        """Mean soil health over farmable tiles"""
+        farmable = self.flags.translate(IS_FARMABLE)
+        count = farmable.count(1)
+        return sum(compress(self.health, farmable)) / count if count else default
+
+    def sparse_indices(self):
+        """Indices of tiles that differ from a fresh map (anything beyond the farmable flag)"""
+        mask = self.flags.translate(IS_WORKED)
+        for data in (self.water_count, self.crop, self.emitter, self.unwatered):
+            mask = or_masks(mask, data.translate(IS_NONZERO))
+        mask = or_masks(mask, bytes(value != INITIAL_SOIL_HEALTH for value in self.health))
+        return list(self.tile_indices(mask))
+
+    def changed_indices(self, other):
+        """Indices of tiles where any array differs from another grid of the same size"""
+        mask = bytes(len(self.flags))
+        for name, _ in TILE_FIELDS:
+            mine, theirs = getattr(self, name), getattr(other, name)
+            if mine == theirs:
+                continue
+            mask = or_masks(mask, bytes(a != b for a, b in zip(mine, theirs)))
+        return list(self.tile_indices(mask))
+
+    def gather(self, indices):
+        """Values of every per-tile array at the given indices, as typed arrays"""
+        return {name: array(typecode, [getattr(self, name)[i] for i in indices]) for name, typecode in TILE_FIELDS}
+
+    def scatter(self, indices, fields):
+        """Write values gathered by gather() back at the given indices"""
+        for name, _ in TILE_FIELDS:
+            target, values = getattr(self, name), fields.get(name)
+            if values is not None:
+                for i, value in zip(indices, values):
+                    target[i] = value
+
+    def reset(self):
+        """Back to a fresh map: only the farmable flags survive"""
+        size = len(self.flags)
+        self.flags[:] = self.flags.translate(KEEP_FARMABLE)
+        self.health[:] = array('h', [INITIAL_SOIL_HEALTH]) * size
+        self.age[:] = array('d', [0.0]) * size
+        for data in (self.water_count, self.crop, self.emitter, self.max_age, self.unwatered):
+            data[:] = bytes(size)
+
+    def copy(self):
+        """Independent copy of every array (a cheap memory copy, used for save snapshots)"""
+        grid = SoilGrid.__new__(SoilGrid)
+        grid.width = self.width
+        grid.height = self.height
+        for name, _ in TILE_FIELDS:
+            setattr(grid, name, getattr(self, name)[:])
+        return grid
+
+    # ---- legacy nested-list form (old saves, debugging) ----
+
+    def to_lists(self):
+        """Grid state as the nested lists the game used before flags were packed"""
+        width, rows = self.width, range(self.height)
+        flag_order = tuple(FLAG_BITS.items())
+        flags = [[[flag for flag, bit in flag_order if b & bit]
+                  for b in self.flags[y * width:(y + 1) * width]] for y in rows]
+        health = [self.health[y * width:(y + 1) * width].tolist() for y in rows]
+        water = [list(self.water_count[y * width:(y + 1) * width]) for y in rows]
+        crops = [[CROP_NAMES[c] for c in self.crop[y * width:(y + 1) * width]] for y in rows]
+        return flags, health, water, crops
+
+    def load_lists(self, flags=None, health=None, water_count=None, last_crop=None):
+        """Fill the arrays from nested lists (missing or short rows are left as they are)"""
+        width = self.width
+        for y in range(self.height):
+            base = y * width
+            if flags and y < len(flags):
+                for x, cell in enumerate(flags[y][:width]):
+                    self.flags[base + x] = sum(FLAG_BITS[flag] for flag in set(cell) if flag in FLAG_BITS)
+            if health and y < len(health):
+                for x, value in enumerate(health[y][:width]):
+                    self.health[base + x] = int(value)
+            if water_count and y < len(water_count):
+                for x, value in enumerate(water_count[y][:width]):
+                    self.water_count[base + x] = min(255, int(value))
+            if last_crop and y < len(last_crop):
+                for x, name in enumerate(last_crop[y][:width]):
+                    self.crop[base + x] = CROP_IDS.get(name, 0)
+
+    # ---- compatibility views ----
+
+    @property
+    def cells(self):
+        """grid[y][x] view whose cells behave like the old lists of flag characters"""
+        return GridView(self, FlagRow)
+
+    def view(self, name, decode=None, encode=None):
+        """grid[y][x] view over one of the typed arrays"""
+        return GridView(self, ValueRow, name, decode, encode)
+
+
+class FlagCell:
+    """One tile's flags, supporting the list operations old code used ('X' in cell, append, remove)"""
+    __slots__ = ('grid', 'index')
+
+    def __init__(self, grid, index):
+        self.grid = grid
+        self.index = index
+
+    def __contains__(self, flag):
+        return bool(self.grid.flags[self.index] & FLAG_BITS.get(flag, 0))
+
+    def append(self, flag):
+        self.grid.flags[self.index] |= FLAG_BITS[flag]
+
+    def remove(self, flag):
+        if flag not in self:
+            raise ValueError(f'{flag!r} not in cell')
+        self.grid.flags[self.index] &= ~FLAG_BITS[flag]
+
+    def __iter__(self):
+        value = self.grid.flags[self.index]
+        return (flag for flag, bit in FLAG_BITS.items() if value & bit)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __eq__(self, other):
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+class FlagRow:
+    __slots__ = ('grid', 'base')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.base = y * grid.width
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.grid.width:
+            raise IndexError('grid column out of range')
+        return FlagCell(self.grid, self.base + x)
+
+    def __len__(self):
+        return self.grid.width
+
+    def __iter__(self):
+        return (FlagCell(self.grid, self.base + x) for x in range(self.grid.width))
+
+
+class ValueRow:
+    __slots__ = ('data', 'base', 'width', 'decode', 'encode')
+
+    def __init__(self, grid, y, name, decode, encode):
+        self.data = getattr(grid, name)
+        self.base = y * grid.width
+        self.width = grid.width
+        self.decode = decode
+        self.encode = encode
+
+    def __getitem__(self, x):
+        if not 0 <= x < self.width:
+            raise IndexError('grid column out of range')
+        value = self.data[self.base + x]
+        return self.decode(value) if self.decode else value
+
+    def __setitem__(self, x, value):
+        if not 0 <= x < self.width:
+            raise IndexError('grid column out of range')
+        self.data[self.base + x] = self.encode(value) if self.encode else value
+
+    def __len__(self):
+        return self.width
+
+    def __iter__(self):
+        return (self[x] for x in range(self.width))
+
+
+class GridView:
+    """Row-indexable view so grid[y][x] keeps working on top of the flat arrays"""
+    __slots__ = ('grid', 'row_type', 'args')
+
+    def __init__(self, grid, row_type, *args):
+        self.grid = grid
+        self.row_type = row_type
+        self.args = args
+
+    def __getitem__(self, y):
+        if not 0 <= y < self.grid.height:
+            raise IndexError('grid row out of range')
+        return self.row_type(self.grid, y, *self.args)
+
+    def __len__(self):
+        return self.grid.height
+
+    def __iter__(self):
+        return (self[y] for y in range(self.grid.height))
@@ -0,0 +1,116 @@
+# Spatial Hash - Tile-keyed index for collision queries
+# Buckets hitboxes by the tiles they overlap so collision checks only look nearby
+
+import pygame
+from settings import TILE_SIZE
+
+class SpatialHash:
+    """
+    Index from tile coordinates to the sprites whose rect overlaps that tile.
+
+    Data Structure: HASH MAP (dict of (col, row) -> sprites)
+    Purpose: Area queries only touch the few tiles they cover, so their cost
+    no longer grows with the number of sprites on the map
+    """
+    def __init__(self, cell_size=TILE_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}         # (col, row) -> {sprite: None} (dict keeps insertion order)
+        self.sprite_cells = {}  # sprite -> list of (col, row) it was inserted into
+
+    def cells_for(self, rect):
+        """Tile coordinates covered by a rect"""
+        size = self.cell_size
+        cols = range(rect.left // size, (rect.right - 1) // size + 1)
+        rows = range(rect.top // size, (rect.bottom - 1) // size + 1)
+        return [(col, row) for col in cols for row in rows]
+
+    def insert(self, sprite, rect):
+        """Index a sprite under every tile its rect covers"""
+        self.remove(sprite)
+        keys = self.cells_for(rect)
+        for key in keys:
+            self.cells.setdefault(key, {})[sprite] = None
+        self.sprite_cells[sprite] = keys
+
+    def remove(self, sprite):
+        """Drop a sprite from the index (no-op if it is not indexed)"""
+        for key in self.sprite_cells.pop(sprite, ()):
+            bucket = self.cells[key]
+            del bucket[sprite]
+            if not bucket:
+                del self.cells[key]
+
+    def query(self, rect):
+        """Sprites indexed in any tile the rect covers, without duplicates"""
+        found = {}
+        for key in self.cells_for(rect):
+            bucket = self.cells.get(key)
+            if bucket:
+                found.update(bucket)
+        return list(found)
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+
+class StaticHitbox(pygame.sprite.Sprite):
+    """
+    Collision-only sprite for map tiles that are drawn elsewhere (or not at
+    all): a rect and the hitbox a Generic of that rect would get, no image.
+    """
+    def __init__(self, rect, groups):
+        super().__init__(groups)
+        self.rect = pygame.Rect(rect)
+        self.hitbox = self.rect.inflate(-self.rect.width * 0.2, -self.rect.height * 0.75)
+
+
+class CollisionGroup(pygame.sprite.Group):
+    """
+    Sprite group that keeps a spatial hash of its members' hitboxes.
+
+    Sprites are indexed lazily on the next query because hitboxes are set
+    after a sprite joins its groups. A sprite that still has no hitbox then
+    (e.g. a seedling) is left out until refresh() reports one, so queries
+    never rescan it. Removing a sprite (including kill()) drops it from the
+    index. Call refresh() when a sprite's hitbox is set, replaced or moved.
+    """
+    def __init__(self, *sprites):
+        self.spatial_hash = SpatialHash()
+        self.unindexed = {}  # sprites added or refreshed since the last query
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite)
+        self.unindexed[sprite] = None
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.unindexed.pop(sprite, None)
+        self.spatial_hash.remove(sprite)
+
+    def refresh(self, sprite):
+        """Re-index a sprite whose hitbox was set, replaced or moved"""
+        if sprite in self.spritedict:
+            self.spatial_hash.remove(sprite)
+            self.unindexed[sprite] = None
+
+    def index_pending(self):
+        for sprite in self.unindexed:
+            hitbox = getattr(sprite, 'hitbox', None)
+            if hitbox is not None:
+                self.spatial_hash.insert(sprite, hitbox)
+        # sprites without a hitbox come back through refresh() once they get one
+        self.unindexed.clear()
+
+    def query(self, rect):
+        """Sprites with a hitbox in the tiles around rect"""
+        if self.unindexed:
+            self.index_pending()
+        return self.spatial_hash.query(rect)
+
+
+def refresh_hitbox(sprite):
+    """Notify every collision group holding the sprite that its hitbox was set or changed"""
+    for group in sprite.groups():
+        if isinstance(group, CollisionGroup):
+            group.refresh(sprite)
@@ -1,7 +1,9 @@
 import pygame
 from settings import *
 from random import randint, choice
-from timer import Timer
+from timer import Timer, game_timers
+from spatial_hash import refresh_hitbox
+from assets import assets
 
 class Generic(pygame.sprite.Sprite):
 	def __init__(self, pos, surf, groups, z = LAYERS['main']):
@@ -17,28 +19,20 @@ class Interaction(Generic):
 		super().__init__(pos, surf, groups)
 		self.name = name
 
-class Water(Generic):
-	def __init__(self, pos, frames, groups):
-
-		#animation setup
-		self.frames = frames
-		self.frame_index = 0
+class Water(pygame.sprite.Sprite):
+	def __init__(self, pos, track, groups):
+		super().__init__(groups)
 
-		# sprite setup
-		super().__init__(
-				pos = pos, 
-				surf = self.frames[self.frame_index], 
-				groups = groups, 
-				z = LAYERS['water']) 
+		# every water tile shows the current frame of one shared track,
+		# so there is nothing to update per sprite
+		self.track = track
+		self.rect = self.track.frame.get_rect(topleft = pos)
+		self.z = LAYERS['water']
+		self.hitbox = self.rect.copy().inflate(-self.rect.width * 0.2, -self.rect.height * 0.75)
 
-	def animate(self,dt):
-		self.frame_index += 5 * dt
-		if self.frame_index >= len(self.frames):
-			self.frame_index = 0
-		self.image = self.frames[int(self.frame_index)]
-
-	def update(self,dt):
-		self.animate(dt)
+	@property
+	def image(self):
+		return self.track.frame
 
 class WildFlower(Generic):
 	def __init__(self, pos, surf, groups):
@@ -48,8 +42,8 @@ class WildFlower(Generic):
 class Particle(Generic):
 	def __init__(self, pos, surf, groups, z, duration = 200):
 		super().__init__(pos, surf, groups, z)
-		self.start_time = pygame.time.get_ticks()
-		self.duration = duration
+		self.timer = Timer(duration, self.kill, game_timers)
+		self.timer.activate()
 
 		# white surface 
 		mask_surf = pygame.mask.from_surface(self.image)
@@ -57,11 +51,6 @@ class Particle(Generic):
 		new_surf.set_colorkey((0,0,0))
 		self.image = new_surf
 
-	def update(self,dt):
-		current_time = pygame.time.get_ticks()
-		if current_time - self.start_time > self.duration:
-			self.kill()
-
 class Tree(Generic):
 	def __init__(self, pos, surf, groups, name, player_add, all_sprites):
 		super().__init__(pos, surf, groups)
@@ -71,12 +60,12 @@ class Tree(Generic):
 		self.health = 5
 		self.alive = True
 		stump_path = f'./graphics/stumps/{"small" if name == "Small" else "large"}.png'
-		self.stump_surf = pygame.image.load(stump_path).convert_alpha()
+		self.stump_surf = assets.image(stump_path)
 		self.original_surf = surf
 		self.respawn_timer = 0
 
 		# apples
-		self.apple_surf = pygame.image.load('./graphics/fruit/apple.png')
+		self.apple_surf = assets.image('./graphics/fruit/apple.png')
 		self.apple_pos = APPLE_POS[name]
 		self.apple_sprites = pygame.sprite.Group()
 		self.create_fruit()
@@ -84,7 +73,7 @@ class Tree(Generic):
 		self.player_add = player_add
 
 		# sounds
-		self.axe_sound = pygame.mixer.Sound('./audio/axe.mp3')
+		self.axe_sound = assets.sound('./audio/axe.mp3')
 
 	def damage(self):
 		
@@ -111,6 +100,7 @@ class Tree(Generic):
 			self.image = self.stump_surf
 			self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
 			self.hitbox = self.rect.copy().inflate(-10,-self.rect.height * 0.6)
+			refresh_hitbox(self)
 			self.alive = False
 			self.player_add('wood')
 			self.respawn_timer = 0
@@ -125,6 +115,7 @@ class Tree(Generic):
 		self.image = self.original_surf
 		self.rect = self.image.get_rect(midbottom = self.rect.midbottom)
 		self.hitbox = self.rect.copy().inflate(-10,-self.rect.height * 0.6)
+		refresh_hitbox(self)
 		self.health = 5
 		self.alive = True
 		self.respawn_timer = 0
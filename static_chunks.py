@@ -0,0 +1,71 @@
+# Static Chunks - Bake map tiles that never change into a few large surfaces
+# Flat layers become square chunks drawn by view; y-sorted layers become row strips that sort like the tiles they replace
+
+import pygame
+from sprites import Generic
+
+CHUNK_SIZE = 512
+
+
+def _bake(tiles, area, crop=True):
+    """
+    One surface holding the tiles overlapping area, cropped to what was drawn
+    unless crop is False. (None, None) if nothing visible was drawn.
+    """
+    surf = pygame.Surface(area.size, pygame.SRCALPHA)
+    surf.blits([(image, rect.move(-area.x, -area.y)) for image, rect in tiles], False)
+    bounds = surf.get_bounding_rect() if crop else surf.get_rect()
+    if not bounds.width or not bounds.height:
+        return None, None
+    return surf.subsurface(bounds).copy().convert_alpha(), bounds.move(area.topleft)
+
+
+class ChunkLayer:
+    """
+    Tiles of a layer nothing is y-sorted against, baked into square chunks.
+    Register draw() as a layer renderer on the camera group; only chunks
+    inside the view are blitted.
+    """
+    def __init__(self, tiles, chunk_size=CHUNK_SIZE):
+        # tiles: (topleft, surface) in world pixels, in draw order
+        buckets = {}
+        for pos, image in tiles:
+            rect = image.get_rect(topleft = pos)
+            for cy in range(rect.top // chunk_size, (rect.bottom - 1) // chunk_size + 1):
+                for cx in range(rect.left // chunk_size, (rect.right - 1) // chunk_size + 1):
+                    buckets.setdefault((cx, cy), []).append((image, rect))
+
+        self.chunks = []
+        for (cx, cy), chunk_tiles in buckets.items():
+            area = pygame.Rect(cx * chunk_size, cy * chunk_size, chunk_size, chunk_size)
+            surf, rect = _bake(chunk_tiles, area)
+            if surf is not None:
+                self.chunks.append((surf, rect))
+
+    def draw(self, surface, offset):
+        view = pygame.Rect(offset, surface.get_size())
+        offset_x, offset_y = offset
+        surface.blits(
+            [(surf, rect.move(-offset_x, -offset_y)) for surf, rect in self.chunks if view.colliderect(rect)],
+            False)
+
+
+def bake_rows(tiles, groups, z, chunk_width=CHUNK_SIZE):
+    """
+    Tiles of a y-sorted layer baked into horizontal strips, one per tile row
+    (same top and height) per chunk_width of map. Each strip is a Generic
+    whose centery matches the tiles it holds, so sprites sort against it
+    exactly as they did against the single tiles. Returns the strips.
+    """
+    rows = {}
+    for pos, image in tiles:
+        rect = image.get_rect(topleft = pos)
+        rows.setdefault((rect.top, rect.height, rect.left // chunk_width), []).append((image, rect))
+
+    strips = []
+    for (top, height, column), row_tiles in sorted(rows.items()):
+        area = row_tiles[0][1].unionall([rect for _, rect in row_tiles])
+        # not cropped: the strip keeps the row's centery for sorting
+        surf, rect = _bake(row_tiles, area, crop=False)
+        strips.append(Generic(rect.topleft, surf, groups, z))
+    return strips
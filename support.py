@@ -1,24 +1,8 @@
-from os import walk
-import pygame
+from assets import assets
 
 def import_folder(path):
-	surface_list = []
-
-	for _, __, img_files in walk(path):
-		for image in img_files:
-			full_path = path + '/' + image
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_list.append(image_surf)
-
-	return surface_list
+	# decoded once per folder and shared through the asset cache
+	return assets.frames(path)
 
 def import_folder_dict(path):
-	surface_dict = {}
-
-	for _, __, img_files in walk(path):
-		for image in img_files:
-			full_path = path + '/' + image
-			image_surf = pygame.image.load(full_path).convert_alpha()
-			surface_dict[image.split('.')[0]] = image_surf
-
-	return surface_dict
\ No newline at end of file
+	return assets.frames_dict(path)
@@ -0,0 +1,79 @@
+# Text Cache - Shared LRU cache of rendered text surfaces
+# UI modules render strings through it so unchanged labels are rasterised once instead of every frame
+
+from collections import OrderedDict
+
+TEXT_CACHE_BUDGET = 8 * 1024 * 1024  # bytes of cached surfaces
+
+
+class TextCache:
+    """
+    Rendered text keyed by (font, text, antialias, colour, background).
+
+    Data Structure: LRU CACHE (OrderedDict, most recently used last)
+    Purpose: Menus draw the same strings every frame; a hit is a dict
+    lookup instead of a glyph rasterisation. Least recently used surfaces
+    are dropped once the cache holds more than budget bytes.
+
+    Fonts are keyed by identity, which is stable because they come from the
+    asset cache. Returned surfaces are shared and must not be drawn on.
+    """
+    def __init__(self, budget=TEXT_CACHE_BUDGET):
+        self.budget = budget
+        self.entries = OrderedDict()  # key -> surface
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _colour_key(colour):
+        # strings and tuples hash as they are; pygame.Color and lists do not
+        return colour if colour is None or isinstance(colour, (str, tuple)) else tuple(colour)
+
+    def render(self, font, text, antialias, colour, background=None):
+        key = (font, text, antialias, self._colour_key(colour), self._colour_key(background))
+        surf = self.entries.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surf
+
+        self.misses += 1
+        surf = font.render(text, antialias, colour, background)
+        self.entries[key] = surf
+        self.bytes += self._size(surf)
+        while self.bytes > self.budget and len(self.entries) > 1:
+            _, old = self.entries.popitem(last=False)
+            self.bytes -= self._size(old)
+            self.evictions += 1
+        return surf
+
+    @staticmethod
+    def _size(surf):
+        return surf.get_width() * surf.get_height() * surf.get_bytesize()
+
+    def clear(self):
+        self.entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+            'budget': self.budget,
+        }
+
+
+# the cache every UI module shares
+text_cache = TextCache()
+
+
+def render_text(font, text, antialias, colour, background=None):
+    """font.render through the shared cache"""
+    return text_cache.render(font, text, antialias, colour, background)
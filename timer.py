@@ -1,23 +1,89 @@
-import pygame 
+import pygame
+from heapq import heappush, heappop
+from itertools import count
+
+class Scheduler:
+	"""
+	Fires timers when they are due, from a min-heap of deadlines.
+
+	Data Structure: MIN-HEAP of [deadline, sequence, timer] entries
+	Purpose: nothing is polled per timer. Each update only looks at the
+	earliest deadline, so idle timers cost nothing and a frame with no due
+	timer costs one comparison. Cancelled entries are blanked in place and
+	dropped when they reach the top of the heap.
+
+	Time is in milliseconds. With a clock (e.g. pygame.time.get_ticks),
+	update() follows it; without one the scheduler runs on game time and
+	only moves when advance(dt) is called.
+	"""
+	def __init__(self, clock = None):
+		self.clock = clock
+		self.last_tick = clock() if clock else 0
+		self.time = 0
+		self.heap = []
+		self.sequence = count()  # keeps equal deadlines in activation order
+
+	def schedule(self, timer):
+		entry = [self.time + timer.duration, next(self.sequence), timer]
+		heappush(self.heap, entry)
+		return entry
+
+	def cancel(self, entry):
+		entry[2] = None
+
+	def update(self):
+		"""Follow the clock (for wall-clock schedulers)"""
+		tick = self.clock()
+		elapsed, self.last_tick = tick - self.last_tick, tick
+		self.time += elapsed
+		self.run_due()
+
+	def advance(self, dt):
+		"""Move game time on by dt seconds"""
+		self.time += dt * 1000
+		self.run_due()
+
+	def run_due(self):
+		heap = self.heap
+		while heap and heap[0][0] <= self.time:
+			timer = heappop(heap)[2]
+			if timer is not None:
+				timer.fire()
+
+	def clear(self):
+		"""Cancel everything (e.g. when a new Level replaces the old one)"""
+		for entry in self.heap:
+			if entry[2] is not None:
+				entry[2].entry = None
+		self.heap.clear()
+
+# menus and other UI run on wall-clock time, so they keep working while the world is paused
+ui_timers = Scheduler(pygame.time.get_ticks)
+# the world's timers run on game time: Level advances them only while the world is simulated
+game_timers = Scheduler()
 
 class Timer:
-	def __init__(self,duration,func = None):
+	def __init__(self,duration,func = None,scheduler = None):
 		self.duration = duration
 		self.func = func
-		self.start_time = 0
-		self.active = False
+		self.scheduler = scheduler or ui_timers
+		self.entry = None  # heap entry while active
+
+	@property
+	def active(self):
+		return self.entry is not None
 
 	def activate(self):
-		self.active = True
-		self.start_time = pygame.time.get_ticks()
+		if self.entry is not None:
+			self.scheduler.cancel(self.entry)
+		self.entry = self.scheduler.schedule(self)
 
 	def deactivate(self):
-		self.active = False
-		self.start_time = 0
+		if self.entry is not None:
+			self.scheduler.cancel(self.entry)
+			self.entry = None
 
-	def update(self):
-		current_time = pygame.time.get_ticks()
-		if current_time - self.start_time >= self.duration:
-			if self.func and self.start_time != 0:
-				self.func()
-			self.deactivate()
\ No newline at end of file
+	def fire(self):
+		self.entry = None
+		if self.func:
+			self.func()
@@ -15,6 +15,10 @@ class Transition:
 		self.speed = -2
 
 	def play(self):
+		self.update()
+		self.draw()
+
+	def update(self):
 		self.color += self.speed
 		if self.color <= 0:
 			self.speed *= -1
@@ -25,5 +29,6 @@ class Transition:
 			self.player.sleep = False
 			self.speed = -2
 
+	def draw(self):
 		self.image.fill((self.color,self.color,self.color))
 		self.display_surface.blit(self.image, (0,0), special_flags = pygame.BLEND_RGBA_MULT)
\ No newline at end of file